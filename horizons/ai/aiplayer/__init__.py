@@ -69,6 +69,7 @@ from goal.donothing import DoNothingGoal
 
 from horizons.scheduler import Scheduler
 from horizons.util import Callback, WorldObject
+from horizons.util.loadphases import LoadPhases
 from horizons.ext.enum import Enum
 from horizons.ai.generic import GenericAI
 from horizons.util.python import decorators
@@ -169,12 +170,12 @@ class AIPlayer(GenericAI):
 		calls = Scheduler().get_classinst_calls(self, current_callback)
 		assert len(calls) == 1, "got %s calls for saving %s: %s" % (len(calls), current_callback, calls)
 		remaining_ticks = max(calls.values()[0], 1)
-		db("INSERT INTO ai_player(rowid, need_more_ships, need_feeder_island, remaining_ticks) VALUES(?, ?, ?, ?)", \
+		db.add_row("INSERT INTO ai_player(rowid, need_more_ships, need_feeder_island, remaining_ticks) VALUES(?, ?, ?, ?)", \
 			self.worldid, self.need_more_ships, self.need_feeder_island, remaining_ticks)
 
 		# save the ships
 		for ship, state in self.ships.iteritems():
-			db("INSERT INTO ai_ship(rowid, owner, state) VALUES(?, ?, ?)", ship.worldid, self.worldid, state.index)
+			db.add_row("INSERT INTO ai_ship(rowid, owner, state) VALUES(?, ?, ?)", ship.worldid, self.worldid, state.index)
 
 		# save the land managers
 		for land_manager in self.islands.itervalues():
@@ -209,42 +210,48 @@ class AIPlayer(GenericAI):
 			self.ships[ship] = self.shipStates[state_id]
 
 		# load the land managers
-		for (worldid,) in db("SELECT rowid FROM ai_land_manager WHERE owner = ?", self.worldid):
-			land_manager = LandManager.load(db, self, worldid)
-			self.islands[land_manager.island.worldid] = land_manager
+		with LoadPhases.phase('land managers'):
+			for (worldid,) in db("SELECT rowid FROM ai_land_manager WHERE owner = ?", self.worldid):
+				land_manager = LandManager.load(db, self, worldid)
+				self.islands[land_manager.island.worldid] = land_manager
+			LoadPhases.count('land managers', len(self.islands))
 
 		# load the settlement managers and settlement foundation missions
-		for land_manager in self.islands.itervalues():
-			db_result = db("SELECT rowid FROM ai_settlement_manager WHERE land_manager = ?", land_manager.worldid)
-			if db_result:
-				settlement_manager = SettlementManager.load(db, self, db_result[0][0])
-				self.settlement_managers.append(settlement_manager)
-				self._settlement_manager_by_settlement_id[settlement_manager.settlement.worldid] = settlement_manager
-
-				# load the foundation ship preparing missions
-				db_result = db("SELECT rowid FROM ai_mission_prepare_foundation_ship WHERE settlement_manager = ?", \
-					settlement_manager.worldid)
+		with LoadPhases.phase('settlement managers'):
+			for land_manager in self.islands.itervalues():
+				db_result = db("SELECT rowid FROM ai_settlement_manager WHERE land_manager = ?", land_manager.worldid)
+				if db_result:
+					settlement_manager = SettlementManager.load(db, self, db_result[0][0])
+					self.settlement_managers.append(settlement_manager)
+					self._settlement_manager_by_settlement_id[settlement_manager.settlement.worldid] = settlement_manager
+
+					# load the foundation ship preparing missions
+					db_result = db("SELECT rowid FROM ai_mission_prepare_foundation_ship WHERE settlement_manager = ?", \
+						settlement_manager.worldid)
+					for (mission_id,) in db_result:
+						self.missions.add(PrepareFoundationShip.load(db, mission_id, self.report_success, self.report_failure))
+				else:
+					mission_id = db("SELECT rowid FROM ai_mission_found_settlement WHERE land_manager = ?", land_manager.worldid)[0][0]
+					self.missions.add(FoundSettlement.load(db, mission_id, self.report_success, self.report_failure))
+			LoadPhases.count('settlement managers', len(self.settlement_managers))
+
+		with LoadPhases.phase('trade missions'):
+			for settlement_manager in self.settlement_managers:
+				# load the domestic trade missions
+				db_result = db("SELECT rowid FROM ai_mission_domestic_trade WHERE source_settlement_manager = ?", settlement_manager.worldid)
 				for (mission_id,) in db_result:
-					self.missions.add(PrepareFoundationShip.load(db, mission_id, self.report_success, self.report_failure))
-			else:
-				mission_id = db("SELECT rowid FROM ai_mission_found_settlement WHERE land_manager = ?", land_manager.worldid)[0][0]
-				self.missions.add(FoundSettlement.load(db, mission_id, self.report_success, self.report_failure))
+					self.missions.add(DomesticTrade.load(db, mission_id, self.report_success, self.report_failure))
 
-		for settlement_manager in self.settlement_managers:
-			# load the domestic trade missions
-			db_result = db("SELECT rowid FROM ai_mission_domestic_trade WHERE source_settlement_manager = ?", settlement_manager.worldid)
-			for (mission_id,) in db_result:
-				self.missions.add(DomesticTrade.load(db, mission_id, self.report_success, self.report_failure))
-
-			# load the special domestic trade missions
-			db_result = db("SELECT rowid FROM ai_mission_special_domestic_trade WHERE source_settlement_manager = ?", settlement_manager.worldid)
-			for (mission_id,) in db_result:
-				self.missions.add(SpecialDomesticTrade.load(db, mission_id, self.report_success, self.report_failure))
-
-			# load the international trade missions
-			db_result = db("SELECT rowid FROM ai_mission_international_trade WHERE settlement_manager = ?", settlement_manager.worldid)
-			for (mission_id,) in db_result:
-				self.missions.add(InternationalTrade.load(db, mission_id, self.report_success, self.report_failure))
+				# load the special domestic trade missions
+				db_result = db("SELECT rowid FROM ai_mission_special_domestic_trade WHERE source_settlement_manager = ?", settlement_manager.worldid)
+				for (mission_id,) in db_result:
+					self.missions.add(SpecialDomesticTrade.load(db, mission_id, self.report_success, self.report_failure))
+
+				# load the international trade missions
+				db_result = db("SELECT rowid FROM ai_mission_international_trade WHERE settlement_manager = ?", settlement_manager.worldid)
+				for (mission_id,) in db_result:
+					self.missions.add(InternationalTrade.load(db, mission_id, self.report_success, self.report_failure))
+			LoadPhases.count('missions', len(self.missions))
 
 	def tick(self):
 		Scheduler().add_new_object(Callback(self.tick), self, run_in = self.tick_interval)
@@ -65,7 +65,7 @@ class Builder(WorldObject):
 
 	def save(self, db):
 		super(Builder, self).save(db)
-		db("INSERT INTO ai_builder(rowid, building_type, x, y, orientation, ship) VALUES(?, ?, ?, ?, ?, ?)", \
+		db.add_row("INSERT INTO ai_builder(rowid, building_type, x, y, orientation, ship) VALUES(?, ?, ?, ?, ?, ?)", \
 			self.worldid, self.building_id, self.point.x, self.point.y, self.orientation, \
 			None if self.ship is None else self.ship.worldid)
 
@@ -43,7 +43,7 @@ class FoundSettlement(ShipMission):
 
 	def save(self, db):
 		super(FoundSettlement, self).save(db)
-		db("INSERT INTO ai_mission_found_settlement(rowid, land_manager, ship, warehouse_builder, state) VALUES(?, ?, ?, ?, ?)", \
+		db.add_row("INSERT INTO ai_mission_found_settlement(rowid, land_manager, ship, warehouse_builder, state) VALUES(?, ?, ?, ?, ?)", \
 			self.worldid, self.land_manager.worldid, self.ship.worldid, self.warehouse_location.worldid, self.state.index)
 		assert isinstance(self.warehouse_location, Builder)
 		self.warehouse_location.save(db)
@@ -43,7 +43,7 @@ class PrepareFoundationShip(ShipMission):
 
 	def save(self, db):
 		super(PrepareFoundationShip, self).save(db)
-		db("INSERT INTO ai_mission_prepare_foundation_ship(rowid, settlement_manager, ship, feeder_island, state) VALUES(?, ?, ?, ?, ?)", \
+		db.add_row("INSERT INTO ai_mission_prepare_foundation_ship(rowid, settlement_manager, ship, feeder_island, state) VALUES(?, ?, ?, ?, ?)", \
 			self.worldid, self.settlement_manager.worldid, self.ship.worldid, self.feeder_island, self.state.index)
 
 	@classmethod
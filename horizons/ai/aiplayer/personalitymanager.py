@@ -35,7 +35,7 @@ class PersonalityManager(object):
 		self.log.info('%s assigned personality %s', player, self._personality.__name__)
 
 	def save(self, db):
-		db("INSERT INTO ai_personality_manager(rowid, personality) VALUES(?, ?)", self.player.worldid, self._personality.__module__ + '.' + self._personality.__name__)
+		db.add_row("INSERT INTO ai_personality_manager(rowid, personality) VALUES(?, ?)", self.player.worldid, self._personality.__module__ + '.' + self._personality.__name__)
 
 	def _load(self, db, player):
 		self.player = player
@@ -147,7 +147,7 @@ class SettlementManager(WorldObject):
 
 	def save(self, db):
 		super(SettlementManager, self).save(db)
-		db("INSERT INTO ai_settlement_manager(rowid, land_manager) VALUES(?, ?)", \
+		db.add_row("INSERT INTO ai_settlement_manager(rowid, land_manager) VALUES(?, ?)", \
 			self.worldid, self.land_manager.worldid)
 
 		self.village_builder.save(db)
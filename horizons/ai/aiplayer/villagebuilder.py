@@ -71,12 +71,12 @@ class VillageBuilder(AreaBuilder):
 
 	def save(self, db):
 		super(VillageBuilder, self).save(db)
-		db("INSERT INTO ai_village_builder(rowid, settlement_manager, num_sections, current_section) VALUES(?, ?, ?, ?)", \
+		db.add_row("INSERT INTO ai_village_builder(rowid, settlement_manager, num_sections, current_section) VALUES(?, ?, ?, ?)", \
 			self.worldid, self.settlement_manager.worldid, self.num_sections, self.current_section)
 
 		db_query = 'INSERT INTO ai_village_builder_plan(village_builder, x, y, purpose, section, seq_no) VALUES(?, ?, ?, ?, ?, ?)'
 		for (x, y), (purpose, (section, seq_no)) in self.plan.iteritems():
-			db(db_query, self.worldid, x, y, purpose, section, seq_no)
+			db.add_row(db_query, self.worldid, x, y, purpose, section, seq_no)
 
 	def _load(self, db, settlement_manager):
 		db_result = db("SELECT rowid, num_sections, current_section FROM ai_village_builder WHERE settlement_manager = ?", settlement_manager.worldid)
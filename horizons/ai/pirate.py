@@ -84,7 +84,7 @@ class Pirate(GenericAI):
 	def save(self, db):
 		super(Pirate, self).save(db)
 		db("UPDATE player SET is_pirate = 1 WHERE rowid = ?", self.worldid)
-		db("INSERT INTO pirate_home_point(x, y) VALUES(?, ?)", self.home_point.x, self.home_point.y)
+		db.add_row("INSERT INTO pirate_home_point(x, y) VALUES(?, ?)", self.home_point.x, self.home_point.y)
 
 		for ship in self.ships:
 			# prepare values
@@ -94,7 +94,7 @@ class Pirate(GenericAI):
 			assert len(calls) == 1, "got %s calls for saving %s: %s" %(len(calls), current_callback, calls)
 			remaining_ticks = max(calls.values()[0], 1)
 
-			db("INSERT INTO pirate_ships(rowid, state, remaining_ticks) VALUES(?, ?, ?)",
+			db.add_row("INSERT INTO pirate_ships(rowid, state, remaining_ticks) VALUES(?, ?, ?)",
 				ship.worldid, ship_state.index, remaining_ticks)
 
 	def _load(self, db, worldid):
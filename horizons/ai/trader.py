@@ -95,7 +95,7 @@ class Trader(GenericAI):
 			targeted_warehouse = None if ship.worldid not in self.office else self.office[ship.worldid].worldid
 
 			# put them in the database
-			db("INSERT INTO trader_ships(rowid, state, remaining_ticks, targeted_warehouse) \
+			db.add_row("INSERT INTO trader_ships(rowid, state, remaining_ticks, targeted_warehouse) \
 			   VALUES(?, ?, ?, ?)", ship.worldid, ship_state.index, remaining_ticks, targeted_warehouse)
 
 	def _load(self, db, worldid):
@@ -19,6 +19,7 @@
 # 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 # ###################################################
 
+from collections import defaultdict
 
 from horizons.util.pathfinding.pathnodes import ConsumerBuildingPathNodes
 from horizons import entities
@@ -36,6 +37,9 @@ class CollectingComponent(Component):
 
 	NAME = 'CollectingComponent'
 
+	# verify the reservation ledger against the collector jobs on every lookup (slow, for tests)
+	check_reservations = False
+
 	## INIT/DESTRUCT
 	def __init__(self, collectors):
 		super(CollectingComponent, self).__init__()
@@ -49,6 +53,8 @@ class CollectingComponent(Component):
 		"""Part of initiation that __init__() and load() share"""
 		# list that holds the collectors that belong to this building.
 		self.__collectors = []
+		# res: amount the collectors are currently collecting for this building
+		self.__reserved_amounts = defaultdict(int)
 
 		self.path_nodes = ConsumerBuildingPathNodes(self.instance)
 
@@ -104,3 +110,24 @@ class CollectingComponent(Component):
 
 	def get_local_collectors(self):
 		return self.__collectors
+
+	def add_job_reservation(self, reslist):
+		"""Registers that a collector is about to bring the resources of reslist here.
+		@param reslist: Job.ResListEntry list"""
+		for entry in reslist:
+			self.__reserved_amounts[entry.res] += entry.amount
+
+	def remove_job_reservation(self, reslist):
+		"""Contrary to add_job_reservation"""
+		for entry in reslist:
+			self.__reserved_amounts[entry.res] -= entry.amount
+
+	def get_reserved_amount(self, res):
+		"""Returns the amount of res that our collectors are currently collecting."""
+		amount = self.__reserved_amounts[res]
+		if self.check_reservations:
+			expected = sum(entry.amount for collector in self.__collectors if collector.job is not None
+			               for entry in collector.job.reslist if entry.res == res)
+			assert amount == expected, "%s: %s of res %s reserved, but collectors have %s" % \
+			       (self.instance, amount, res, expected)
+		return amount
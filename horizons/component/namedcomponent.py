@@ -65,7 +65,7 @@ class NamedComponent(Component):
 
 	def save(self, db):
 		super(NamedComponent, self).save(db)
-		db("INSERT INTO name (rowid, name) VALUES(?, ?)", self.instance.worldid, self.name)
+		db.add_row("INSERT INTO name (rowid, name) VALUES(?, ?)", self.instance.worldid, self.name)
 
 	def load(self, db, worldid):
 		super(NamedComponent, self).load(db, worldid)
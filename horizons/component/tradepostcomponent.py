@@ -73,20 +73,20 @@ class TradePostComponent(ChangeListener, Component):
 
 		for resource, limit in self.buy_list.iteritems():
 			assert limit is not None, "limit must not be none"
-			db("INSERT INTO trade_buy(object, resource, trade_limit) VALUES(?, ?, ?)",
+			db.add_row("INSERT INTO trade_buy(object, resource, trade_limit) VALUES(?, ?, ?)",
 				 self.instance.worldid, resource, limit)
 
 		for resource, limit in self.sell_list.iteritems():
 			assert limit is not None, "limit must not be none"
-			db("INSERT INTO trade_sell(object, resource, trade_limit) VALUES(?, ?, ?)",
+			db.add_row("INSERT INTO trade_sell(object, resource, trade_limit) VALUES(?, ?, ?)",
 				 self.instance.worldid, resource, limit)
 
-		db("INSERT INTO trade_values(object, total_income, total_expenses) VALUES (?, ?, ?)",
+		db.add_row("INSERT INTO trade_values(object, total_income, total_expenses) VALUES (?, ?, ?)",
 		   self.instance.worldid, self.total_income, self.total_expenses)
 
 		for row in self.trade_history:
 			translated_tick = row[0] - Scheduler().cur_tick # pre-translate for the loading process
-			db("INSERT INTO trade_history(settlement, tick, player, resource_id, amount, gold) VALUES(?, ?, ?, ?, ?, ?)",
+			db.add_row("INSERT INTO trade_history(settlement, tick, player, resource_id, amount, gold) VALUES(?, ?, ?, ?, ?, ?)",
 				self.instance.worldid, translated_tick, row[1], row[2], row[3], row[4])
 
 	def load(self, db, worldid):
@@ -313,6 +313,7 @@ class VIEW:
 	ROTATION = 45.0
 	TILT = -60
 	ZOOM = 1
+	CULLING_MARGIN = 5 # tiles around the visible area where units still update their fife instances
 
 ## The Production States available in the game sorted by importance from least
 ## to most important
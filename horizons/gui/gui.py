@@ -595,12 +595,12 @@ class Gui(SingleplayerMenu, MultiplayerMenu):
 				# this was a click in the savegame list, but not on an element
 				# it happens when the savegame list is empty
 				return
-			savegame_info = SavegameManager.get_metadata(map_file)
+			savegame_info = SavegameManager.get_cached_metadata(map_file)
+			# only load the screenshot of the selected savegame
+			screenshot_data = SavegameManager.get_screenshot(map_file)
 
 			# screenshot (len can be 0 if save failed in a weird way)
-			if 'screenshot' in savegame_info and \
-			   savegame_info['screenshot'] is not None and \
-			   len(savegame_info['screenshot']) > 0:
+			if screenshot_data is not None and len(screenshot_data) > 0:
 				# try to find a writeable location, that is accessible via relative paths
 				# (required by fife)
 				fd, filename = tempfile.mkstemp()
@@ -618,7 +618,7 @@ class Gui(SingleplayerMenu, MultiplayerMenu):
 
 				if fd:
 					with os.fdopen(fd, "w") as f:
-						f.write(savegame_info['screenshot'])
+						f.write(screenshot_data)
 					# fife only supports relative paths
 					gui.findChild(name="screenshot").image = path_rel
 					os.unlink(filename)
@@ -174,6 +174,7 @@ class IngameGui(LivingObject):
 				w.hide()
 		self.message_widget = None
 		self.tabwidgets = None
+		self.minimap.end()
 		self.minimap = None
 		self.resource_overview.end()
 		self.resource_overview = None
@@ -38,7 +38,9 @@ from horizons.constants import AI, LANGUAGENAMES
 from horizons.gui.widgets import OkButton
 from horizons.gui.widgets.minimap import Minimap
 from horizons.world import World
-from horizons.util import SavegameAccessor, WorldObject, Rect
+from horizons.world.minimapraster import MinimapRaster
+from horizons.util import SavegameAccessor, WorldObject
+from horizons.util.mappreviewcache import MapPreviewCache
 from horizons.i18n import find_available_languages
 
 class SingleplayerMenu(object):
@@ -567,22 +569,12 @@ class MapPreview(object):
 
 	def update_map(self, map_file):
 		"""Direct map preview update.
-		Only use for existing maps, it's too slow for random maps"""
-		if self.minimap is not None:
-			self.minimap.end()
-		world = self._load_raw_world(map_file)
-		self.minimap = Minimap(self._get_map_preview_icon(),
-			                     session=None,
-			                     view=None,
-			                     world=world,
-			                     targetrenderer=horizons.main.fife.targetrenderer,
-			                     imagemanager=horizons.main.fife.imagemanager,
-			                     cam_border=False,
-			                     use_rotation=False,
-			                     tooltip=None,
-			                     on_click=None,
-			                     preview=True)
-		self.minimap.draw()
+		The preview is taken from the cache or calculated in the background."""
+		self._last_random_map_params = None
+		minimap_icon = self._get_map_preview_icon()
+		size = (minimap_icon.width, minimap_icon.height)
+		key = MapPreviewCache.get_map_key(map_file, size)
+		self._update_preview(key, (size, None, map_file), tooltip=None, on_click=None)
 
 	def update_random_map(self, map_params, on_click):
 		"""Called when a random map parameter has changed.
@@ -592,6 +584,24 @@ class MapPreview(object):
 			return # we already display this, happens on spurious slider events such as hover
 		self._last_random_map_params = map_params
 
+		minimap_icon = self._get_map_preview_icon()
+		size = (minimap_icon.width, minimap_icon.height)
+		key = MapPreviewCache.get_random_map_key(size, map_params)
+		tooltip = _("Click to generate a different random map")
+		self._update_preview(key, (size, map_params), tooltip=tooltip, on_click=on_click)
+
+	def _update_preview(self, key, minimap_args, tooltip, on_click):
+		"""Shows the cached preview or calculates it in a background process.
+		@param key: MapPreviewCache key of the preview
+		@param minimap_args: arguments for generate_minimap()"""
+		data = MapPreviewCache.get(key)
+		if data is not None:
+			if self.calc_proc is not None:
+				# an older preview is still being calculated, it isn't needed anymore
+				self._kill_calc_process()
+			self._draw_preview(data, tooltip, on_click)
+			return
+
 		def check_calc_process():
 			# checks up on calc process (see below)
 			if self.calc_proc is not None:
@@ -599,45 +609,26 @@ class MapPreview(object):
 				if state is None: # not finished
 					ExtScheduler().add_new_object(check_calc_process, self, 0.1)
 				elif state != 0:
+					os.unlink(self.calc_proc.output_filename)
+					self.calc_proc = None
 					self._set_map_preview_status(u"An unknown error occured while generating the map preview")
 				else: # done
 
 					data = open(self.calc_proc.output_filename, "r").read()
 					os.unlink(self.calc_proc.output_filename)
+					MapPreviewCache.put(self.calc_proc.preview_key, data)
+					tooltip, on_click = self.calc_proc.preview_handlers
 					self.calc_proc = None
 
-					icon = self._get_map_preview_icon()
-					if icon is None:
-						return # dialog already gone
-
-					tooltip = _("Click to generate a different random map")
-
-					if self.minimap is not None:
-						self.minimap.end()
-					self.minimap = Minimap(icon,
-																 session=None,
-																 view=None,
-																 world=None,
-																 targetrenderer=horizons.main.fife.targetrenderer,
-																 imagemanager=horizons.main.fife.imagemanager,
-																 cam_border=False,
-																 use_rotation=False,
-																 tooltip=tooltip,
-																 on_click=on_click,
-																 preview=True)
-					self.minimap.draw_data( data )
-					icon.show()
-					self._set_map_preview_status(u"")
+					self._draw_preview(data, tooltip, on_click)
 
 		if self.calc_proc is not None:
-			self.calc_proc.kill() # process exists, therefore up is scheduled already
-		else:
-			ExtScheduler().add_new_object(check_calc_process, self, 0.5)
+			self._kill_calc_process()
+		ExtScheduler().rem_all_classinst_calls(self) # check up on the new process only
+		ExtScheduler().add_new_object(check_calc_process, self, 0.5)
 
 		# launch process in background to calculate minimap data
-		minimap_icon = self._get_map_preview_icon()
-
-		params = json.dumps(((minimap_icon.width, minimap_icon.height), map_params))
+		params = json.dumps(minimap_args)
 
 		args = (sys.executable, sys.argv[0], "--generate-minimap", params)
 		handle, outfilename = tempfile.mkstemp()
@@ -645,32 +636,57 @@ class MapPreview(object):
 		self.calc_proc = subprocess.Popen(args=args,
 								                      stdout=open(outfilename, "w"))
 		self.calc_proc.output_filename = outfilename # attach extra info
+		self.calc_proc.preview_key = key
+		self.calc_proc.preview_handlers = (tooltip, on_click)
 		self._set_map_preview_status(u"Generating preview...")
 
+	def _kill_calc_process(self):
+		self.calc_proc.kill()
+		self.calc_proc.wait()
+		os.unlink(self.calc_proc.output_filename)
+		self.calc_proc = None
+
+	def _draw_preview(self, data, tooltip, on_click):
+		"""Displays minimap data (see Minimap.dump_data)"""
+		icon = self._get_map_preview_icon()
+		if icon is None:
+			return # dialog already gone
+
+		if self.minimap is not None:
+			self.minimap.end()
+		self.minimap = Minimap(icon,
+		                       session=None,
+		                       view=None,
+		                       world=None,
+		                       targetrenderer=horizons.main.fife.targetrenderer,
+		                       imagemanager=horizons.main.fife.imagemanager,
+		                       cam_border=False,
+		                       use_rotation=False,
+		                       tooltip=tooltip,
+		                       on_click=on_click,
+		                       preview=True)
+		self.minimap.draw_data(data)
+		icon.show()
+		self._set_map_preview_status(u"")
 
 	@classmethod
-	def generate_minimap(cls, size, parameters):
-		"""Called as subprocess, calculates minimap data and passes it via string via stdout"""
+	def generate_minimap(cls, size, parameters, map_file=None):
+		"""Called as subprocess, calculates minimap data and passes it via string via stdout
+		@param size: (width, height) of the preview
+		@param parameters: random map parameters, only used if map_file is None
+		@param map_file: existing map to calculate the preview of"""
 		# called as standalone basically, so init everything we need
 		from horizons.main import _create_main_db
 		from horizons.entities import Entities
-		from horizons.ext.dummy import Dummy
 		db = _create_main_db()
 		Entities.load_grounds(db, load_now=False) # create all references
-		map_file = SingleplayerMenu._generate_random_map( parameters )
+		if map_file is None:
+			map_file = SingleplayerMenu._generate_random_map( parameters )
 		world = cls._load_raw_world(map_file)
-		location = Rect.init_from_topleft_and_size_tuples( (0, 0), size)
-		minimap = Minimap(location,
-											session=None,
-											view=None,
-											world=world,
-											targetrenderer=Dummy(),
-											imagemanager=Dummy(),
-											cam_border=False,
-											use_rotation=False,
-											preview=True)
+		# nothing is drawn here, only the pixel data is calculated
+		raster = MinimapRaster(world, size)
 		# communicate via stdout
-		print minimap.dump_data()
+		print raster.dump_data()
 
 	@classmethod
 	def _load_raw_world(cls, map_file):
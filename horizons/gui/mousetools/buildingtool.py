@@ -29,6 +29,7 @@ import horizons.main
 from horizons.entities import Entities
 from horizons.util import ActionSetLoader, Point, decorators, WorldObject
 from horizons.command.building import Build
+from horizons.world.building.buildable import BuildCheckMemo
 from horizons.component.selectablecomponent import SelectableBuildingComponent, SelectableComponent
 from horizons.gui.mousetools.navigationtool import NavigationTool
 from horizons.command.sounds import PlaySound
@@ -112,6 +113,7 @@ class BuildingTool(NavigationTool):
 		self._highlighted_buildings = set() # related buildings highlighted when preview is near it
 		self._build_logic = None
 		self._related_buildings_selected_tiles = frozenset() # highlights w.r.t. related buildings
+		self._build_check_memo = None # results of build checks since the last change
 		if self.ship is not None:
 			self._build_logic = ShipBuildingToolLogic(ship)
 		elif build_related is not None:
@@ -180,6 +182,10 @@ class BuildingTool(NavigationTool):
 		for building in buildings_to_select:
 			self._related_buildings.add(building)
 
+	def _reset_build_check_memo(self):
+		"""Drops remembered build checks. Called when a new line is started and when the world changes."""
+		self._build_check_memo = None
+
 	def _color_buildable_tile(self, tile):
 		self._buildable_tiles.add(tile) # it's a set, so duplicates are handled
 		self.renderer.addColored(tile._instance, *self.buildable_color)
@@ -197,6 +203,7 @@ class BuildingTool(NavigationTool):
 		self._related_buildings = None
 		self._highlighted_buildings = None
 		self._build_logic = None
+		self._build_check_memo = None
 		self.buildings = None
 		if self.__class__.gui is not None:
 			self.session.view.remove_change_listener(self.draw_gui)
@@ -213,6 +220,7 @@ class BuildingTool(NavigationTool):
 		check_building = lambda b : b.worldid != message.worldid
 		self._highlighted_buildings = set( tup for tup in self._highlighted_buildings if check_building(tup[0]) )
 		self._related_buildings = set( filter(check_building, self._related_buildings) )
+		self._reset_build_check_memo()
 
 	def load_gui(self):
 		if self.__class__.gui is None:
@@ -266,15 +274,20 @@ class BuildingTool(NavigationTool):
 		"""Display buildings as preview if build requirements are met"""
 		#self.session.view.renderer['InstanceRenderer'].removeAllColored()
 		self.log.debug("BuildingTool: preview build at %s, %s", point1, point2)
-		new_buildings = self._class.check_build_line(self.session, point1, point2,
-				                                     rotation = self.rotation, ship=self.ship)
+		if self._build_check_memo is None:
+			self._build_check_memo = BuildCheckMemo(self._class, self.session, ship=self.ship)
+		new_buildings = self._build_check_memo.check_build_line(point1, point2, rotation=self.rotation)
 		# optimisation: If only one building is in the preview and the position hasn't changed
 		# => don't preview. Otherwise the preview is redrawn on every mouse move
 		if not force and len(new_buildings) == len(self.buildings) == 1 and \
 		   new_buildings[0] == self.buildings[0]:
 			return # we don't want to redo the preview
 
-		# remove old fife instances and coloring
+		# remove old coloring, fife instances of buildings that are still previewed are reused
+		get_key = lambda building : (building.position.origin.to_tuple(), building.rotation, building.action)
+		old_instances = dict( (get_key(building), fife_instance) for \
+		                      building, fife_instance in self.buildings_fife_instances.iteritems() )
+		self.buildings_fife_instances = {}
 		self._remove_building_instances()
 
 		# get new ones
@@ -299,6 +312,10 @@ class BuildingTool(NavigationTool):
 
 			if self._class.id == BUILDINGS.TREE and not building.buildable:
 				continue # Tree/ironmine that is not buildable, don't preview
+			elif get_key(building) in old_instances:
+				fife_instance = old_instances.pop(get_key(building))
+				self.renderer.removeColored(fife_instance)
+				self.buildings_fife_instances[building] = fife_instance
 			else:
 				fife_instance, action_set_id = \
 					self._class.getInstance(self.session, building.position.origin.x, \
@@ -343,6 +360,9 @@ class BuildingTool(NavigationTool):
 			self._highlight_related_buildings_in_range(building, settlement)
 			self._highlight_inversely_related_buildings(building, settlement)
 
+		for fife_instance in old_instances.itervalues():
+			self._delete_fife_instance(fife_instance)
+
 		self.session.ingame_gui.resource_overview.set_construction_mode(
 			self.ship if self.ship is not None else settlement,
 		  neededResources
@@ -467,6 +487,7 @@ class BuildingTool(NavigationTool):
 		point = self.get_world_location(evt)
 		if self.start_point != point:
 			self.start_point = point
+			self._reset_build_check_memo()
 		self._check_update_preview(point)
 		evt.consume()
 
@@ -532,6 +553,7 @@ class BuildingTool(NavigationTool):
 				self._restore_transparencified_instances()
 				self.highlight_buildable(changed_tiles)
 				self.start_point = point
+				self._reset_build_check_memo()
 				self._build_logic.continue_build()
 				self.preview_build(point, point)
 			else:
@@ -672,12 +694,15 @@ class BuildingTool(NavigationTool):
 			# restore selection, removeOutline can destroy it
 			building.get_component(SelectableComponent).set_selection_outline()
 		for fife_instance in self.buildings_fife_instances.itervalues():
-			layer = fife_instance.getLocationRef().getLayer()
-			# layer might not exist, happens for some reason after a build
-			if layer is not None:
-				layer.deleteInstance(fife_instance)
+			self._delete_fife_instance(fife_instance)
 		self.buildings_fife_instances = {}
 
+	def _delete_fife_instance(self, fife_instance):
+		layer = fife_instance.getLocationRef().getLayer()
+		# layer might not exist, happens for some reason after a build
+		if layer is not None:
+			layer.deleteInstance(fife_instance)
+
 	def _restore_transparencified_instances(self):
 		"""Removes transparency"""
 		for inst_weakref in self._transparencified_instances:
@@ -742,11 +767,14 @@ class ShipBuildingToolLogic(object):
 
 	def add_change_listener(self, instance, building_tool):
 		# instance is self.ship here
+		instance.add_change_listener(building_tool._reset_build_check_memo)
 		instance.add_change_listener(building_tool.highlight_buildable)
 		instance.add_change_listener(building_tool.force_update)
 
 	def remove_change_listener(self, instance, building_tool):
 		# be idempotent
+		if instance.has_change_listener(building_tool._reset_build_check_memo):
+			instance.remove_change_listener(building_tool._reset_build_check_memo)
 		if instance.has_change_listener(building_tool.highlight_buildable):
 			instance.remove_change_listener(building_tool.highlight_buildable)
 		if instance.has_change_listener(building_tool.force_update):
@@ -784,6 +812,12 @@ class SettlementBuildingToolLogic(object):
 		else: #default build on island
 			for settlement in session.world.settlements:
 				if settlement.owner == player:
+					cache = settlement.buildability_cache
+					if cache.can_cache(building_tool._class):
+						ground_map = settlement.ground_map
+						for coord in cache.get_buildable_coords(building_tool._class):
+							building_tool._color_buildable_tile(ground_map[coord])
+						continue
 					island = session.world.get_island(Point(*settlement.ground_map.iterkeys().next()))
 					for tile in settlement.ground_map.itervalues():
 						if is_tile_buildable(session, tile, None, island, check_settlement=False):
@@ -793,6 +827,7 @@ class SettlementBuildingToolLogic(object):
 		if self.building_tool():
 			if self.building_tool().session.world.player == message.sender.owner:
 				# this is generally caused by adding new buildings, therefore new_buildings=True
+				self.building_tool()._reset_build_check_memo()
 				self.building_tool().highlight_buildable(message.changed_tiles, new_buildings=True)
 
 	def on_escape(self, session):
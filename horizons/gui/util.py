@@ -20,11 +20,13 @@
 # ###################################################
 
 import os
+from cStringIO import StringIO
+from xml.etree import cElementTree as ElementTree
 
 from fife.extensions import pychan
 from fife.extensions.pychan.widgets import Icon
 
-from horizons.i18n import translate_widget
+from horizons.i18n import translate_widget, translate_layout, guitranslations
 from horizons.util.python import decorators, Callback
 
 @decorators.cachedfunction
@@ -44,18 +46,40 @@ def get_gui_files_map():
 	return xml_files
 
 
+# filename: (translations, xml source, remaining translations), see get_layout
+_layouts = {}
+
+def get_layout(filename):
+	"""Returns the xml source of a gui file with the current translations already applied
+	and the translations that still have to be applied to the widget.
+	Every file is read and translated once per language."""
+	translations = guitranslations.text_translations # replaced when the language changes
+	try:
+		layout = _layouts[filename]
+		if layout[0] is translations:
+			return layout[1:]
+	except KeyError:
+		pass
+
+	root = ElementTree.parse(get_gui_files_map()[filename]).getroot()
+	remaining = translate_layout(root, filename)
+	_layouts[filename] = (translations, ElementTree.tostring(root, encoding='utf-8'), remaining)
+	return _layouts[filename][1:]
+
+
 def load_uh_widget(filename, style=None, center_widget=False):
 	"""Loads a pychan widget from an xml file and applies uh-specific modifications
 	"""
 	# load widget
 	try:
-		widget = pychan.loadXML(get_gui_files_map()[filename])
-	except (IOError, ValueError) as error:
+		source, translations = get_layout(filename)
+		widget = pychan.loadXML(StringIO(source))
+	except (IOError, ValueError, SyntaxError) as error:
 		print u'PLEASE REPORT: invalid path {path} in translation! {error}'.format(path=filename, error=error)
 		raise
 
-	# translate
-	widget = translate_widget(widget, filename)
+	# translate what couldn't be applied to the layout
+	widget = translate_widget(widget, filename, translations)
 
 	if style:
 		widget.stylize(style)
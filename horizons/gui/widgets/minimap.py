@@ -29,6 +29,8 @@ from horizons.extscheduler import ExtScheduler
 from horizons.util.python.decorators import bind_all
 from horizons.command.unit import Act
 from horizons.component.namedcomponent import NamedComponent
+from horizons.messaging import SettlementRangeChanged, WorldObjectDeleted
+from horizons.world.minimapraster import MinimapRaster
 
 import math
 from math import sin, cos
@@ -48,7 +50,7 @@ class Minimap(object):
 	* Create a minimap tag for pychan
 	** Handle clicks, remove overlay icon
 	"""
-	COLORS = { "island": (137, 117,  87),
+	COLORS = { "island": MinimapRaster.ISLAND_COLOR,
 		"cam":    (  1,   1,   1),
 		"water" : (198, 188, 165),
 		"highlight" : (255, 0, 0), # for events
@@ -61,6 +63,18 @@ class Minimap(object):
 
 	SHIP_DOT_UPDATE_INTERVAL = 0.5 # seconds
 
+	# lines of the flag above the icons of player ships: start and end relative to the ship,
+	# color (None means the color of the owner)
+	SHIP_FLAG_LINES = (
+	  ((-5, -5), (0, -5), None),
+	  ((-6, -6), (0, -6), None),
+	  ((-4, -4), (0, -4), None),
+	  # black border around the flag
+	  ((-6, -7), (0, -7), (0, 0, 0)),
+	  ((-4, -3), (0, -4), (0, 0, 0)),
+	  ((-6, -7), (-4, -3), (0, 0, 0)),
+	)
+
 	RENDER_NAMES = { # alpha-ordering determines the order
 	  "background" : "c",
 	  "base" : "d", # islands, etc.
@@ -73,9 +87,10 @@ class Minimap(object):
 
 	__minimap_id_counter = itertools.count()
 	__ship_route_counter = itertools.count()
-	_instances = [] # all active instances
 
 	_dummy_fife_point = fife.Point(0, 0) # use when you quickly need a temporary point
+	_dummy_fife_point0 = fife.Point(0, 0)
+	_dummy_fife_point1 = fife.Point(0, 0)
 
 	def __init__(self, position, session, view, targetrenderer, imagemanager, renderer=None, world=None,
 	             cam_border=True, use_rotation=True, on_click=None, preview=False, tooltip=None):
@@ -119,10 +134,14 @@ class Minimap(object):
 		self._id = str(self.__class__.__minimap_id_counter.next()) # internal identifier, used for allocating resources
 
 		self._image_size_cache = {} # internal detail
+		self._images = {} # img_path: image, see _get_image()
+		self._ship_states = {} # ship worldid: (coord, owner, selected) as currently drawn
+		self.ship_draw_calls = 0 # render target calls of the ship layer, for measurements
 
 		self.imagemanager = imagemanager
 
 		self.minimap_image = _MinimapImage(self, targetrenderer)
+		self._raster = None # MinimapRaster of the world, created by draw()
 
 		#import random
 		#ExtScheduler().add_new_object(lambda : self.highlight( (50+random.randint(-50,50), random.randint(-50,50) + 50 )), self, 2, loops=-1)
@@ -130,6 +149,7 @@ class Minimap(object):
 	def end(self):
 		self.disable()
 		self.world = None
+		self._raster = None
 		self.session = None
 		self.renderer = None
 
@@ -140,9 +160,8 @@ class Minimap(object):
 		ExtScheduler().rem_all_classinst_calls(self)
 		if self.view is not None and self.view.has_change_listener(self.update_cam):
 			self.view.remove_change_listener(self.update_cam)
-
-		if self in self.__class__._instances:
-			self.__class__._instances.remove(self)
+		SettlementRangeChanged.discard(self._on_settlement_range_changed)
+		WorldObjectDeleted.discard(self._on_worldobject_deleted)
 
 	def draw(self):
 		"""Recalculates and draws the whole minimap of self.session.world or world.
@@ -155,11 +174,12 @@ class Minimap(object):
 		if not self.world.inited:
 			return # don't draw while loading
 
-		self.__class__._instances.append(self)
-
 		# update cam when view updates
 		if self.view is not None and not self.view.has_change_listener(self.update_cam):
 			self.view.add_change_listener(self.update_cam)
+		# redraw the parts of the map where settlements expand
+		SettlementRangeChanged.discard(self._on_settlement_range_changed)
+		SettlementRangeChanged.subscribe(self._on_settlement_range_changed)
 
 		if not hasattr(self, "icon"):
 			# add to global generic renderer with id specific to this instance
@@ -177,6 +197,9 @@ class Minimap(object):
 		self.update_cam()
 		self._recalculate()
 		if not self.preview:
+			# ships that are removed are removed from the minimap immediately
+			WorldObjectDeleted.discard(self._on_worldobject_deleted)
+			WorldObjectDeleted.subscribe(self._on_worldobject_deleted)
 			self._timed_update(force=True)
 			ExtScheduler().rem_all_classinst_calls(self)
 			ExtScheduler().add_new_object(self._timed_update, self, \
@@ -240,27 +263,17 @@ class Minimap(object):
 												                      minimap_corners_as_point[ (i+1) % 4],
 			                                        *self.COLORS["cam"])
 
-	@classmethod
-	def update(cls, tup):
-		for minimap in cls._instances:
-			minimap._update(tup)
-
-	def _update(self, tup):
-		"""Recalculate and redraw minimap for real world coord tup
-		@param tup: (x, y)"""
-		if self.world is None or not self.world.inited:
-			return # don't draw while loading
-		minimap_point = self._world_to_minimap( tup, self._get_rotation_setting() )
-		world_to_minimap = self._world_to_minimap_ratio
-		# TODO: remove this remnant of the old implementation, perhaps by refactoring recalculate()
-		minimap_point = (
-		  minimap_point[0] + self.location.left,
-		  minimap_point[1] + self.location.top,
-		)
-		rect = Rect.init_from_topleft_and_size(minimap_point[0], minimap_point[1], \
-								                           int(round(1/world_to_minimap[0])) + 1, \
-								                           int(round(1/world_to_minimap[1])) + 1)
-		self._recalculate(rect)
+	def _on_settlement_range_changed(self, message):
+		"""Redraws the blocks containing tiles that changed their settlement."""
+		if self._raster is None:
+			return # not drawn yet
+		self._raster.mark_dirty((tile.x, tile.y) for tile in message.changed_tiles)
+		changed_blocks = self._raster.update()
+		if changed_blocks:
+			self.minimap_image.set_drawing_enabled()
+			use_rotation = self._get_rotation_setting()
+			for block in changed_blocks:
+				self._draw_block(block, use_rotation)
 
 	def use_overlay_icon(self, icon):
 		"""Configures icon so that clicks get mapped here.
@@ -452,156 +465,63 @@ class Minimap(object):
 
 		return True
 
-	def _recalculate(self, where = None, dump_data=False):
+	def _recalculate(self, dump_data=False):
 		"""Calculate which pixel of the minimap should display what and draw it
-		@param where: Rect of minimap coords. Defaults to self.location
 		@param dump_data: Don't draw but return calculated data"""
-		self.minimap_image.set_drawing_enabled()
-
-		rt = self.minimap_image.rendertarget
-		render_name = self._get_render_name("base")
-
-		if where is None:
-			where = self.location
-			rt.removeAll(render_name)
-
-		# calculate which area of the real map is mapped to which pixel on the minimap
-		pixel_per_coord_x, pixel_per_coord_y = self._world_to_minimap_ratio
-
-		# calculate values here so we don't have to do it in the loop
-		pixel_per_coord_x_half_as_int = int(pixel_per_coord_x/2)
-		pixel_per_coord_y_half_as_int = int(pixel_per_coord_y/2)
-
-		real_map_point = Point(0, 0)
-		world_min_x = self.world.min_x
-		world_min_y = self.world.min_y
-		get_island_tuple = self.world.get_island_tuple
-		island_col = self.COLORS["island"]
-		location_left = self.location.left
-		location_top = self.location.top
-		if dump_data:
-			data = []
-			drawPoint = lambda name, fife_point, r, g, b : data.append( (fife_point.x, fife_point.y, r, g, b) )
-		else:
-			drawPoint = rt.addPoint
-		fife_point = fife.Point(0,0)
-
+		self._raster = MinimapRaster(self.world, (self.location.width, self.location.height))
 		use_rotation = self._get_rotation_setting()
 
-		# loop through map coordinates, assuming (0, 0) is the origin of the minimap
-		# this faciliates calculating the real world coords
-		for x in xrange(where.left-self.location.left, where.left+where.width-self.location.left):
-			# Optimisation: remember last island
-			last_island = None
-			island = None
-			for y in xrange(where.top-self.location.top, where.top+where.height-self.location.top):
-
-				"""
-				This code should be here, but since python can't do inlining, we have to inline
-				ourselves for performance reasons
-				covered_area = Rect.init_from_topleft_and_size(
-				  int(x * pixel_per_coord_x)+world_min_x, \
-				  int(y * pixel_per_coord_y)+world_min_y), \
-				  int(pixel_per_coord_x), int(pixel_per_coord_y))
-				real_map_point = covered_area.center()
-				"""
-				# use center of the rect that the pixel covers
-				real_map_point.x = int(x*pixel_per_coord_x)+world_min_x + \
-											pixel_per_coord_x_half_as_int
-				real_map_point.y = int(y*pixel_per_coord_y)+world_min_y + \
-											pixel_per_coord_y_half_as_int
-				real_map_point_tuple = (real_map_point.x, real_map_point.y)
-
-				# check what's at the covered_area
-				if last_island is not None and real_map_point_tuple in last_island.ground_map:
-					island = last_island
-				else:
-					island = get_island_tuple(real_map_point_tuple)
-				if island is not None:
-					last_island = island
-					# this pixel is an island
-					settlement = island.get_settlement(real_map_point)
-					if settlement is None:
-						# island without settlement
-						color = island_col
-					else:
-						# pixel belongs to a player
-						color = settlement.owner.color.to_tuple()
-				else:
-					continue
-
-				if use_rotation:
-					# inlined _get_rotated_coords
-					rot_x, rot_y = self._rotate( (location_left + x, location_top + y), self._rotations)
-					fife_point.set(rot_x - location_left, rot_y - location_top)
-				else:
-					fife_point.set(x, y)
-
-				drawPoint(render_name, fife_point, *color)
-
 		if dump_data:
-			return json.dumps( data )
+			return json.dumps( [ self._get_pixel_coord(x, y, use_rotation) + color
+			                     for x, y, color in self._raster.get_pixels() ] )
 
+		self.minimap_image.set_drawing_enabled()
+		for block in self._raster.get_blocks():
+			self._draw_block(block, use_rotation)
+
+	def _draw_block(self, block, use_rotation):
+		"""Replaces the points of a block of the raster on the render target.
+		Every block has its own render name, so that it can be redrawn on its own."""
+		rt = self.minimap_image.rendertarget
+		render_name = self._get_render_name("base") + "_%d_%d" % block
+		rt.removeAll(render_name)
+		fife_point = fife.Point(0, 0)
+		for x, y, color in self._raster.get_pixels(block):
+			fife_point.set(*self._get_pixel_coord(x, y, use_rotation))
+			rt.addPoint(render_name, fife_point, *color)
+
+	def _get_pixel_coord(self, x, y, use_rotation):
+		"""Returns the coord to draw the pixel x, y of the raster to."""
+		if use_rotation:
+			location_left = self.location.left
+			location_top = self.location.top
+			rot_x, rot_y = self._rotate( (location_left + x, location_top + y), self._rotations)
+			return (rot_x - location_left, rot_y - location_top)
+		return (x, y)
 
 	def _timed_update(self, force=False):
-		"""Regular updates for domains we can't or don't want to keep track of."""
+		"""Regular updates for domains we can't or don't want to keep track of.
+		@param force: redraw everything, the render target has been reset"""
 		# OPTIMISATION NOTE: there can be pretty many ships, don't rely on the loop being rarely executed
-		# update ship icons
-		self.minimap_image.set_drawing_enabled()
-		render_name = self._get_render_name("ship")
-		self.minimap_image.rendertarget.removeAll( render_name )
+		# update ship icons, only ships whose icon has to change are drawn again
+		if force:
+			self._ship_states.clear()
+		ship_states = self._ship_states
+		selected_instances = self.session.selected_instances
 		use_rotation = self._get_rotation_setting()
-		# make use of this dummy points instead of creating a fife.point instances which are consuming a lot of resources
-		dummy_point0 = fife.Point(0, 0)
-		dummy_point1 = fife.Point(0, 0)
+		drawing_enabled = False
 		for ship in self.world.ships:
 			if not ship.in_ship_map:
 				continue # no fisher ships, etc
 			coord = self._world_to_minimap( ship.position.to_tuple(), use_rotation )
-			color = ship.owner.color.to_tuple()
-			# set correct icon
-			if ship.owner is self.session.world.pirate:
-				ship_icon_path = self.__class__.SHIP_PIRATE
-			else:
-				ship_icon_path = self.__class__.SHIP_NEUTRAL
-			ship_icon = self.imagemanager.load(ship_icon_path)
-			dummy_point1.set(coord[0], coord[1])
-			self.minimap_image.rendertarget.addImage(render_name, dummy_point1, ship_icon)
-			if ship.owner.regular_player is True:
-				# add the 'flag' over the ship icon, with the color of the owner
-				dummy_point0.set(coord[0] - 5, coord[1] - 5)
-				dummy_point1.set(coord[0], coord[1] - 5)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				dummy_point0.set(coord[0] - 6, coord[1] - 6)
-				dummy_point1.set(coord[0], coord[1] - 6)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				dummy_point0.set(coord[0] - 4, coord[1] - 4)
-				dummy_point1.set(coord[0], coord[1] - 4)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0,
-									dummy_point1, color[0], color[1], color[2])
-				# add black border around the flag
-				dummy_point0.set(coord[0] - 6, coord[1] - 7)
-				dummy_point1.set(coord[0], coord[1] - 7)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
-				dummy_point0.set(coord[0] - 4, coord[1] - 3)
-				dummy_point1.set(coord[0], coord[1] - 4)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
-				dummy_point0.set(coord[0] - 6, coord[1] - 7)
-				dummy_point1.set(coord[0] - 4, coord[1] - 3)
-				self.minimap_image.rendertarget.addLine(render_name, dummy_point0, dummy_point1, 0, 0, 0)
-
-			# TODO: nicer selected view
-			dummy_point0.set(coord[0], coord[1])
-			if ship in self.session.selected_instances:
-				self.minimap_image.rendertarget.addPoint(render_name, dummy_point0, *Minimap.COLORS["water"])
-				for x_off, y_off in ((-2,  0),
-					                   (+2,  0),
-					                   ( 0, -2),
-					                   ( 0, +2)):
-					dummy_point1.set(coord[0]+x_off, coord[1] + y_off)
-					self.minimap_image.rendertarget.addPoint(render_name, dummy_point1, *color)
+			state = (coord, ship.owner, ship in selected_instances)
+			if ship_states.get(ship.worldid) == state:
+				continue # nothing to do, the icon is still correct
+			ship_states[ship.worldid] = state
+			if not drawing_enabled:
+				self.minimap_image.set_drawing_enabled()
+				drawing_enabled = True
+			self._draw_ship(ship, *state)
 
 		# draw settlement warehouses if something has changed
 		settlements = self.world.settlements
@@ -610,6 +530,7 @@ class Minimap(object):
 		if force or \
 		   (not hasattr(self, "_last_settlements") or cur_settlements != self._last_settlements):
 			# update necessary
+			self.minimap_image.set_drawing_enabled()
 			warehouse_render_name = self._get_render_name("warehouse")
 			self.minimap_image.rendertarget.removeAll( warehouse_render_name )
 			for settlement in settlements:
@@ -620,9 +541,69 @@ class Minimap(object):
 				                    coord)
 			self._last_settlements = cur_settlements
 
+	def _draw_ship(self, ship, coord, owner, selected):
+		"""Replaces the icon of a ship, its flag and selection marker."""
+		rt = self.minimap_image.rendertarget
+		render_name = self._get_ship_render_name(ship.worldid)
+		rt.removeAll(render_name)
+		draw_calls = 1
+
+		# set correct icon
+		if owner is self.session.world.pirate:
+			ship_icon = self._get_image(self.__class__.SHIP_PIRATE)
+		else:
+			ship_icon = self._get_image(self.__class__.SHIP_NEUTRAL)
+		# make use of this dummy points instead of creating a fife.point instances which are consuming a lot of resources
+		dummy_point0 = self._dummy_fife_point0
+		dummy_point1 = self._dummy_fife_point1
+		dummy_point1.set(coord[0], coord[1])
+		rt.addImage(render_name, dummy_point1, ship_icon)
+		draw_calls += 1
+
+		color = owner.color.to_tuple()
+		if owner.regular_player is True:
+			# add the 'flag' over the ship icon, with the color of the owner
+			for (x0, y0), (x1, y1), line_color in self.SHIP_FLAG_LINES:
+				dummy_point0.set(coord[0] + x0, coord[1] + y0)
+				dummy_point1.set(coord[0] + x1, coord[1] + y1)
+				rt.addLine(render_name, dummy_point0, dummy_point1, *(line_color or color))
+			draw_calls += len(self.SHIP_FLAG_LINES)
+
+		# TODO: nicer selected view
+		if selected:
+			dummy_point0.set(coord[0], coord[1])
+			rt.addPoint(render_name, dummy_point0, *Minimap.COLORS["water"])
+			for x_off, y_off in ((-2,  0),
+			                     (+2,  0),
+			                     ( 0, -2),
+			                     ( 0, +2)):
+				dummy_point1.set(coord[0]+x_off, coord[1] + y_off)
+				rt.addPoint(render_name, dummy_point1, *color)
+			draw_calls += 5
+
+		self.ship_draw_calls += draw_calls
+
+	def _on_worldobject_deleted(self, message):
+		"""Removes the icon of a ship that doesn't exist anymore."""
+		if message.worldid in self._ship_states:
+			del self._ship_states[message.worldid]
+			self.minimap_image.set_drawing_enabled()
+			self.minimap_image.rendertarget.removeAll(self._get_ship_render_name(message.worldid))
+			self.ship_draw_calls += 1
+
+	def _get_ship_render_name(self, worldid):
+		return self._get_render_name("ship") + "_" + str(worldid)
+
+	def _get_image(self, img_path):
+		"""Returns the image, it is only loaded once per minimap."""
+		img = self._images.get(img_path)
+		if img is None:
+			img = self._images[img_path] = self.imagemanager.load(img_path)
+		return img
+
 	def _update_image(self, img_path, name, coord_tuple):
 		"""Updates image as part of minimap (e.g. when it has moved)"""
-		img = self.imagemanager.load( img_path )
+		img = self._get_image( img_path )
 
 		size_tuple = self._image_size_cache.get(img_path)
 		if size_tuple is None:
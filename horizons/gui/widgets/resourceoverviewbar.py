@@ -62,6 +62,10 @@ class ResourceOverviewBar(object):
 
 	Has distinguished treatment of gold because it's distinguished by a bigger icon
 	and by being shown always.
+
+	Inventory changes only mark the bar as dirty, it is redrawn at most every
+	ResourceOverviewBarUpdateInterval seconds (setting). Only labels whose value
+	has changed are touched then.
 	"""
 
 	GOLD_ENTRY_GUI_FILE = "resource_overview_bar_gold.xml"
@@ -109,6 +113,13 @@ class ResourceOverviewBar(object):
 		self._last_build_costs = None
 		self._do_show_dummy = False
 
+		self._update_interval = horizons.main.fife.get_uh_setting("ResourceOverviewBarUpdateInterval")
+		self._redraw_scheduled = False
+		self._gold_dirty = False
+		self._resources_dirty = False
+		self._displayed_gold = None
+		self._displayed_balance = None
+
 		self._update_default_configuration()
 
 		NewPlayerSettlementHovered.subscribe(self._on_different_settlement)
@@ -157,9 +168,9 @@ class ResourceOverviewBar(object):
 		# called when any game (also new ones) start
 		# register at player inventory for gold updates
 		inv = self.session.world.player.get_component(StorageComponent).inventory
-		inv.add_change_listener(self._update_gold, call_listener_now=True)
+		inv.add_change_listener(self._update_gold)
 		self.gold_gui.show()
-		self._update_gold() # call once more to make pychan happy
+		self._redraw_gold(force=True)
 
 		self.set_inventory_instance(
 		  LastActivePlayerSettlementManager().get(get_current_pos=True))
@@ -211,6 +222,7 @@ class ResourceOverviewBar(object):
 				entry = load_entry()
 				self.gui.append(entry)
 
+			entry.displayed_amount = None # force label update
 			entry.findChild(name="entry").position = (initial_offset + offset * i, 17)
 			background_icon = entry.findChild(name="entry")
 			background_icon.capture(Callback(self._show_resource_selection_dialog, i), 'mouseEntered', 'resbar')
@@ -228,10 +240,10 @@ class ResourceOverviewBar(object):
 
 			# show it just when values are entered, this appeases pychan
 
-		# fill values
+		# fill values now and after changes
 		inv = self._get_current_inventory()
-		# update on all changes as well as now
-		inv.add_change_listener(self._update_resources, call_listener_now=True)
+		inv.add_change_listener(self._update_resources)
+		self._redraw_resources()
 
 	def set_construction_mode(self, resource_source_instance, build_costs):
 		"""Show resources relevant to construction and build costs
@@ -247,52 +259,68 @@ class ResourceOverviewBar(object):
 		   build_costs == self._last_build_costs:
 			return # now that's not an update
 
+		old_res_list = self._get_current_resources() if self.construction_mode else None
 		self._last_build_costs = build_costs
 
-		self.construction_mode = True
-		self.set_inventory_instance(resource_source_instance, keep_construction_mode=True)
-
-		# label background icons
-		cost_icon_gold = "content/gui/images/background/widgets/resbar_stats_bottom.png"
-		cost_icon_res = "content/gui/images/background/widgets/res_extra_bg.png"
+		# only rebuild the slots if different resources are shown now, else just update the costs
+		if not self.construction_mode or \
+		   resource_source_instance != self.current_instance() or \
+		   old_res_list != self._get_current_resources():
+			self.construction_mode = True
+			self.set_inventory_instance(resource_source_instance, keep_construction_mode=True)
 
 		res_list = self._get_current_resources()
 
-		# remove old one before, avoids duplicates
-		self._drop_cost_labels()
-
+		entries_with_costs = []
 		for res, amount in build_costs.iteritems():
 			assert res in res_list or res == RES.GOLD
 
-			cost_label = pychan.widgets.Label(text=u"-"+unicode(amount))
-			cost_label.stylize( self.__class__.STYLE )
-			# add icon below end of background icon
 			if res in res_list:
-				entry = res_list.index(res)
-				cur_gui = self.gui[ entry ]
-				reference_icon = cur_gui.findChild(name="background_icon")
-				below = reference_icon.size[1]
-				cost_icon = pychan.widgets.Icon(image=cost_icon_res,
-				                                position=(0, below))
-				cost_label.position = (15, below) # TODO: centering
-
-				cur_gui.addChild(cost_icon)
-				cur_gui.addChild(cost_label)
-				cur_gui.cost_gui = [cost_label, cost_icon]
-
-				cur_gui.resizeToContent() # container needs to be bigger now
+				entry = self.gui[ res_list.index(res) ]
 			else: # must be gold
-				# there is an icon with scales there, use its positioning
-				reference_icon = self.gold_gui.child_finder("balance_background")
-				cost_icon = pychan.widgets.Icon(image=cost_icon_gold,
-				                              position=(reference_icon.x, reference_icon.y))
-				cost_label.position = (23, 74) # TODO: centering
+				entry = self.gold_gui
+			self._set_cost_label(entry, amount, is_gold=(entry is self.gold_gui))
+			entries_with_costs.append(entry)
 
-				self.gold_gui.addChild(cost_icon)
-				self.gold_gui.addChild(cost_label)
-				self.gold_gui.cost_gui = [cost_label, cost_icon]
+		# remove labels of resources that aren't needed any more
+		for entry in itertools.chain(self.gui, [self.gold_gui]):
+			if hasattr(entry, "cost_gui") and not any(entry is e for e in entries_with_costs):
+				self._drop_cost_label(entry)
+
+	def _set_cost_label(self, entry, amount, is_gold):
+		"""Shows the costs below a slot, reusing the label of the previous costs if there is one"""
+		text = u"-"+unicode(amount)
+		if hasattr(entry, "cost_gui"):
+			cost_label = entry.cost_gui[0]
+			if cost_label.text != text:
+				cost_label.text = text
+			return
 
-				self.gold_gui.resizeToContent()
+		# label background icons
+		cost_icon_gold = "content/gui/images/background/widgets/resbar_stats_bottom.png"
+		cost_icon_res = "content/gui/images/background/widgets/res_extra_bg.png"
+
+		cost_label = pychan.widgets.Label(text=text)
+		cost_label.stylize( self.__class__.STYLE )
+		# add icon below end of background icon
+		if not is_gold:
+			reference_icon = entry.findChild(name="background_icon")
+			below = reference_icon.size[1]
+			cost_icon = pychan.widgets.Icon(image=cost_icon_res,
+			                                position=(0, below))
+			cost_label.position = (15, below) # TODO: centering
+		else:
+			# there is an icon with scales there, use its positioning
+			reference_icon = self.gold_gui.child_finder("balance_background")
+			cost_icon = pychan.widgets.Icon(image=cost_icon_gold,
+			                              position=(reference_icon.x, reference_icon.y))
+			cost_label.position = (23, 74) # TODO: centering
+
+		entry.addChild(cost_icon)
+		entry.addChild(cost_label)
+		entry.cost_gui = [cost_label, cost_icon]
+
+		entry.resizeToContent() # container needs to be bigger now
 
 	def close_construction_mode(self, update_slots=True):
 		"""Return to normal configuration"""
@@ -300,9 +328,8 @@ class ResourceOverviewBar(object):
 		if update_slots: # cleanup
 			self._drop_cost_labels()
 			self.set_inventory_instance(None)
-		#self._update_gold()
 		self.gold_gui.show()
-		self._update_gold(force=True)
+		self._redraw_gold(force=True)
 
 		# reshow last settlement
 		self.set_inventory_instance( LastActivePlayerSettlementManager().get(get_current_pos=True) )
@@ -311,26 +338,47 @@ class ResourceOverviewBar(object):
 		"""Removes all labels below the slots indicating building costs"""
 		for entry in itertools.chain(self.gui, [self.gold_gui]):
 			if hasattr(entry, "cost_gui"): # get rid of possible cost labels
-				for elem in entry.cost_gui:
-					entry.removeChild(elem)
-				del entry.cost_gui
+				self._drop_cost_label(entry)
+
+	def _drop_cost_label(self, entry):
+		for elem in entry.cost_gui:
+			entry.removeChild(elem)
+		del entry.cost_gui
 
-	def _update_gold(self, force=False):
+	def _update_gold(self):
 		"""Changelistener to upate player gold"""
 		# can be called pretty often (e.g. if there's an settlement.inventory.alter() in a loop)
-		# only update every 0.3 sec at most
-		scheduled_attr = "_gold_upate_scheduled"
-		if not hasattr(self, scheduled_attr):
-			setattr(self, scheduled_attr, True)
-			ExtScheduler().add_new_object(Callback(self._update_gold, force=True), self, run_in=0.3)
-			return
-		elif not force:
-			return # these calls we want to suppress, wait for scheduled call
+		self._schedule_redraw(gold=True)
 
-		delattr(self, scheduled_attr)
+	def _update_resources(self):
+		"""Same as _update_gold but for all other slots"""
+		self._schedule_redraw(resources=True)
+
+	def _schedule_redraw(self, gold=False, resources=False):
+		"""Marks parts of the bar as dirty. They are redrawn at most every self._update_interval seconds."""
+		self._gold_dirty = self._gold_dirty or gold
+		self._resources_dirty = self._resources_dirty or resources
+		if not self._redraw_scheduled:
+			self._redraw_scheduled = True
+			ExtScheduler().add_new_object(self._redraw, self, run_in=self._update_interval)
+
+	def _redraw(self):
+		self._redraw_scheduled = False
+		if self._gold_dirty:
+			self._redraw_gold()
+		if self._resources_dirty:
+			self._redraw_resources()
+
+	def _redraw_gold(self, force=False):
+		"""Sets the gold label if the amount has changed
+		@param force: set it anyway, e.g. if the gui has been modified"""
+		self._gold_dirty = False
+		gold = self.session.world.player.get_component(StorageComponent).inventory[RES.GOLD]
+		if gold == self._displayed_gold and not force:
+			return
+		self._displayed_gold = gold
 
 		# set gold amount
-		gold = self.session.world.player.get_component(StorageComponent).inventory[RES.GOLD]
 		gold_available_lbl = self.gold_gui.child_finder("gold_available")
 		gold_available_lbl.text = unicode(gold)
 		# reposition according to magic forumula passed down from the elders in order to support centering
@@ -342,26 +390,34 @@ class ResourceOverviewBar(object):
 	def _update_balance_display(self):
 		"""Updates balance info below gold icon"""
 		balance = self.session.world.player.get_balance_estimation()
+		if balance == self._displayed_balance:
+			return
+		self._displayed_balance = balance
 		balance_lbl = self.gold_gui.child_finder("balance")
 		balance_lbl.text = u"{sign}{balance}".format(balance=balance, sign=u'+' if balance >= 0 else u'')
 		balance_lbl.resizeToContent()
 		# 38
-		balance_lbl.position = (70 - balance_lbl.size[0],  74) # see _update_gold
+		balance_lbl.position = (70 - balance_lbl.size[0],  74) # see _redraw_gold
 
 		self.gold_gui.resizeToContent() # update label size
 
-	def _update_resources(self):
-		"""Same as _update_gold but for all other slots"""
+	def _redraw_resources(self):
+		"""Same as _redraw_gold but for all other slots"""
+		self._resources_dirty = False
 		if self.current_instance() in (None, self): # instance died
 			self.set_inventory_instance(None)
 			return
 		inv = self._get_current_inventory()
 		for i, res in enumerate(self._get_current_resources()):
 			cur_gui = self.gui[i]
+			amount = inv[res]
+			if amount == cur_gui.displayed_amount:
+				continue
+			cur_gui.displayed_amount = amount
 
 			# set amount
 			label = cur_gui.findChild(name="res_available")
-			label.text = unicode( inv[res] )
+			label.text = unicode(amount)
 
 			# reposition according to magic forumula passed down from the elders in order to support centering
 			cur_gui.adaptLayout() # update size values (e.g. if amount of digits changed)
@@ -373,9 +429,9 @@ class ResourceOverviewBar(object):
 		if self.construction_mode:
 			lvl = self.session.world.player.settler_level
 			res_list = self.__class__.CONSTRUCTION_RESOURCES[lvl]
-			# also add additional res that might be needed
-			res_list += [ res for res in self._last_build_costs if \
-			              res not in res_list and res != RES.GOLD ]
+			# also add additional res that might be needed (don't += on the class data)
+			res_list = res_list + [ res for res in self._last_build_costs if \
+			                        res not in res_list and res != RES.GOLD ]
 			return res_list
 		# prefer user defaults over general defaults
 		default = self._custom_default_resources if self._custom_default_resources else self.__class__.DEFAULT_RESOURCES
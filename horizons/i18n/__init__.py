@@ -51,22 +51,26 @@ objecttranslations.set_translations()
 # save translated widgets
 translated_widgets = {}
 
-def translate_widget(untranslated, filename):
+def translate_widget(untranslated, filename, translations=None):
 	"""
 	Load widget translations from guitranslations.py file.
 	Its entries look like {element_name: (attribute, translation)}.
 	The translation is not applied to inactive widgets.
 	Check update_all_translations for the application.
+	@param translations: entries to apply instead of all entries of filename, see translate_layout
 	"""
 	global translated_widgets
-	if filename in guitranslations.text_translations:
-		for entry in guitranslations.text_translations[filename].iteritems():
-			widget = untranslated.findChild(name=entry[0][0])
-			if widget is not None:
-				replace_attribute(widget, entry[0][1], entry[1])
-				widget.adaptLayout()
-	else:
-		log.debug('No translation key in i18n.guitranslations for file %s', filename)
+	if translations is None:
+		if filename in guitranslations.text_translations:
+			translations = guitranslations.text_translations[filename]
+		else:
+			log.debug('No translation key in i18n.guitranslations for file %s', filename)
+			translations = {}
+	for entry in translations.iteritems():
+		widget = untranslated.findChild(name=entry[0][0])
+		if widget is not None:
+			replace_attribute(widget, entry[0][1], entry[1])
+			widget.adaptLayout()
 
 	# save as weakref for updates to translations
 	translated_widgets[filename] = weakref.ref(untranslated)
@@ -74,6 +78,34 @@ def translate_widget(untranslated, filename):
 	return untranslated
 
 
+def translate_layout(root, filename):
+	"""
+	Applies the widget translations of filename to the xml layout before widgets are
+	created from it. Only attributes that the layout sets can be translated this way.
+	@param root: ElementTree element of the layout
+	@return: dict of the remaining entries, which have to be passed to translate_widget
+	"""
+	if filename not in guitranslations.text_translations:
+		log.debug('No translation key in i18n.guitranslations for file %s', filename)
+		return {}
+
+	# the widget that findChild would return for each name
+	elements = {}
+	for element in root.iter():
+		name = element.get('name')
+		if name is not None and name not in elements:
+			elements[name] = element
+
+	remaining = {}
+	for (element_name, attribute), translation in guitranslations.text_translations[filename].iteritems():
+		element = elements.get(element_name)
+		if element is not None and element.get(attribute) is not None:
+			element.set(attribute, translation)
+		else:
+			remaining[(element_name, attribute)] = translation
+	return remaining
+
+
 def update_all_translations():
 	"""Update the translations in every active widget"""
 	from horizons.gui.gui import build_help_strings
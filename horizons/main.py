@@ -45,8 +45,9 @@ from horizons.gui import Gui
 from horizons.extscheduler import ExtScheduler
 from horizons.constants import AI, COLORS, GAME, PATHS, NETWORK, SINGLEPLAYER, GAME_SPEED
 from horizons.network.networkinterface import NetworkInterface
-from horizons.util import ActionSetLoader, DifficultySettings, TileSetLoader, Color, parse_port, Callback
+from horizons.util import ActionSetLoader, DifficultySettings, TileSetLoader, Color, parse_port, Callback, YamlCache
 from horizons.util.uhdbaccessor import UhDbAccessor
+from horizons.util.gamedatasnapshot import GameDataSnapshot
 
 # private module pointers of this module
 class Modules(object):
@@ -129,6 +130,10 @@ def start(_command_line_arguments):
 		GAME.MAX_TICKS = command_line_arguments.max_ticks
 
 	db = _create_main_db()
+	if not YamlCache.snapshot_files:
+		# entities need all game data files, parse the changed ones in parallel.
+		# Do this before the engine is initialised, the worker processes are forked.
+		YamlCache.load_files(GameDataSnapshot.get_yaml_files(), game_data=True)
 
 	# init game parts
 
@@ -550,8 +555,15 @@ def _load_last_quicksave(session=None, force_player_id=None):
 
 def _create_main_db():
 	"""Returns a dbreader instance, that is connected to the main game data dbfiles.
+	Uses the game data snapshot if it is up to date, the yaml files are then taken from it too.
 	NOTE: This data is read_only, so there are no concurrency issues"""
 	_db = UhDbAccessor(':memory:')
+	snapshot = GameDataSnapshot.load()
+	if snapshot is not None:
+		snapshot.fill_db(_db)
+		YamlCache.use_snapshot(snapshot)
+		return _db
+
 	for i in PATHS.DB_FILES:
 		f = open(i, "r")
 		sql = "BEGIN TRANSACTION;" + f.read() + "COMMIT;"
@@ -570,7 +582,8 @@ def preload_game_data(lock):
 		                      TileSetLoader.load,
 		                      Callback(Entities.load_grounds, mydb, load_now=True), \
 		                      Callback(Entities.load_buildings, mydb, load_now=True), \
-		                      Callback(Entities.load_units, load_now=True) ]
+		                      Callback(Entities.load_units, load_now=True),
+		                      _build_game_data_snapshot ]
 		for f in preload_functions:
 			if not lock.acquire(False):
 				break
@@ -585,6 +598,11 @@ def preload_game_data(lock):
 		if lock.locked():
 			lock.release()
 
+def _build_game_data_snapshot():
+	"""Compiles the game data for the next start, unless the current snapshot is up to date."""
+	if not YamlCache.snapshot_files:
+		GameDataSnapshot.build()
+
 def preload_game_join(preloading):
 	"""Wait for preloading to finish.
 	@param preloading: tuple: (Thread, Lock)"""
@@ -27,6 +27,7 @@ import os.path
 import glob
 import time
 import re
+import json
 import yaml
 import itertools
 
@@ -87,6 +88,12 @@ class SavegameManager(object):
 
 	campaign_status_file = os.path.join(savegame_dir, 'campaign_status.yaml')
 
+	# persistent cache of the metadata that is shown in the savegame lists, see get_cached_metadata
+	metadata_index_file = os.path.join(savegame_dir, 'metadata_index.json')
+	cached_metadata_keys = ('timestamp', 'savecounter', 'savegamerev')
+	_metadata_index = None # {filename: [mtime, size, metadata]}
+	_metadata_index_changed = False
+
 	@classmethod
 	def init(cls):
 		# create savegame directory if it does not exist
@@ -107,15 +114,16 @@ class SavegameManager(object):
 
 		for f in files:
 			if f.startswith(cls.autosave_dir):
-				name = u"Autosave {date}".format(date=get_timestamp_string(cls.get_metadata(f)))
+				name = u"Autosave {date}".format(date=get_timestamp_string(cls.get_cached_metadata(f)))
 			elif f.startswith(cls.quicksave_dir):
-				name = u"Quicksave {date}".format(date=get_timestamp_string(cls.get_metadata(f)))
+				name = u"Quicksave {date}".format(date=get_timestamp_string(cls.get_cached_metadata(f)))
 			else:
 				name = os.path.splitext(os.path.basename(f))[0]
 
 			if not isinstance(name, unicode):
 				name = unicode(name, errors='replace') # only use unicode strings, guichan needs them
 			displaynames.append( name )
+		cls._save_metadata_index()
 		return displaynames
 
 	@classmethod
@@ -215,23 +223,78 @@ class SavegameManager(object):
 		metadata = cls.savegame_metadata.copy()
 
 		try:
-			for key in metadata.iterkeys():
-				result = db("SELECT `value` FROM `metadata` WHERE `name` = ?", key)
-				if len(result) > 0:
-					assert(len(result) == 1)
-					metadata[key] = cls.savegame_metadata_types[key](result[0][0])
+			for key, value in db("SELECT `name`, `value` FROM `metadata`"):
+				if key in metadata:
+					metadata[key] = cls.savegame_metadata_types[key](value)
 		except sqlite3.OperationalError as e:
 			print 'Warning: Cannot read savegame {file}: {exception}'.format(file=savegamefile, exception=e)
+			db.close()
 			return metadata
 
-		screenshot_data = None
+		metadata['screenshot'] = cls._read_screenshot(db)
+		db.close()
+		return metadata
+
+	@classmethod
+	def get_screenshot(cls, savegamefile):
+		"""Returns the screenshot data of a savegame or None if it doesn't have one."""
+		db = DbReader(savegamefile)
+		screenshot_data = cls._read_screenshot(db)
+		db.close()
+		return screenshot_data
+
+	@classmethod
+	def _read_screenshot(cls, db):
 		try:
-			screenshot_data = db("SELECT value FROM metadata_blob where name = ?", "screen")[0][0]
+			return db("SELECT value FROM metadata_blob where name = ?", "screen")[0][0]
 		except IndexError: pass
 		except sqlite3.OperationalError: pass
-		metadata['screenshot'] = screenshot_data
+		return None
 
-		return metadata
+	@classmethod
+	def get_cached_metadata(cls, savegamefile):
+		"""Returns the metainfo of a savegame that is displayed in the savegame lists.
+		Contrary to get_metadata, only the keys in cached_metadata_keys are included. They are
+		kept in a persistent index and only read from the savegame when it has changed.
+		"""
+		if cls._metadata_index is None:
+			cls._load_metadata_index()
+		stat = os.stat(savegamefile)
+		key = os.path.abspath(savegamefile)
+		entry = cls._metadata_index.get(key)
+		if entry is None or entry[0] != stat.st_mtime or entry[1] != stat.st_size:
+			metadata = cls.get_metadata(savegamefile)
+			metadata = dict( (k, metadata[k]) for k in cls.cached_metadata_keys )
+			entry = cls._metadata_index[key] = [stat.st_mtime, stat.st_size, metadata]
+			cls._metadata_index_changed = True
+		return entry[2].copy()
+
+	@classmethod
+	def _load_metadata_index(cls):
+		cls._metadata_index = {}
+		cls._metadata_index_changed = False
+		if not os.path.exists(cls.metadata_index_file):
+			return
+		try:
+			with open(cls.metadata_index_file, 'r') as f:
+				cls._metadata_index = json.load(f)
+		except (IOError, ValueError) as e:
+			cls.log.warning("Savegamemanager: ignoring invalid metadata index %s: %s", cls.metadata_index_file, e)
+
+	@classmethod
+	def _save_metadata_index(cls):
+		"""Writes the metadata index if it has changed. Entries of deleted savegames are dropped."""
+		if not cls._metadata_index_changed:
+			return
+		for filename in cls._metadata_index.keys():
+			if not os.path.exists(filename):
+				del cls._metadata_index[filename]
+		try:
+			with open(cls.metadata_index_file, 'w') as f:
+				json.dump(cls._metadata_index, f)
+		except IOError as e:
+			cls.log.warning("Savegamemanager: failed to write metadata index %s: %s", cls.metadata_index_file, e)
+		cls._metadata_index_changed = False
 
 	@classmethod
 	def write_metadata(cls, db, savecounter, rng_state):
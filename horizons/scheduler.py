@@ -154,9 +154,11 @@ class Scheduler(LivingObject):
 		@param class_instance: class instance the function belongs to.
 		@param run_in: int number of ticks after which the callback is called. Defaults to 1, run next tick.
 		@param loops: How often the callback is called. -1 = infinite times. Defautls to 1, run once.
-		@param loop_interval: Delay between subsequent loops in ticks. Defaults to run_in."""
+		@param loop_interval: Delay between subsequent loops in ticks. Defaults to run_in.
+		@return: the created CallbackObject"""
 		callback_obj = _CallbackObject(self, callback, class_instance, run_in, loops, loop_interval)
 		self.add_object(callback_obj)
+		return callback_obj
 
 	def rem_object(self, callback_obj):
 		"""Removes a CallbackObject from all callback lists
@@ -265,6 +267,13 @@ class Scheduler(LivingObject):
 		else:
 			return calls.itervalues().next() if calls else None
 
+	def get_last_call(self, tick):
+		"""Returns the CallbackObject that is currently scheduled to be executed last in tick.
+		Callbacks for the current tick (run_in=0) are not considered.
+		@return: CallbackObject or None if nothing is scheduled for tick"""
+		callback_objects = self.schedule.get(tick)
+		return callback_objects[-1] if callback_objects else None
+
 	def get_ticks(self, seconds):
 		"""Call propagated to time instance"""
 		return self.timer.get_ticks(seconds)
@@ -21,10 +21,13 @@
 
 import os
 import os.path
+import errno
 import logging
 import json
+import sqlite3
 import traceback
 import time
+from collections import deque
 from random import Random
 
 import horizons.main
@@ -41,8 +44,10 @@ from horizons.extscheduler import ExtScheduler
 from horizons.view import View
 from horizons.world import World
 from horizons.entities import Entities
-from horizons.util import WorldObject, LivingObject, livingProperty, SavegameAccessor
+from horizons.util import WorldObject, LivingObject, livingProperty, SavegameAccessor, decorators
 from horizons.util.uhdbaccessor import read_savegame_template
+from horizons.util.savegamesnapshot import SavegameSnapshot, SavegameWriter
+from horizons.util.loadphases import LoadPhases
 from horizons.util.lastactiveplayersettlementmanager import LastActivePlayerSettlementManager
 from horizons.component.namedcomponent import NamedComponent
 from horizons.component.selectablecomponent import SelectableComponent, SelectableBuildingComponent
@@ -132,6 +137,7 @@ class Session(LivingObject):
 		self.selection_groups = [set() for _ in range(10)]  # List of sets that holds the player assigned unit groups.
 
 		self._old_autosave_interval = None
+		self._background_saves = deque() # (SavegameWriter, callback), the first one is being written
 
 	def start(self):
 		"""Actually starts the game."""
@@ -172,11 +178,26 @@ class Session(LivingObject):
 		self.log.debug("Ending session")
 		self.is_alive = False
 
+		if self.log.isEnabledFor(logging.DEBUG):
+			for name, stats in decorators.get_cache_stats():
+				self.log.debug("Cache %s: %s", name, stats)
+
 		self.gui.session = None
 
 		Scheduler().rem_all_classinst_calls(self)
 		ExtScheduler().rem_all_classinst_calls(self)
 
+		if self._background_saves:
+			# don't leave a half written savegame behind and also write the queued ones,
+			# the results can't be displayed any more
+			self._background_saves[0][0].join()
+			for writer, callback in list(self._background_saves)[1:]:
+				writer.run()
+			for writer, callback in self._background_saves:
+				if writer.exception is not None:
+					self.log.error("Session: Failed to write savegame %s:\n%s", writer.filename, writer.error)
+			self._background_saves.clear()
+
 		if horizons.main.fife.get_fife_setting("PlaySounds"):
 			for emitter in horizons.main.fife.sound.emitter['ambient'][:]:
 				emitter.stop()
@@ -279,62 +300,72 @@ class Session(LivingObject):
 		self.campaign = {} if not campaign else campaign
 
 		self.log.debug("Session: Loading from %s", savegame)
-		savegame_db = SavegameAccessor(savegame) # Initialize new dbreader
-		savegame_data = SavegameManager.get_metadata(savegame)
-
-		# load how often the game has been saved (used to know the difference between
-		# a loaded and a new game)
-		self.savecounter = 0 if not 'savecounter' in savegame_data else savegame_data['savecounter']
-
-		if savegame_data.get('rng_state', None):
-			rng_state_list = json.loads( savegame_data['rng_state'] )
-			# json treats tuples as lists, but we need tuples here, so convert back
-			def rec_list_to_tuple(x):
-				if isinstance(x, list):
-					return tuple( rec_list_to_tuple(i) for i in x )
-				else:
-					return x
-			rng_state_tuple = rec_list_to_tuple(rng_state_list)
-			# changing the rng is safe for mp, as all players have to have the same map
-			self.random.setstate( rng_state_tuple )
-
-		self.world = World(self) # Load horizons.world module (check horizons/world/__init__.py)
-		self.world._init(savegame_db, force_player_id, disasters_enabled=disasters_enabled)
-		self.view.load(savegame_db) # load view
-		if not self.is_game_loaded():
-			# NOTE: this must be sorted before iteration, cause there is no defined order for
-			#       iterating a dict, and it must happen in the same order for mp games.
-			for i in sorted(players, lambda p1, p2: cmp(p1['id'], p2['id'])):
-				self.world.setup_player(i['id'], i['name'], i['color'], i['local'], i['ai'], i['difficulty'])
-			self.world.set_forced_player(force_player_id)
-			center = self.world.init_new_world(trader_enabled, pirate_enabled, natural_resource_multiplier)
-			self.view.center(center[0], center[1])
-		else:
-			# try to load scenario data
-			self.scenario_eventhandler.load(savegame_db)
-		self.manager.load(savegame_db) # load the manager (there might me old scheduled ticks).
-		self.world.init_fish_indexer() # now the fish should exist
-		if self.is_game_loaded():
-			LastActivePlayerSettlementManager().load(savegame_db) # before ingamegui
-		self.ingame_gui.load(savegame_db) # load the old gui positions and stuff
-
-		for instance_id in savegame_db("SELECT id FROM selected WHERE `group` IS NULL"): # Set old selected instance
-			obj = WorldObject.get_object_by_id(instance_id[0])
-			self.selected_instances.add(obj)
-			obj.get_component(SelectableComponent).select()
-		for group in xrange(len(self.selection_groups)): # load user defined unit groups
-			for instance_id in savegame_db("SELECT id FROM selected WHERE `group` = ?", group):
-				self.selection_groups[group].add(WorldObject.get_object_by_id(instance_id[0]))
-
-		# cursor has to be inited last, else player interacts with a not inited world with it.
-		self.current_cursor = 'default'
-		self.cursor = SelectionTool(self)
-		# Set cursor correctly, menus might need to be opened.
-		# Open menus later; they may need unit data not yet inited
-		self.cursor.apply_select()
-
-		Scheduler().before_ticking()
-		savegame_db.close()
+		LoadPhases.start()
+		try:
+			with LoadPhases.phase('savegame'):
+				savegame_db = SavegameAccessor(savegame, release_rows=True) # Initialize new dbreader
+				savegame_data = SavegameManager.get_metadata(savegame)
+
+			# load how often the game has been saved (used to know the difference between
+			# a loaded and a new game)
+			self.savecounter = 0 if not 'savecounter' in savegame_data else savegame_data['savecounter']
+
+			if savegame_data.get('rng_state', None):
+				rng_state_list = json.loads( savegame_data['rng_state'] )
+				# json treats tuples as lists, but we need tuples here, so convert back
+				def rec_list_to_tuple(x):
+					if isinstance(x, list):
+						return tuple( rec_list_to_tuple(i) for i in x )
+					else:
+						return x
+				rng_state_tuple = rec_list_to_tuple(rng_state_list)
+				# changing the rng is safe for mp, as all players have to have the same map
+				self.random.setstate( rng_state_tuple )
+
+			self.world = World(self) # Load horizons.world module (check horizons/world/__init__.py)
+			with LoadPhases.phase('world'):
+				self.world._init(savegame_db, force_player_id, disasters_enabled=disasters_enabled)
+			self.view.load(savegame_db) # load view
+			if not self.is_game_loaded():
+				# NOTE: this must be sorted before iteration, cause there is no defined order for
+				#       iterating a dict, and it must happen in the same order for mp games.
+				for i in sorted(players, lambda p1, p2: cmp(p1['id'], p2['id'])):
+					self.world.setup_player(i['id'], i['name'], i['color'], i['local'], i['ai'], i['difficulty'])
+				self.world.set_forced_player(force_player_id)
+				with LoadPhases.phase('new world'):
+					center = self.world.init_new_world(trader_enabled, pirate_enabled, natural_resource_multiplier)
+				self.view.center(center[0], center[1])
+			else:
+				# try to load scenario data
+				self.scenario_eventhandler.load(savegame_db)
+			self.manager.load(savegame_db) # load the manager (there might me old scheduled ticks).
+			with LoadPhases.phase('fish indexer'):
+				self.world.init_fish_indexer() # now the fish should exist
+			if self.is_game_loaded():
+				LastActivePlayerSettlementManager().load(savegame_db) # before ingamegui
+			with LoadPhases.phase('gui'):
+				self.ingame_gui.load(savegame_db) # load the old gui positions and stuff
+
+			for instance_id in savegame_db("SELECT id FROM selected WHERE `group` IS NULL"): # Set old selected instance
+				obj = WorldObject.get_object_by_id(instance_id[0])
+				self.selected_instances.add(obj)
+				obj.get_component(SelectableComponent).select()
+			for group in xrange(len(self.selection_groups)): # load user defined unit groups
+				for instance_id in savegame_db("SELECT id FROM selected WHERE `group` = ?", group):
+					self.selection_groups[group].add(WorldObject.get_object_by_id(instance_id[0]))
+
+			# cursor has to be inited last, else player interacts with a not inited world with it.
+			self.current_cursor = 'default'
+			self.cursor = SelectionTool(self)
+			# Set cursor correctly, menus might need to be opened.
+			# Open menus later; they may need unit data not yet inited
+			self.cursor.apply_select()
+
+			Scheduler().before_ticking()
+			savegame_db.close()
+		finally:
+			load_phases = LoadPhases.stop()
+		self._report_load_phases(load_phases)
 
 		assert hasattr(self.world, "player"), 'Error: there is no human player'
 		"""
@@ -344,6 +375,16 @@ class Session(LivingObject):
 		(horizons/world/__init__.py). It's where the magic happens and all buildings and units are loaded.
 		"""
 
+	def _report_load_phases(self, load_phases):
+		"""Logs how long loading took and writes it to the file given by --load-phases-json."""
+		self.load_phases = load_phases
+		for line in load_phases.get_report():
+			self.log.debug("Session: %s", line)
+		filename = getattr(horizons.main.command_line_arguments, 'load_phases_json', None)
+		if filename:
+			with open(filename, 'w') as f:
+				f.write(load_phases.to_json())
+
 	def speed_set(self, ticks, suggestion=False):
 		"""Set game speed to ticks ticks per second"""
 		old = self.timer.ticks_per_second
@@ -493,10 +534,7 @@ class Session(LivingObject):
 
 			db = DbReader(savegame)
 		except IOError as e: # usually invalid filename
-			headline = _("Failed to create savegame file")
-			descr = _("There has been an error while creating your savegame file.")
-			advice = _("This usually means that the savegame name contains unsupported special characters.")
-			self.gui.show_error_popup(headline, descr, advice, unicode(e))
+			self._show_save_file_error(e)
 			return self.save() # retry with new savegamename entered by the user
 			# this must not happen with quicksave/autosave
 		except ZeroDivisionError as err:
@@ -516,21 +554,7 @@ class Session(LivingObject):
 			read_savegame_template(db)
 
 			db("BEGIN")
-			self.world.save(db)
-			#self.manager.save(db)
-			self.view.save(db)
-			self.ingame_gui.save(db)
-			self.scenario_eventhandler.save(db)
-			LastActivePlayerSettlementManager().save(db)
-
-			for instance in self.selected_instances:
-				db("INSERT INTO selected(`group`, id) VALUES(NULL, ?)", instance.worldid)
-			for group in xrange(len(self.selection_groups)):
-				for instance in self.selection_groups[group]:
-					db("INSERT INTO selected(`group`, id) VALUES(?, ?)", group, instance.worldid)
-
-			rng_state = json.dumps( self.random.getstate() )
-			SavegameManager.write_metadata(db, self.savecounter, rng_state)
+			self._save_state(db)
 			# make sure everything gets written now
 			db("COMMIT")
 			db.close()
@@ -541,3 +565,85 @@ class Session(LivingObject):
 			db.close() # close db before delete
 			os.unlink(savegame) # remove invalid savegamefile
 			return False
+
+	def _do_save_in_background(self, savegame, callback):
+		"""Saves without stalling the game for the time the savegame is written.
+		The state is captured right away in a SavegameSnapshot, which is then written in a
+		separate thread while the game continues. The savegame file only appears when it is
+		complete. If another savegame is still being written, this one is written afterwards.
+		@param savegame: absolute path
+		@param callback: called as callback(error) in the main thread when writing is done or
+		                 has failed. error is None on success, else the exception, which has
+		                 already been logged. See _show_save_file_error.
+		@return: bool, whether capturing worked and the savegame is going to be written"""
+		assert os.path.isabs(savegame)
+		self.log.debug("Session: Saving to %s in background", savegame)
+		self.savecounter += 1
+		snapshot = SavegameSnapshot()
+		try:
+			self._save_state(snapshot)
+		except Exception as e:
+			self.log.exception("Session: Failed to save to %s", savegame)
+			callback(e)
+			return False
+
+		self._background_saves.append( (SavegameWriter(snapshot, savegame), callback) )
+		if len(self._background_saves) == 1:
+			self._start_background_save()
+		else:
+			self.log.debug("Session: %s is written when the last savegame is done", savegame)
+		return True
+
+	def _start_background_save(self):
+		self._background_saves[0][0].start()
+		ExtScheduler().add_new_object(self._check_background_save, self, run_in=0.1)
+
+	def _check_background_save(self):
+		"""Polls the thread of _do_save_in_background and reports the result when it's done"""
+		if not self._background_saves:
+			return
+		writer, callback = self._background_saves[0]
+		if writer.is_alive():
+			ExtScheduler().add_new_object(self._check_background_save, self, run_in=0.1)
+			return
+		self._background_saves.popleft()
+		if self._background_saves:
+			self._start_background_save()
+		if writer.exception is not None:
+			self.log.error("Session: Failed to write savegame %s:\n%s", writer.filename, writer.error)
+		callback(writer.exception)
+
+	def _show_save_file_error(self, error):
+		"""Shows a popup for errors that are caused by the savegame file, e.g. an invalid
+		filename or a read-only directory.
+		@return: whether error is such an error and has been shown"""
+		if isinstance(error, EnvironmentError) and error.errno in (errno.EACCES, errno.EPERM):
+			self.gui.show_error_popup(_("Access is denied"), \
+			                          _("The savegame file is probably read-only."))
+		elif isinstance(error, (EnvironmentError, sqlite3.OperationalError)):
+			headline = _("Failed to create savegame file")
+			descr = _("There has been an error while creating your savegame file.")
+			advice = _("This usually means that the savegame name contains unsupported special characters.")
+			self.gui.show_error_popup(headline, descr, advice, unicode(error))
+		else:
+			return False
+		return True
+
+	def _save_state(self, db):
+		"""Writes the state of the session to db.
+		@param db: DbReader or SavegameSnapshot with the savegame tables"""
+		self.world.save(db)
+		#self.manager.save(db)
+		self.view.save(db)
+		self.ingame_gui.save(db)
+		self.scenario_eventhandler.save(db)
+		LastActivePlayerSettlementManager().save(db)
+
+		for instance in self.selected_instances:
+			db("INSERT INTO selected(`group`, id) VALUES(NULL, ?)", instance.worldid)
+		for group in xrange(len(self.selection_groups)):
+			for instance in self.selection_groups[group]:
+				db("INSERT INTO selected(`group`, id) VALUES(?, ?)", group, instance.worldid)
+
+		rng_state = json.dumps( self.random.getstate() )
+		SavegameManager.write_metadata(db, self.savecounter, rng_state)
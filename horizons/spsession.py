@@ -49,20 +49,26 @@ class SPSession(Session):
 	def autosave(self):
 		"""Called automatically in an interval"""
 		self.log.debug("Session: autosaving")
-		success = self._do_save(SavegameManager.create_autosave_filename())
-		if success:
+		self._do_save_in_background(SavegameManager.create_autosave_filename(), self._on_autosave_written)
+
+	def _on_autosave_written(self, error):
+		if error is None:
 			SavegameManager.delete_dispensable_savegames(autosaves = True)
 			self.ingame_gui.message_widget.add(None, None, 'AUTOSAVE')
+		else:
+			self._show_save_file_error(error)
 
 	def quicksave(self):
 		"""Called when user presses the quicksave hotkey"""
 		self.log.debug("Session: quicksaving")
-		# call saving through horizons.main and not directly through session, so that save errors are handled
-		success = self._do_save(SavegameManager.create_quicksave_filename())
-		if success:
+		# the savegame is written while the game continues, errors are shown when it's done
+		self._do_save_in_background(SavegameManager.create_quicksave_filename(), self._on_quicksave_written)
+
+	def _on_quicksave_written(self, error):
+		if error is None:
 			SavegameManager.delete_dispensable_savegames(quicksaves = True)
 			self.ingame_gui.message_widget.add(None, None, 'QUICKSAVE')
-		else:
+		elif not self._show_save_file_error(error):
 			headline = _(u"Failed to quicksave.")
 			descr = _(u"An error happened during quicksave. Your game has not been saved.")
 			advice = _(u"If this error happens again, please contact the development team:") + \
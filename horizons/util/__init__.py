@@ -35,6 +35,7 @@ from sqliteanimationloader import SQLiteAnimationLoader
 from sqliteatlasloader import SQLiteAtlasLoader
 from difficultysettings import DifficultySettings
 from yamlcache import YamlCache
+from statehistory import StateHistory
 
 from shapes.point import Point, ConstPoint
 from shapes.rect import Rect, ConstRect
@@ -22,6 +22,8 @@
 import sqlite3
 import re
 
+from collections import OrderedDict
+
 from horizons.util.python import decorators
 
 class DbReader(object):
@@ -35,6 +37,8 @@ class DbReader(object):
 			return r.match(item) is not None
 		self.connection.create_function("regexp", 2, regexp)
 		self.cur = self.connection.cursor()
+		self._buffered_rows = OrderedDict() # command: [args], see add_row
+
 
 	@decorators.make_constants()
 	def __call__(self, command, *args):
@@ -43,6 +47,8 @@ class DbReader(object):
 		@param args: tuple containing the values to add into the command.
 		"""
 		assert not command.endswith(";")
+		if self._buffered_rows:
+			self.flush_rows()
 		command = '%s;' % command
 		self.cur.execute(command, args)
 		# fetch rows only on select statements, PEP-249 specifies that an error should be
@@ -53,9 +59,10 @@ class DbReader(object):
 		else:
 			return []
 
-	@decorators.cachedmethod
+	@decorators.lru_cachedmethod(maxsize=1024)
 	def cached_query(self, command, *args):
 		"""Executes a sql command and saves its result in a dict.
+		Only the results of the most recently used queries are kept.
 		@params, return: same as in __call__"""
 		return self(command, *args)
 
@@ -64,13 +71,37 @@ class DbReader(object):
 		found in parameters.
 		@param command: same as in __call__
 		@param parameters: sequence or iterator"""
+		if self._buffered_rows:
+			self.flush_rows()
 		return self.cur.executemany(command, parameters)
 
 	def execute_script(self, script):
 		"""Executes a multiline script.
 		@param script: multiline str containing an sql script."""
+		if self._buffered_rows:
+			self.flush_rows()
 		return self.cur.executescript(script)
 
+	def add_row(self, command, *args):
+		"""Buffers a row that is to be written by command.
+		This is meant for the save methods, which write lots of rows with the same few commands.
+		The rows of each command are written at once with executemany as soon as any other
+		command is executed (e.g. the final COMMIT) or flush_rows() is called. Commands are
+		flushed in the order they were first used, rows of a command in the order they were added.
+		@param command: INSERT statement with ? as placeholders, like for __call__
+		@param args: values of the row"""
+		rows = self._buffered_rows.get(command)
+		if rows is None:
+			assert not command.endswith(";")
+			rows = self._buffered_rows[command] = []
+		rows.append(args)
+
+	def flush_rows(self):
+		"""Writes the rows buffered by add_row"""
+		buffered_rows, self._buffered_rows = self._buffered_rows, OrderedDict()
+		for command, rows in buffered_rows.iteritems():
+			self.cur.executemany(command, rows)
+
 	def close(self):
 		"""Closes the db"""
 		self.connection.close()
@@ -0,0 +1,191 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import sys
+import marshal
+import hashlib
+import logging
+import sqlite3
+
+from horizons.constants import PATHS
+from horizons.util.yamlcache import YamlCache
+
+
+class GameDataSnapshot(object):
+	"""Compiled copy of the static game data: the tables of the main db files
+	and the converted yaml object files, stored in one marshal file.
+
+	The snapshot records (mtime, size) of every source file. If one of them changed,
+	the content hash of all sources decides whether the snapshot is still valid.
+	If it is, the snapshot is stored again with the new stats.
+	Stale or unreadable snapshots are ignored, the data is then read from the
+	sources as usual and a new snapshot can be built.
+	"""
+	VERSION = 1
+
+	filename = os.path.join(PATHS.USER_DIR, 'gamedata.snapshot')
+	objects_dir = os.path.join('content', 'objects')
+
+	log = logging.getLogger("util.gamedatasnapshot")
+
+	def __init__(self, data):
+		self.sources = data['sources'] # filename: (mtime, size)
+		self.content_hash = data['content_hash']
+		self.tables = data['tables'] # list of (create sql, insert sql, rows)
+		self.sql = data['sql'] # other schema statements, e.g. indices
+		self.yaml_files = data['yaml_files'] # filename: marshalled game data
+
+	@classmethod
+	def get_yaml_files(cls):
+		"""Returns all yaml files of the game data."""
+		yaml_files = []
+		for root, dirnames, filenames in os.walk(cls.objects_dir):
+			for filename in filenames:
+				if filename.endswith('.yaml'):
+					yaml_files.append(os.path.join(root, filename))
+		return sorted(yaml_files)
+
+	@classmethod
+	def get_source_files(cls):
+		"""Returns all files the snapshot is made of, yaml files first."""
+		return cls.get_yaml_files() + list(PATHS.DB_FILES)
+
+	@classmethod
+	def _get_stats(cls, filenames):
+		stats = {}
+		for filename in filenames:
+			stat = os.stat(filename)
+			stats[filename] = (stat.st_mtime, stat.st_size)
+		return stats
+
+	@classmethod
+	def _get_content_hash(cls, filenames):
+		h = hashlib.md5()
+		for filename in filenames:
+			h.update(filename)
+			with open(filename, 'rb') as f:
+				h.update(f.read())
+		return h.hexdigest()
+
+	@classmethod
+	def load(cls, filename=None):
+		"""Returns the snapshot stored in filename, or None if it is missing or stale."""
+		filename = filename or cls.filename
+		try:
+			with open(filename, 'rb') as f:
+				header, data = marshal.loads(f.read())
+		except (IOError, EOFError, ValueError, TypeError) as e:
+			cls.log.debug("Can't read game data snapshot %s: %s", filename, e)
+			return None
+
+		if header != cls._get_header():
+			cls.log.debug("Game data snapshot %s has a different version", filename)
+			return None
+
+		sources = cls.get_source_files()
+		if sorted(data['sources']) != sorted(sources):
+			cls.log.debug("Game data snapshot %s has different source files", filename)
+			return None
+		stats = cls._get_stats(sources)
+		if stats != data['sources']:
+			if cls._get_content_hash(sources) != data['content_hash']:
+				cls.log.debug("Game data snapshot %s is outdated", filename)
+				return None
+			# only touched, store the new stats so that the next start doesn't hash again
+			data['sources'] = stats
+			try:
+				cls._write(filename, data)
+			except (IOError, OSError) as e:
+				cls.log.debug("Can't update the stats of game data snapshot %s: %s", filename, e)
+
+		return cls(data)
+
+	@classmethod
+	def build(cls, filename=None):
+		"""Compiles the current game data into a snapshot stored in filename."""
+		filename = filename or cls.filename
+		sources = cls.get_source_files()
+		# take the stats first, a file changed meanwhile is noticed by the next load
+		stats = cls._get_stats(sources)
+		content_hash = cls._get_content_hash(sources)
+
+		yaml_files = {}
+		for source in sources:
+			if source.endswith('.yaml'):
+				yaml_files[source] = marshal.dumps(YamlCache.get_file(source, game_data=True))
+
+		tables, sql = cls._dump_db_files()
+
+		data = {
+		  'sources': stats,
+		  'content_hash': content_hash,
+		  'tables': tables,
+		  'sql': sql,
+		  'yaml_files': yaml_files,
+		}
+		cls._write(filename, data)
+		return cls(data)
+
+	@classmethod
+	def _write(cls, filename, data):
+		# write to a temporary file first, so that no one reads a half written snapshot
+		tmp_filename = filename + '.tmp'
+		with open(tmp_filename, 'wb') as f:
+			f.write(marshal.dumps((cls._get_header(), data)))
+		if os.path.exists(filename):
+			os.remove(filename) # rename doesn't replace files on windows
+		os.rename(tmp_filename, filename)
+
+	@classmethod
+	def _get_header(cls):
+		# the marshal format is only guaranteed to be compatible within one python version
+		return (cls.VERSION, tuple(sys.version_info[:2]))
+
+	@classmethod
+	def _dump_db_files(cls):
+		"""Returns the tables created by the db files and the remaining schema statements."""
+		con = sqlite3.connect(':memory:')
+		for db_file in PATHS.DB_FILES:
+			with open(db_file, 'r') as f:
+				con.executescript("BEGIN TRANSACTION;" + f.read() + "COMMIT;")
+
+		tables = []
+		for name, create in con.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' ORDER BY rowid"):
+			cur = con.execute('SELECT * FROM "%s"' % name)
+			insert = 'INSERT INTO "%s" VALUES (%s)' % (name, ', '.join('?' * len(cur.description)))
+			tables.append( (create, insert, cur.fetchall()) )
+		sql = [ row[0] for row in
+		        con.execute("SELECT sql FROM sqlite_master WHERE type != 'table' AND sql IS NOT NULL ORDER BY rowid") ]
+		con.close()
+		return tables, sql
+
+	def fill_db(self, db):
+		"""Creates the tables of the snapshot in the DbReader db."""
+		db("BEGIN TRANSACTION")
+		for create, insert, rows in self.tables:
+			db(create)
+			if rows:
+				db.execute_many(insert, rows)
+		for sql in self.sql:
+			db(sql)
+		db("COMMIT")
@@ -27,6 +27,7 @@ import horizons.main
 from horizons.constants import PATHS
 from loader import GeneralLoader
 from jsondecoder import JsonDecoder
+from manifest import SetManifest
 
 class ActionSetLoader(object):
 	"""The ActionSetLoader loads action sets from a directory tree. The directories loaded
@@ -42,6 +43,8 @@ class ActionSetLoader(object):
 	action_sets = {}
 	_loaded = False
 
+	manifest = SetManifest('actionsets')
+
 	@classmethod
 	def _find_action_sets(cls, dir):
 		"""Traverses recursively starting from dir to find action sets.
@@ -54,14 +57,20 @@ class ActionSetLoader(object):
 				if os.path.isdir(full_path) and entry != ".svn" and entry != ".DS_Store":
 					cls._find_action_sets(full_path)
 
+	@classmethod
+	def _scan_action_sets(cls):
+		cls.action_sets = {}
+		cls._find_action_sets(PATHS.ACTION_SETS_DIRECTORY)
+		return cls.action_sets
+
 	@classmethod
 	def load(cls):
 		if not cls._loaded:
 			cls.log.debug("Loading action_sets...")
 			if not horizons.main.fife.use_atlases:
-				cls._find_action_sets(PATHS.ACTION_SETS_DIRECTORY)
+				cls.action_sets = cls.manifest.load(PATHS.ACTION_SETS_DIRECTORY, cls._scan_action_sets)
 			else:
-				cls.action_sets = JsonDecoder.load(PATHS.ACTION_SETS_JSON_FILE)
+				cls.action_sets = cls.manifest.load(PATHS.ACTION_SETS_JSON_FILE, lambda: JsonDecoder.load(PATHS.ACTION_SETS_JSON_FILE))
 			cls.log.debug("Done!")
 			cls._loaded = True
 
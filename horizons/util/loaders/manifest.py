@@ -0,0 +1,107 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import sys
+import marshal
+import logging
+
+from horizons.constants import PATHS
+
+
+class SetManifest(object):
+	"""Stores the action or tile sets found in the gfx directory tree (or read from the
+	json file of the atlases), so that the tree doesn't need to be scanned on every start.
+
+	The manifest records the mtime of every directory of the tree. Adding or removing a
+	set, an action, a rotation or a frame changes the mtime of its parent directory,
+	so checking the manifest takes one stat per directory instead of listing all of them.
+	"""
+	VERSION = 1
+
+	log = logging.getLogger("util.loaders.manifest")
+
+	def __init__(self, name):
+		"""
+		@param name: name of the manifest file in the user dir
+		"""
+		self.filename = os.path.join(PATHS.USER_DIR, name + '.manifest')
+
+	def load(self, source, scan):
+		"""Returns the sets of source, from the manifest if it is up to date.
+		@param source: directory tree or json file the sets are loaded from
+		@param scan: function that loads the sets from source
+		"""
+		sets = self._read(source)
+		if sets is None:
+			self.log.debug("Manifest %s is outdated, loading from %s", self.filename, source)
+			# take the stamps first, changes made while scanning are noticed on the next start
+			stamps = self._get_stamps(source)
+			sets = scan()
+			self._write(source, stamps, sets)
+		return sets
+
+	def _get_header(self, source):
+		# the marshal format is only guaranteed to be compatible within one python version
+		return (self.VERSION, tuple(sys.version_info[:2]), source)
+
+	def _get_stamps(self, source):
+		paths = [source]
+		if os.path.isdir(source):
+			for root, dirnames, filenames in os.walk(source):
+				paths.extend(os.path.join(root, dirname) for dirname in dirnames)
+		stamps = {}
+		for path in paths:
+			stat = os.stat(path)
+			stamps[path] = (stat.st_mtime, stat.st_size)
+		return stamps
+
+	def _read(self, source):
+		try:
+			with open(self.filename, 'rb') as f:
+				header, stamps, sets = marshal.loads(f.read())
+		except (IOError, EOFError, ValueError, TypeError):
+			return None
+		if header != self._get_header(source):
+			return None
+
+		for path, stamp in stamps.iteritems():
+			try:
+				stat = os.stat(path)
+			except OSError:
+				return None
+			if (stat.st_mtime, stat.st_size) != stamp:
+				return None
+		return sets
+
+	def _write(self, source, stamps, sets):
+		data = marshal.dumps((self._get_header(source), stamps, sets))
+		tmp_filename = self.filename + '.tmp'
+		try:
+			with open(tmp_filename, 'wb') as f:
+				f.write(data)
+			if os.path.exists(self.filename):
+				os.remove(self.filename) # rename doesn't replace files on windows
+			os.rename(tmp_filename, self.filename)
+		except (IOError, OSError) as e:
+			# not fatal, the sets are just scanned again next time
+			self.log.warning("Failed to write manifest %s: %s", self.filename, e)
@@ -27,6 +27,7 @@ import horizons.main
 from horizons.constants import PATHS
 from loader import GeneralLoader
 from jsondecoder import JsonDecoder
+from manifest import SetManifest
 
 class TileSetLoader(object):
 	"""The TileSetLoader loads tile sets from a directory tree. The directories loaded
@@ -42,6 +43,8 @@ class TileSetLoader(object):
 	tile_sets = {}
 	_loaded = False
 
+	manifest = SetManifest('tilesets')
+
 	@classmethod
 	def _find_tile_sets(cls, dir):
 		"""Traverses recursively starting from dir to find action sets.
@@ -54,15 +57,21 @@ class TileSetLoader(object):
 				if os.path.isdir(full_path) and entry != ".svn" and entry != ".DS_Store":
 					cls._find_tile_sets(full_path)
 
+	@classmethod
+	def _scan_tile_sets(cls):
+		cls.tile_sets = {}
+		cls._find_tile_sets(PATHS.TILE_SETS_DIRECTORY)
+		return cls.tile_sets
+
 	@classmethod
 	def load(cls):
 		#print "called"
 		if not cls._loaded:
 			cls.log.debug("Loading tile_sets...")
 			if not horizons.main.fife.use_atlases:
-				cls._find_tile_sets(PATHS.TILE_SETS_DIRECTORY)
+				cls.tile_sets = cls.manifest.load(PATHS.TILE_SETS_DIRECTORY, cls._scan_tile_sets)
 			else:
-				cls.tile_sets = JsonDecoder.load(PATHS.TILE_SETS_JSON_FILE)
+				cls.tile_sets = cls.manifest.load(PATHS.TILE_SETS_JSON_FILE, lambda: JsonDecoder.load(PATHS.TILE_SETS_JSON_FILE))
 			cls.log.debug("Done!")
 			cls._loaded = True
 
@@ -0,0 +1,129 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import json
+import os
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class LoadPhases(object):
+	"""Records wall time, object counts and memory usage of the phases of loading a game.
+
+	Loading code marks its phases with LoadPhases.phase(), which may be nested, and adds
+	object counts with LoadPhases.count(). Both only record something between start() and
+	stop(), so the same code can also run for e.g. map previews without any overhead.
+	Phases with the same name in the same parent phase (e.g. one per island) are merged.
+
+	Use like this:
+	LoadPhases.start()
+	with LoadPhases.phase('islands'):
+		...
+		LoadPhases.count('tiles', len(tiles))
+	phases = LoadPhases.stop()
+	print '\\n'.join(phases.get_report())
+	"""
+
+	_active = None # instance that currently records
+
+	def __init__(self):
+		# (phase name, ...): {'seconds', 'memory', 'calls', 'counts'}, in order of first occurrence
+		self.phases = OrderedDict()
+		self._path = ()
+		self.seconds = None
+
+	@classmethod
+	def start(cls):
+		"""Starts recording with a new instance and returns it."""
+		cls._active = cls()
+		cls._active._start_time = time.time()
+		return cls._active
+
+	@classmethod
+	def stop(cls):
+		"""Stops recording and returns the instance with the results."""
+		phases, cls._active = cls._active, None
+		if phases is not None:
+			phases.seconds = time.time() - phases._start_time
+		return phases
+
+	@classmethod
+	@contextmanager
+	def phase(cls, name):
+		"""Context manager that records the code inside it as phase name."""
+		phases = cls._active
+		if phases is None:
+			yield
+			return
+		parent_path = phases._path
+		path = phases._path = parent_path + (name, )
+		entry = phases.phases.get(path)
+		if entry is None:
+			entry = phases.phases[path] = {'seconds': 0.0, 'memory': 0, 'calls': 0, 'counts': {}}
+		memory = cls._get_memory()
+		start = time.time()
+		try:
+			yield
+		finally:
+			entry['seconds'] += time.time() - start
+			if memory is not None:
+				entry['memory'] += cls._get_memory() - memory
+			entry['calls'] += 1
+			phases._path = parent_path
+
+	@classmethod
+	def count(cls, name, amount=1):
+		"""Adds amount objects of the kind name to the current phase."""
+		phases = cls._active
+		if phases is None or not phases._path:
+			return
+		counts = phases.phases[phases._path]['counts']
+		counts[name] = counts.get(name, 0) + amount
+
+	@classmethod
+	def _get_memory(cls):
+		"""Returns the current memory usage (resident set size) in KiB or None if it's unknown"""
+		try:
+			with open('/proc/self/statm') as f:
+				return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+		except (IOError, OSError, ValueError, AttributeError):
+			return None # only supported on linux
+
+	def get_report(self):
+		"""Returns the results as list of human readable lines."""
+		lines = ['Loading took %.3f s' % self.seconds]
+		for path, entry in self.phases.iteritems():
+			counts = ', '.join('%s %s' % (amount, name) for name, amount in sorted(entry['counts'].iteritems()))
+			lines.append('%s%s: %.3f s, %+d KiB%s%s' % ('  ' * len(path), path[-1], entry['seconds'],
+			             entry['memory'], ' (%dx)' % entry['calls'] if entry['calls'] > 1 else '',
+			             ', ' + counts if counts else ''))
+		return lines
+
+	def to_json(self):
+		"""Returns the results as json string, e.g. for load time benchmarks."""
+		phases = []
+		for path, entry in self.phases.iteritems():
+			data = dict(entry, phase='/'.join(path))
+			phases.append(data)
+		return json.dumps({'seconds': self.seconds, 'phases': phases}, indent=1)
@@ -0,0 +1,119 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+
+from horizons.constants import PATHS, VERSION
+
+
+class MapPreviewCache(object):
+	"""Stores rendered map previews in the user dir, so that the minimap of a map
+	only needs to be calculated the first time it is shown.
+
+	An entry contains the pixel data of the preview as returned by Minimap.dump_data().
+	Existing maps are identified by the hash of the map file, random maps by the
+	parameters they are generated from. Both keys also contain the preview size.
+	"""
+	VERSION = 1
+	MAX_ENTRIES = 64
+
+	directory = os.path.join(PATHS.USER_DIR, 'mappreviews')
+
+	log = logging.getLogger("util.mappreviewcache")
+
+	@classmethod
+	def get_map_key(cls, map_file, size):
+		"""Returns the cache key of the preview of an existing map.
+		@param map_file: filename of the map
+		@param size: (width, height) of the preview
+		"""
+		with open(map_file, 'rb') as f:
+			map_hash = hashlib.md5(f.read()).hexdigest()
+		return cls._get_key('map', list(size), map_hash)
+
+	@classmethod
+	def get_random_map_key(cls, size, parameters):
+		"""Returns the cache key of the preview of a random map.
+		@param size: (width, height) of the preview
+		@param parameters: parameters of random_map.generate_map()
+		"""
+		return cls._get_key('random', list(size), list(parameters))
+
+	@classmethod
+	def _get_key(cls, *args):
+		# the game version is part of the key, the map generator or the colors might have changed
+		data = json.dumps([cls.VERSION, VERSION.RELEASE_VERSION] + list(args))
+		return hashlib.md5(data).hexdigest()
+
+	@classmethod
+	def _get_filename(cls, key):
+		return os.path.join(cls.directory, key + '.preview')
+
+	@classmethod
+	def get(cls, key):
+		"""Returns the preview data stored for key or None if there is none."""
+		filename = cls._get_filename(key)
+		try:
+			with open(filename, 'rb') as f:
+				data = zlib.decompress(f.read())
+			os.utime(filename, None) # mark as recently used, see _prune()
+		except (IOError, OSError, zlib.error):
+			return None
+		return data
+
+	@classmethod
+	def put(cls, key, data):
+		"""Stores the preview data (Minimap.dump_data() output) for key."""
+		filename = cls._get_filename(key)
+		tmp_filename = filename + '.tmp'
+		try:
+			if not os.path.isdir(cls.directory):
+				os.makedirs(cls.directory)
+			with open(tmp_filename, 'wb') as f:
+				f.write(zlib.compress(data))
+			if os.path.exists(filename):
+				os.remove(filename) # rename doesn't replace files on windows
+			os.rename(tmp_filename, filename)
+		except (IOError, OSError) as e:
+			# not fatal, the preview is just calculated again next time
+			cls.log.warning("Failed to write map preview %s: %s", filename, e)
+			return
+		cls._prune()
+
+	@classmethod
+	def _prune(cls):
+		"""Removes the least recently used entries if there are more than MAX_ENTRIES."""
+		entries = []
+		for filename in os.listdir(cls.directory):
+			if filename.endswith('.preview'):
+				filename = os.path.join(cls.directory, filename)
+				entries.append((os.path.getmtime(filename), filename))
+		entries.sort()
+		for mtime, filename in entries[:-cls.MAX_ENTRIES]:
+			try:
+				os.remove(filename)
+			except OSError:
+				pass
@@ -187,7 +187,7 @@ class AbstractPather(object):
 		# current position is calculated on loading through unit position
 		if self.path:
 			for step in xrange(len(self.path)):
-				db("INSERT INTO unit_path(`unit`, `index`, `x`, `y`) VALUES(?, ?, ?, ?)", \
+				db.add_row("INSERT INTO unit_path(`unit`, `index`, `x`, `y`) VALUES(?, ?, ?, ?)", \
 					 unitid, step, self.path[step][0], self.path[step][1])
 
 	def load(self, db, worldid):
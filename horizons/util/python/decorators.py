@@ -24,81 +24,197 @@
 from types import FunctionType, ClassType
 import time
 import functools
+import weakref
+import collections
+
+class _Cache(object):
+	"""Result storage of a cached function or of one instance of a cached method.
+	If maxsize is set, the least recently used entries are dropped when it is exceeded.
+	If timeout is set, entries are recomputed when they are older than timeout seconds.
+	"""
+	def __init__(self, maxsize=None, timeout=None):
+		assert maxsize is None or maxsize > 0
+		self.maxsize = maxsize
+		self.timeout = timeout
+		self.data = collections.OrderedDict() if maxsize is not None else {}
+		self.dates = {} if timeout is not None else None
+		self.hits = 0
+		self.misses = 0
+
+	def lookup(self, func, key, args, kwargs):
+		data = self.data
+		try:
+			value = data[key]
+		except KeyError:
+			return self._add(func, key, args, kwargs)
+		except TypeError:
+			raise TypeError("Supplied invalid argument to cache decorator: %s" % (key, ))
+
+		if self.timeout is not None and self.dates[key] + self.timeout < time.time():
+			# expired
+			del data[key]
+			return self._add(func, key, args, kwargs)
+
+		self.hits += 1
+		if self.maxsize is not None:
+			# mark as most recently used
+			del data[key]
+			data[key] = value
+		return value
+
+	def _add(self, func, key, args, kwargs):
+		self.misses += 1
+		value = self.data[key] = func(*args, **kwargs)
+		if self.timeout is not None:
+			self.dates[key] = time.time()
+		if self.maxsize is not None and len(self.data) > self.maxsize:
+			old_key = self.data.popitem(last=False)[0]
+			if self.timeout is not None:
+				del self.dates[old_key]
+		return value
+
+	def invalidate(self, key):
+		self.data.pop(key, None)
+		if self.timeout is not None:
+			self.dates.pop(key, None)
+
+	def clear(self):
+		self.data.clear()
+		if self.timeout is not None:
+			self.dates.clear()
+
+	def get_stats(self):
+		return CacheStats(self.hits, self.misses, len(self.data), self.maxsize)
+
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'size', 'maxsize'])
+
+_kwargs_mark = object() # separates args from kwargs in cache keys
+
+def _make_key(args, kwargs):
+	if kwargs:
+		# dicts are not hashable, convert kwargs to a tuple
+		return args + (_kwargs_mark, ) + tuple(sorted(kwargs.iteritems()))
+	return args
+
+# all cachedfunction and cachedmethod objects, see get_cache_stats
+# they are only referenced weakly, so that e.g. decorated local functions can be freed with their data
+_caches = weakref.WeakSet()
+
+def get_cache_stats():
+	"""Returns a list of (name, CacheStats) for every cached function and method that is
+	still alive, sorted by name.
+	Cached methods report the sum over all their instances that are still alive."""
+	return sorted( (c.name, c.get_stats()) for c in list(_caches) )
+
 
 class cachedfunction(object):
 	"""Decorator that caches a function's return value each time it is called.
 	If called later with the same arguments, the cached value is returned, and
 	not re-evaluated.
+	Use lru_cachedfunction to limit the number of cached values.
 	"""
-	def __init__(self, func):
+	def __init__(self, func, maxsize=None, timeout=None):
 		self.func = func
-		self.cache = {}
+		self.name = '%s.%s' % (func.__module__, func.__name__)
+		self.cache = _Cache(maxsize, timeout)
+		functools.update_wrapper(self, func)
+		_caches.add(self)
 
 	def __call__(self, *args, **kwargs):
-		# dicts are not hashable, convert kwargs to a tuple
-		kwargs_tuple = tuple(sorted(kwargs.items()))
+		return self.cache.lookup(self.func, _make_key(args, kwargs), args, kwargs)
 
-		try:
-			return self.cache[(args, kwargs_tuple)]
-		except KeyError:
-			self.cache[(args, kwargs_tuple)] = value = self.func(*args, **kwargs)
-			return value
-		except TypeError:
-			assert False, "Supplied invalid argument to cache decorator"
+	def invalidate(self, *args, **kwargs):
+		"""Drops the value cached for these arguments"""
+		self.cache.invalidate(_make_key(args, kwargs))
+
+	def cache_clear(self):
+		self.cache.clear()
+
+	def get_stats(self):
+		return self.cache.get_stats()
 
 
 class cachedmethod(object):
-	"""Same as cachedfunction, but works also for methods. Results are saved per instance"""
-	def __init__(self, func):
-		self.cache = {}
+	"""Same as cachedfunction, but works also for methods. Results are saved per instance.
+	The instances are only referenced weakly, their results are dropped together with them.
+	Accessing the method on the class allows to clear the caches of all instances."""
+	def __init__(self, func, maxsize=None, timeout=None):
 		self.func = func
+		self.name = '%s.%s' % (func.__module__, func.__name__)
+		self.maxsize = maxsize
+		self.timeout = timeout
+		self.caches = weakref.WeakKeyDictionary() # instance: _Cache
+		functools.update_wrapper(self, func)
+		_caches.add(self)
 
 	def __get__(self, instance, cls=None):
+		if instance is None:
+			return self
+		return _BoundCachedMethod(self, instance)
+
+	def _get_cache(self, instance):
+		try:
+			return self.caches[instance]
+		except KeyError:
+			cache = self.caches[instance] = _Cache(self.maxsize, self.timeout)
+			return cache
+
+	def cache_clear(self):
+		"""Drops the cached values of all instances"""
+		for cache in self.caches.values():
+			cache.clear()
+
+	def get_stats(self):
+		stats = [ cache.get_stats() for cache in self.caches.values() ]
+		return CacheStats(sum(s.hits for s in stats), sum(s.misses for s in stats),
+		                  sum(s.size for s in stats), self.maxsize)
+
+
+class _BoundCachedMethod(object):
+	"""What a cachedmethod returns when accessed on an instance."""
+	__slots__ = ('method', 'instance')
+
+	def __init__(self, method, instance):
+		self.method = method
 		self.instance = instance
-		return self
 
 	def __call__(self, *args, **kwargs):
-		# dicts are not hashable, convert kwargs to a tuple
-		kwargs_tuple = tuple(sorted(kwargs.items()))
+		method = self.method
+		return method._get_cache(self.instance).lookup(method.func, _make_key(args, kwargs),
+		                                               (self.instance, ) + args, kwargs)
 
-		instance = self.instance
+	def invalidate(self, *args, **kwargs):
+		"""Drops the value cached for these arguments"""
+		self.method._get_cache(self.instance).invalidate(_make_key(args, kwargs))
 
-		try:
-			return self.cache[(instance, args, kwargs_tuple)]
-		except KeyError:
-			self.cache[(instance, args, kwargs_tuple)] = value = self.func(instance, *args, **kwargs)
-			return value
-		except TypeError:
-			assert False, "Supplied invalid argument to cache decorator"
+	def cache_clear(self):
+		self.method._get_cache(self.instance).clear()
+
+	def get_stats(self):
+		return self.method._get_cache(self.instance).get_stats()
+
+
+def lru_cachedfunction(maxsize):
+	"""
+	Same as cachedfunction, but only keeps the maxsize most recently used values
+	@param maxsize: maximum number of cached values
+	"""
+	return functools.partial( cachedfunction, maxsize=maxsize )
 
+def lru_cachedmethod(maxsize):
+	"""
+	Same as cachedmethod, but only keeps the maxsize most recently used values per instance
+	@param maxsize: maximum number of cached values
+	"""
+	return functools.partial( cachedmethod, maxsize=maxsize )
 
 def temporary_cachedmethod(timeout):
 	"""
 	Same as cachedproperty, but cached values only remain valid for a certain duration
 	@param timeout: number of seconds to cache the value for
 	"""
-	class _temporary_cachedmethod(cachedmethod):
-		def __init__(self, func, timeout):
-			super(_temporary_cachedmethod, self).__init__(func)
-			self.timeout = timeout
-			self.cache_dates = {}
-
-		def __call__(self, *args, **kwargs):
-			key = self.instance, args, tuple(sorted(kwargs.items()))
-
-			# check for expiration
-			if key in self.cache_dates:
-				if self.cache_dates[key] + self.timeout < time.time():
-					# expired
-					del self.cache[key]
-					del self.cache_dates[key]
-					return self(*args, **kwargs)
-			else:
-				self.cache_dates[key] = time.time() # new entry
-
-			return super(_temporary_cachedmethod, self).__call__(*args, **kwargs)
-
-	return functools.partial( _temporary_cachedmethod, timeout=timeout )
+	return functools.partial( cachedmethod, timeout=timeout )
 
 
 
@@ -26,36 +26,76 @@ from collections import defaultdict, deque
 from horizons.util.savegameupgrader import SavegameUpgrader
 from horizons.util.python import decorators
 from horizons.util import DbReader
+from horizons.util.loadphases import LoadPhases
 
 class SavegameAccessor(DbReader):
 	"""
 	SavegameAccessor is the class used for loading saved games.
 
-	Frequent select queries are preloaded for faster access.
+	Frequent select queries are preloaded for faster access. Each preloaded table is only read
+	when it is first used, e.g. a map preview never reads the building tables.
 	"""
 
-	def __init__(self, dbfile):
+	# attribute: method that loads it, see __getattr__
+	_lazy_tables = {
+		'_building': '_load_building',
+		'_settlement': '_load_settlement',
+		'_concrete_object': '_load_concrete_object',
+		'_productions_by_worldid': '_load_production',
+		'_production_lines_by_owner': '_load_production',
+		'_productions_by_id_and_owner': '_load_production',
+		'_production_state_history': '_load_production_state_history',
+		'_storage': '_load_storage',
+		'_wildanimal': '_load_wildanimal',
+		'_unit': '_load_unit',
+		'_building_collector': '_load_building_collector',
+		'_building_collector_job_history': '_load_building_collector_job_history',
+		'_production_line': '_load_production_line',
+		'_unit_path': '_load_unit_path',
+		'_storage_global_limit': '_load_storage_global_limit',
+		'_health': '_load_health',
+	}
+
+	def __init__(self, dbfile, release_rows=False):
+		"""
+		@param release_rows: whether rows that belong to exactly one object are dropped as soon
+		                     as they have been read, so they don't stay in memory next to the
+		                     loaded objects. Only use this when loading a game.
+		"""
 		self.upgrader = SavegameUpgrader(dbfile)
-		dbfile = self.upgrader.get_path()
-		super(SavegameAccessor, self).__init__(dbfile=dbfile)
-		self._load_building()
-		self._load_settlement()
-		self._load_concrete_object()
-		self._load_production()
-		self._load_storage()
-		self._load_wildanimal()
-		self._load_unit()
-		self._load_building_collector()
-		self._load_production_line()
-		self._load_unit_path()
-		self._load_storage_global_limit()
-		self._load_health()
+		if self.upgrader.needs_upgrade():
+			# upgrade a copy in memory instead of writing a temporary file
+			super(SavegameAccessor, self).__init__(dbfile=':memory:')
+			self.upgrader.upgrade_into(self)
+		else:
+			super(SavegameAccessor, self).__init__(dbfile=dbfile)
+		self._release_rows = release_rows
 		self._hash = None
 
 	def close(self):
 		super(SavegameAccessor, self).close()
 		self.upgrader.close()
 
+	def __getattr__(self, name):
+		"""Loads the preloaded tables on first access.
+		While a game is loaded, every table is recorded as LoadPhases phase with its time,
+		number of entries and memory."""
+		loader = self._lazy_tables.get(name)
+		if loader is None:
+			raise AttributeError(name)
+		with LoadPhases.phase(loader):
+			getattr(self, loader)()
+			table = self.__dict__[name]
+			LoadPhases.count('entries', len(table))
+		return table
+
+	def _get_row(self, table, key):
+		"""Returns table[key], which is removed from the table in release_rows mode."""
+		row = table[key]
+		if self._release_rows:
+			del table[key]
+		return row
+
 
 	def _load_building(self):
 		self._building = {}
@@ -90,7 +130,7 @@ class SavegameAccessor(DbReader):
 			self._concrete_object[int(row[0])] = int(row[1]), row[2]
 
 	def get_concrete_object_data(self, worldid):
-		return self._concrete_object[int(worldid)]
+		return self._get_row(self._concrete_object, int(worldid))
 
 
 	def _load_production(self):
@@ -114,8 +154,7 @@ class SavegameAccessor(DbReader):
 			else:
 				self._production_lines_by_owner[owner].append(line)
 
-			self._production_lines_by_owner[owner].append
-
+	def _load_production_state_history(self):
 		self._production_state_history = defaultdict(lambda: deque())
 		for object_id, production_id, tick, state in self("SELECT object_id, production, tick, state FROM production_state_history ORDER BY object_id, production, tick"):
 			self._production_state_history[int(object_id), int(production_id)].append((tick, state))
@@ -133,7 +172,7 @@ class SavegameAccessor(DbReader):
 		return self._production_lines_by_owner.get(owner, [])
 
 	def get_production_state_history(self, worldid, prod_id):
-		return self._production_state_history[int(worldid), int(prod_id)]
+		return self._get_row(self._production_state_history, (int(worldid), int(prod_id)))
 
 
 	def _load_storage(self):
@@ -158,7 +197,7 @@ class SavegameAccessor(DbReader):
 
 	def get_wildanimal_row(self, worldid):
 		"""Returns (health, can_reproduce)"""
-		return self._wildanimal[int(worldid)]
+		return self._get_row(self._wildanimal, int(worldid))
 
 
 	def _load_unit(self):
@@ -175,6 +214,7 @@ class SavegameAccessor(DbReader):
 		for row in self("SELECT rowid, home_building, creation_tick FROM building_collector"):
 			self._building_collector[int(row[0])] = (int(row[1]) if row[1] is not None else None, row[2])
 
+	def _load_building_collector_job_history(self):
 		self._building_collector_job_history = defaultdict(lambda: deque())
 		for collector_id, tick, utilisation in self("SELECT collector, tick, utilisation FROM building_collector_job_history ORDER BY collector, tick"):
 			self._building_collector_job_history[int(collector_id)].append((tick, utilisation))
@@ -185,7 +225,7 @@ class SavegameAccessor(DbReader):
 		return None if worldid not in self._building_collector else self._building_collector[worldid]
 
 	def get_building_collector_job_history(self, worldid):
-		return self._building_collector_job_history[int(worldid)]
+		return self._get_row(self._building_collector_job_history, int(worldid))
 
 
 	def _load_production_line(self):
@@ -210,7 +250,9 @@ class SavegameAccessor(DbReader):
 
 	def get_unit_path(self, worldid):
 		worldid = int(worldid)
-		return self._unit_path[worldid] if worldid in self._unit_path else None
+		if worldid not in self._unit_path:
+			return None
+		return self._get_row(self._unit_path, worldid)
 
 
 	def _load_storage_global_limit(self):
@@ -219,14 +261,14 @@ class SavegameAccessor(DbReader):
 			self._storage_global_limit[(int(row[0]))] = int(row[1])
 
 	def get_storage_global_limit(self, worldid):
-		return self._storage_global_limit[int(worldid)]
+		return self._get_row(self._storage_global_limit, int(worldid))
 
 
 	def _load_health(self):
 		self._health = dict( self("SELECT owner_id, health FROM unit_health") )
 
 	def get_health(self, owner):
-		return self._health[owner]
+		return self._get_row(self._health, owner)
 
 	# Random savegamefile related utility that i didn't know where to put
 
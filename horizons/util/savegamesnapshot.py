@@ -0,0 +1,125 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import os
+import threading
+import traceback
+
+from collections import OrderedDict
+
+from horizons.util.dbreader import DbReader
+from horizons.util.uhdbaccessor import read_savegame_template
+
+class SavegameSnapshot(object):
+	"""Records the sql commands of a save run instead of executing them.
+
+	The saving code only writes to the savegame, so the state of a session can be captured
+	quickly as a list of commands with plain values. The snapshot doesn't reference any
+	game objects, therefore it can be written to disk later and independently of the session,
+	e.g. by a SavegameWriter in a separate thread while the game continues.
+
+	Use it in place of a DbReader for the save methods.
+	"""
+
+	def __init__(self):
+		self.commands = [] # (command, list of args), in order of execution
+		self._buffered_rows = OrderedDict() # command: [args], see add_row
+
+	def __call__(self, command, *args):
+		"""Records a sql command, see DbReader.__call__"""
+		assert not command.endswith(";")
+		assert not command.startswith("SELECT"), "Can't read from a savegame that is being captured"
+		self.execute_many(command, [args])
+		return []
+
+	def execute_many(self, command, parameters):
+		"""Records a sql command for each sequence in parameters, see DbReader.execute_many"""
+		if self._buffered_rows:
+			self.flush_rows()
+		if not self.commands or self.commands[-1][0] != command:
+			self.commands.append( (command, []) )
+		self.commands[-1][1].extend( tuple(args) for args in parameters )
+
+	def add_row(self, command, *args):
+		"""Buffers a row, see DbReader.add_row"""
+		rows = self._buffered_rows.get(command)
+		if rows is None:
+			assert not command.endswith(";")
+			rows = self._buffered_rows[command] = []
+		rows.append(args)
+
+	def flush_rows(self):
+		"""Records the rows buffered by add_row, see DbReader.flush_rows"""
+		buffered_rows, self._buffered_rows = self._buffered_rows, OrderedDict()
+		for command, rows in buffered_rows.iteritems():
+			self.execute_many(command, rows)
+
+	def write(self, filename):
+		"""Writes the snapshot as new savegame.
+		The data is written to a temporary file first, which is renamed to filename when it is
+		complete. Therefore filename is never a partly written savegame.
+		Exceptions are propagated, the temporary file is removed in this case.
+		@param filename: absolute path of the savegame"""
+		tmp_filename = filename + '.part'
+		if os.path.exists(tmp_filename):
+			os.unlink(tmp_filename)
+		self.flush_rows()
+		db = DbReader(tmp_filename)
+		try:
+			read_savegame_template(db)
+			db("BEGIN")
+			for command, rows in self.commands:
+				db.execute_many(command, rows)
+			db("COMMIT")
+			db.close()
+		except:
+			db.close()
+			os.unlink(tmp_filename)
+			raise
+
+		try:
+			os.rename(tmp_filename, filename)
+		except OSError:
+			# windows doesn't allow renaming to an existing file
+			if not os.path.exists(filename):
+				raise
+			os.unlink(filename)
+			os.rename(tmp_filename, filename)
+
+
+class SavegameWriter(threading.Thread):
+	"""Writes a SavegameSnapshot to a file in a separate thread.
+	After the thread has finished, exception is None on success, else the exception that
+	happened and error is its formatted traceback."""
+
+	def __init__(self, snapshot, filename):
+		super(SavegameWriter, self).__init__(name="SavegameWriter")
+		self.snapshot = snapshot
+		self.filename = filename
+		self.exception = None
+		self.error = None
+
+	def run(self):
+		try:
+			self.snapshot.write(self.filename)
+		except Exception as e:
+			self.exception = e
+			self.error = traceback.format_exc()
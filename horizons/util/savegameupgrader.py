@@ -24,6 +24,8 @@ import os.path
 import json
 import shutil
 import tempfile
+import time
+import logging
 
 from horizons.util.python import decorators
 from horizons.constants import VERSION
@@ -32,11 +34,18 @@ from horizons.util import DbReader
 class SavegameUpgrader(object):
 	"""The class that prepares saved games to be loaded by the current version."""
 
+	log = logging.getLogger("util.savegameupgrader")
+
+	# the revisions that have an _upgrade_to_revNN method
+	upgrade_revisions = range(49, 62)
+
 	def __init__(self, path):
 		super(SavegameUpgrader, self).__init__()
 		self.original_path = path
 		self.using_temp = False
 		self.final_path = None
+		self.upgrade_timings = [] # (revision, seconds) of the last upgrade
+		self._revision = None
 
 	def _upgrade_to_rev49(self, db):
 		db("CREATE TABLE \"resource_overview_bar\" (object INTEGER NOT NULL, position INTEGER NOT NULL, resource INTEGER NOT NULL)")
@@ -130,28 +139,51 @@ class SavegameUpgrader(object):
 		changes = (33, 42, 923331670), (9, 18, 1335785398), (42, 57, 227255506), (20, 8, 21429697), (20, 1, 1953634498), (20, 4, 70113509), (20, 47, 1236502256), (20, 52, 2078307024), (20, 23, 2092896117), (20, 0, 208610842), (20, 28, 2053891886), (20, 2, 1265004933), (20, 51, 1253640427), (20, 3, 1849560830), (20, 7, 1654557398), (60, 0, 532714998), (19, 22, 2092896117), (63, 2, 2097838825), (63, 0, 87034972), (63, 1, 570450416), (63, 3, 359183511), (8, 2, 256812226), (26, 34, 1842760585), (49, 1, 1953634498), (46, 0, 344746552), (28, 36, 1510556113), (45, 56464472, 1907712664), (35, 45, 854772720), (55, 0, 1971678669), (40, 57, 227255506), (54, 0, 1971678669), (29, 37, 1698523401), (11, 11, 923331670), (18, 5, 1654557398), (5, 13, 1056282634)
 
 		for obj_type, old_prod_line, new_prod_line in changes:
-			for (obj, ) in db("SELECT rowid FROM building WHERE type = ?", obj_type):
-				db("UPDATE production SET prod_line_id = ? WHERE owner = ? and prod_line_id = ?", new_prod_line, obj, old_prod_line)
+			db("UPDATE production SET prod_line_id = ? WHERE prod_line_id = ? AND owner IN (SELECT rowid FROM building WHERE type = ?)",
+			   new_prod_line, old_prod_line, obj_type)
 
 	def _upgrade_to_rev61(self, db):
 		from horizons.world.building.settler import SettlerUpgradeData
 
 		# settler upgrade lines used to be the same for several levels
-		for (settler, level) in db("SELECT rowid, level FROM building WHERE type = 3"):
-			#if settler == 100268:import pdb ; pdb.set_trace()
+		for (level, ) in db("SELECT DISTINCT level FROM building WHERE type = 3"):
 			# the id used to always be 35
-			db("UPDATE production SET prod_line_id = ? WHERE owner = ? and prod_line_id = 35", SettlerUpgradeData.get_production_line_id( level + 1 ), settler)
-
-
+			db("UPDATE production SET prod_line_id = ? WHERE prod_line_id = 35 AND owner IN (SELECT rowid FROM building WHERE type = 3 AND level = ?)",
+			   SettlerUpgradeData.get_production_line_id( level + 1 ), level)
+
+
+
+	def _get_revision(self):
+		if self._revision is None:
+			# fix import loop
+			from horizons.savegamemanager import SavegameManager
+			self._revision = SavegameManager.get_metadata(self.original_path)['savegamerev']
+		return self._revision
+
+	def needs_upgrade(self):
+		"""Returns whether the savegame has to be upgraded before it can be loaded."""
+		rev = self._get_revision()
+		# rev 0 is not a regular savegame, usually a map
+		return rev != 0 and rev != VERSION.SAVEGAMEREVISION
+
+	def _apply_upgrades(self, db, rev):
+		"""Upgrades db from revision rev to the current one in one transaction."""
+		self.upgrade_timings = []
+		text_factory = db.connection.text_factory
+		db('BEGIN TRANSACTION')
+		for upgrade_rev in self.upgrade_revisions:
+			if rev < upgrade_rev:
+				start = time.time()
+				getattr(self, '_upgrade_to_rev%d' % upgrade_rev)(db)
+				self.upgrade_timings.append( (upgrade_rev, time.time() - start) )
+		db('COMMIT')
+		db.connection.text_factory = text_factory # some upgrades change it
+		for upgrade_rev, seconds in self.upgrade_timings:
+			self.log.debug("Upgrade to revision %s of %s: %.4f s", upgrade_rev, self.original_path, seconds)
 
 	def _upgrade(self):
-		# fix import loop
-		from horizons.savegamemanager import SavegameManager
-		metadata = SavegameManager.get_metadata(self.original_path)
-		rev = metadata['savegamerev']
-		if rev == 0: # not a regular savegame, usually a map
-			self.final_path = self.original_path
-		elif rev == VERSION.SAVEGAMEREVISION: # the current version
+		rev = self._get_revision()
+		if not self.needs_upgrade():
 			self.final_path = self.original_path
 		else: # upgrade
 			self.using_temp = True
@@ -159,39 +191,31 @@ class SavegameUpgrader(object):
 			os.close(handle)
 			shutil.copyfile(self.original_path, self.final_path)
 			db = DbReader(self.final_path)
-			db('BEGIN TRANSACTION')
-
-			if rev < 49:
-				self._upgrade_to_rev49(db)
-			if rev < 50:
-				self._upgrade_to_rev50(db)
-			if rev < 51:
-				self._upgrade_to_rev51(db)
-			if rev < 52:
-				self._upgrade_to_rev52(db)
-			if rev < 53:
-				self._upgrade_to_rev53(db)
-			if rev < 54:
-				self._upgrade_to_rev54(db)
-			if rev < 55:
-				self._upgrade_to_rev55(db)
-			if rev < 56:
-				self._upgrade_to_rev56(db)
-			if rev < 57:
-				self._upgrade_to_rev57(db)
-			if rev < 58:
-				self._upgrade_to_rev58(db)
-			if rev < 59:
-				self._upgrade_to_rev59(db)
-			if rev < 60:
-				self._upgrade_to_rev60(db)
-			if rev < 61:
-				self._upgrade_to_rev61(db)
-
-
-			db('COMMIT')
+			self._apply_upgrades(db, rev)
 			db.close()
 
+	def upgrade_into(self, db):
+		"""Copies the savegame into db and upgrades it there.
+		This doesn't write any file, the original savegame isn't modified.
+		@param db: DbReader of an empty database, usually an in-memory one"""
+		rev = self._get_revision()
+		# python 2's sqlite3 module doesn't expose the backup api, so the tables are copied
+		# from the attached savegame. The rowids are copied too, the loading code uses them.
+		db("ATTACH DATABASE ? AS source", self.original_path)
+		db("BEGIN TRANSACTION")
+		for (name, sql) in db("SELECT name, sql FROM source.sqlite_master WHERE type = 'table'"):
+			if name.startswith('sqlite_'):
+				continue # internal tables are created by sqlite
+			db(sql)
+			columns = ', '.join('"%s"' % column[1] for column in
+			                    db.connection.execute('PRAGMA source.table_info("%s")' % name))
+			db('INSERT INTO main."%s" (rowid, %s) SELECT rowid, %s FROM source."%s"' % (name, columns, columns, name))
+		for (sql, ) in db("SELECT sql FROM source.sqlite_master WHERE type != 'table' AND sql IS NOT NULL"):
+			db(sql)
+		db("COMMIT")
+		db("DETACH DATABASE source")
+		self._apply_upgrades(db, rev)
+
 	def get_path(self):
 		"""Return the path to the up-to-date version of the saved game."""
 		if self.final_path is None:
@@ -0,0 +1,126 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+from collections import deque, defaultdict
+
+class StateHistory(object):
+	"""History of a value that changes at certain ticks and stays constant in between,
+	such as the state of a production.
+
+	The entries are (tick, value) tuples ordered by tick. Additionally, each entry knows how
+	many ticks the history has spent in every value before it, so the time spent in each
+	value during a window can be computed from the two entries at the window borders.
+	Old entries are removed from the front by discard_before(), new ones added at the end.
+	"""
+
+	def __init__(self, entries=()):
+		"""
+		@param entries: iterable of (tick, value) tuples, e.g. as loaded from a savegame
+		"""
+		# (tick, value, integrals) where integrals is a dict {value: ticks spent in value
+		# from the first entry ever added until tick}
+		self._entries = deque()
+		# value: number of entries with this value
+		self._value_counts = defaultdict(int)
+		for tick, value in entries:
+			self.append(tick, value)
+
+	def append(self, tick, value):
+		if self._entries:
+			last_tick, last_value, integrals = self._entries[-1]
+			integrals = integrals.copy()
+			integrals[last_value] = integrals.get(last_value, 0) + tick - last_tick
+		else:
+			integrals = {}
+		self._entries.append((tick, value, integrals))
+		self._value_counts[value] += 1
+
+	def pop(self):
+		"""Removes the last entry"""
+		tick, value, integrals = self._entries.pop()
+		self._value_counts[value] -= 1
+		return (tick, value)
+
+	def discard_before(self, tick):
+		"""Removes the entries that are only relevant before tick.
+		The entry that is active at tick is kept."""
+		while len(self._entries) > 1 and self._entries[1][0] < tick:
+			value = self._entries.popleft()[1]
+			self._value_counts[value] -= 1
+
+	def has_value(self, value):
+		"""Returns whether any entry has value"""
+		return self._value_counts[value] > 0
+
+	def get_durations(self, start, end):
+		"""Returns the number of ticks spent in each value during [start, end).
+		Time before the first entry doesn't count.
+		@return: dict {value: ticks}, only containing values with ticks > 0"""
+		if not self._entries:
+			return {}
+		start = max(start, self._entries[0][0])
+		if start >= end:
+			return {}
+		result = self._get_integrals_at(end)
+		for value, ticks in self._get_integrals_at(start).iteritems():
+			result[value] -= ticks
+		return dict( (value, ticks) for value, ticks in result.iteritems() if ticks > 0 )
+
+	def _get_integrals_at(self, tick):
+		"""Returns the ticks spent in each value from the first entry ever until tick.
+		Near the ends of the history, this only has to look at a few entries."""
+		entries = self._entries
+		if tick - entries[0][0] <= entries[-1][0] - tick:
+			# the entry active at tick is near the front
+			i = 0
+			while i + 1 < len(entries) and entries[i + 1][0] <= tick:
+				i += 1
+		else:
+			i = len(entries) - 1
+			while i > 0 and entries[i][0] > tick:
+				i -= 1
+		entry_tick, value, integrals = entries[i]
+		integrals = integrals.copy()
+		if tick > entry_tick:
+			integrals[value] = integrals.get(value, 0) + tick - entry_tick
+		return integrals
+
+	def __len__(self):
+		return len(self._entries)
+
+	def __nonzero__(self):
+		return bool(self._entries)
+
+	def __getitem__(self, i):
+		entry = self._entries[i]
+		return (entry[0], entry[1])
+
+	def __iter__(self):
+		for tick, value, integrals in self._entries:
+			yield (tick, value)
+
+	def __reversed__(self):
+		for tick, value, integrals in reversed(self._entries):
+			yield (tick, value)
+
+	def __str__(self):
+		return "StateHistory(%s)" % list(self)
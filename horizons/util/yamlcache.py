@@ -20,7 +20,10 @@
 # ###################################################
 
 import os
+import glob
 import shelve
+import marshal
+import multiprocessing
 import yaml
 import threading
 import traceback
@@ -75,6 +78,25 @@ def convert_game_data(data):
 		return data
 
 
+def parse_yaml(contents, filename, game_data=False):
+	"""Parses the yaml string contents of filename"""
+	data = yaml.load( contents, Loader = SafeLoader )
+	if game_data: # need to convert some values
+		try:
+			data = convert_game_data(data)
+		except Exception as e:
+			# add info about file
+			to_add = "\nThis error happened in %s ." % filename
+			e.args = ( e.args[0] + to_add, ) + e.args[1:]
+			e.message = ( e.message + to_add )
+			raise
+	return data
+
+def _parse_yaml_job(job):
+	"""Entry point for parsing in a worker process, see YamlCache.load_files"""
+	return parse_yaml(*job)
+
+
 class DummyShelve(dict):
 	"""Implements the methods we use on a shelve but is really just a dict for
 	when we are unable to open a shelve.
@@ -84,78 +106,178 @@ class DummyShelve(dict):
 		pass
 
 
+class _CacheError(Exception):
+	"""The shelve failed and has been reset."""
+	pass
+
+
 class YamlCache(object):
 	"""Loads and caches YAML files in a shelve.
+	Cached data is considered valid as long as mtime and size of the file didn't change.
+	Otherwise, the content hash decides whether the file needs to be parsed again.
 	Threadsafe.
 	"""
 	cache = None
 	cache_filename = os.path.join(PATHS.USER_DIR, 'yamldata.cache')
 
 	sync_scheduled = False
+	sync_pending = False # changes have been stored, but there was no ExtScheduler to schedule syncing
 
 	lock = threading.Lock()
 
+	# filename: marshalled game data, taken from a valid GameDataSnapshot
+	snapshot_files = {}
+
+	# load_files only starts worker processes if at least that many files need to be parsed
+	POOL_MIN_FILES = 16
+	POOL_MAX_PROCESSES = 4
+
 	log = logging.getLogger("yamlcache")
 
+	@classmethod
+	def use_snapshot(cls, snapshot):
+		"""Serve the game data files from snapshot instead of parsing them."""
+		cls.snapshot_files = snapshot.yaml_files
+
 	@classmethod
 	def get_file(cls, filename, game_data=False):
-		# calc the hash
-		f = open(filename, 'r')
-		h = hash(f.read())
-		f.seek(0)
-		# check for updates or new files
+		if game_data and cls.snapshot_files:
+			data = cls.snapshot_files.get(os.path.normpath(filename))
+			if data is not None:
+				return marshal.loads(data) # every caller gets its own copy, like from the shelve
+
+		try:
+			data, outdated = cls._lookup(filename)
+			if outdated is not None:
+				stats, h, contents = outdated
+				data = parse_yaml(contents, filename, game_data)
+				cls._store(filename, stats + (h, data))
+		except _CacheError:
+			return cls.get_file(filename, game_data=game_data)
+		finally:
+			cls._sync_if_pending()
+		return data
+
+	@classmethod
+	def load_files(cls, filenames, game_data=False):
+		"""Makes sure that the cached data of all filenames is up to date.
+		If many files changed (e.g. after an update), they are parsed by a pool of processes.
+		This may be called before the ExtScheduler exists, the cache is then synced right away."""
+		try:
+			cls._load_files(filenames, game_data)
+		finally:
+			cls._sync_if_pending()
+
+	@classmethod
+	def _load_files(cls, filenames, game_data):
+		try:
+			outdated = cls._get_outdated(filenames)
+		except _CacheError:
+			outdated = cls._get_outdated(filenames)
+
+		try:
+			processes = min(multiprocessing.cpu_count(), cls.POOL_MAX_PROCESSES)
+		except NotImplementedError:
+			processes = 1
+		if len(outdated) < cls.POOL_MIN_FILES or processes < 2:
+			return # get_file will parse them one by one when they are needed
+
+		jobs = [ (contents, filename, game_data) for filename, (stats, h, contents) in outdated ]
+		try:
+			pool = multiprocessing.Pool(processes)
+			try:
+				results = pool.map(_parse_yaml_job, jobs)
+			finally:
+				pool.close()
+				pool.join()
+		except Exception:
+			# not fatal, the files are then parsed in this process on access
+			cls.log.exception("Warning: Failed to parse yaml files in worker processes")
+			return
+
+		for (filename, (stats, h, contents)), data in zip(outdated, results):
+			try:
+				cls._store(filename, stats + (h, data))
+			except _CacheError:
+				return
+
+	@classmethod
+	def _get_outdated(cls, filenames):
+		"""Returns [ (filename, (stats, hash, contents)) ] for all files that need to be parsed"""
+		outdated = []
+		for filename in filenames:
+			data, state = cls._lookup(filename)
+			if state is not None:
+				outdated.append( (filename, state) )
+		return outdated
+
+	@classmethod
+	def _lookup(cls, filename):
+		"""Returns (data, None) if filename is cached, otherwise
+		(None, (stats, hash, contents)) with what is needed to cache the file."""
 		if cls.cache is None:
 			cls._open_cache()
 
-		if isinstance(filename, unicode):
-			filename = filename.encode('utf8') # shelve needs str keys
+		stat = os.stat(filename)
+		stats = (stat.st_mtime, stat.st_size)
+		try:
+			# entries are (mtime, size, hash, data)
+			entry = cls.cache.get(cls._get_key(filename))
+		except Exception as e:
+			cls._handle_cache_error(e)
 
-		def handle_get_file_error(e, release):
-			# when something unexpected happens, shelve does not guarantee anything.
-			# since crashing on any access is part of the specified behaviour, we need to handle it.
-			# cf. http://bugs.python.org/issue14041
+		if entry is not None and entry[:-2] == stats:
+			return entry[-1], None
 
-			# this weird str-unicode casting is necessary for UnpicklingErrors that some shelve implementation can throw
-			cls.log.exception('Warning: Can\'t write to shelve: '+unicode(str(e), errors='ignore'))
-			# delete cache and try again
-			if os.path.exists(cls.cache_filename):
-				os.remove(cls.cache_filename)
-			cls.cache = None
-			if release:
-				cls.lock.release()
-			return cls.get_file(filename, game_data=game_data)
+		with open(filename, 'r') as f:
+			contents = f.read()
+		h = hash(contents)
+		if entry is not None and entry[-2] == h:
+			# only touched, remember the new stats
+			cls._store(filename, stats + entry[-2:])
+			return entry[-1], None
+		return None, (stats, h, contents)
 
+	@classmethod
+	def _store(cls, filename, entry):
+		cls.lock.acquire()
 		try:
-			yaml_file_in_cache = (filename in cls.cache and cls.cache[filename][0] == h)
-		except Exception as e:
-			return handle_get_file_error(e, release=False)
-
-		if not yaml_file_in_cache:
-			data = yaml.load( f, Loader = SafeLoader )
-			if game_data: # need to convert some values
-				try:
-					data = convert_game_data(data)
-				except Exception as e:
-					# add info about file
-					to_add = "\nThis error happened in %s ." % filename
-					e.args = ( e.args[0] + to_add, ) + e.args[1:]
-					e.message = ( e.message + to_add )
-					raise
-
-			cls.lock.acquire()
 			try:
-				cls.cache[filename] = (h, data)
+				cls.cache[cls._get_key(filename)] = entry
 			except Exception as e:
-				return handle_get_file_error(e, release=True)
+				cls._handle_cache_error(e)
 
 			if not cls.sync_scheduled:
-				cls.sync_scheduled = True
 				from horizons.extscheduler import ExtScheduler
-				ExtScheduler().add_new_object(cls._do_sync, cls, run_in=1)
-
+				if ExtScheduler() is None:
+					# too early in the startup, get_file and load_files sync when they are done
+					cls.sync_pending = True
+				else:
+					cls.sync_scheduled = True
+					ExtScheduler().add_new_object(cls._do_sync, cls, run_in=1)
+		finally:
 			cls.lock.release()
 
-		return cls.cache[filename][1]
+	@classmethod
+	def _get_key(cls, filename):
+		if isinstance(filename, unicode):
+			return filename.encode('utf8') # shelve needs str keys
+		return filename
+
+	@classmethod
+	def _handle_cache_error(cls, e):
+		# when something unexpected happens, shelve does not guarantee anything.
+		# since crashing on any access is part of the specified behaviour, we need to handle it.
+		# cf. http://bugs.python.org/issue14041
+
+		# this weird str-unicode casting is necessary for UnpicklingErrors that some shelve implementation can throw
+		cls.log.exception('Warning: Can\'t write to shelve: '+unicode(str(e), errors='ignore'))
+		# delete cache and try again. Depending on the dbm module, the shelve consists of
+		# several files, e.g. a dumbdbm whose index wasn't synced fails like this.
+		for filename in glob.glob(cls.cache_filename + '*'):
+			os.remove(filename)
+		cls.cache = None
+		raise _CacheError()
 
 	@classmethod
 	def _open_cache(cls):
@@ -195,10 +317,20 @@ class YamlCache(object):
 		cls.lock.release()
 
 
+	@classmethod
+	def _sync_if_pending(cls):
+		"""Syncs changes that have been stored while no sync could be scheduled"""
+		if cls.sync_pending:
+			cls._do_sync()
+
 	@classmethod
 	def _do_sync(cls):
 		"""Only write to disc once in a while, it's too slow when done every time"""
 		cls.lock.acquire()
-		cls.sync_scheduled = False
-		cls.cache.sync()
-		cls.lock.release()
\ No newline at end of file
+		try:
+			cls.sync_scheduled = False
+			cls.sync_pending = False
+			if cls.cache is not None: # None if it has been deleted after an error
+				cls.cache.sync()
+		finally:
+			cls.lock.release()
\ No newline at end of file
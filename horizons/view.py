@@ -21,6 +21,7 @@
 
 import math
 import time
+import weakref
 from fife import fife
 
 import horizons.main
@@ -81,6 +82,12 @@ class View(ChangeListener):
 		self._autoscroll = [0, 0]
 		self._autoscroll_keys = [0, 0]
 
+		# objects outside of the visible area don't update their fife instances (see is_visible)
+		self._visible_area = None
+		self._culled_objects = weakref.WeakValueDictionary() # worldid: ConcreteObject
+		self.add_change_listener(self._update_visible_area)
+		self.deferred_actions = 0 # number of ConcreteObject.act() calls deferred since the object wasn't visible
+
 	def end(self):
 		horizons.main.fife.pump.remove(self.do_autoscroll)
 		self.model.deleteMaps()
@@ -228,6 +235,41 @@ class View(ChangeListener):
 		                                       coords.y - (screen_width_as_coords[1]/2),
 		                                       *screen_width_as_coords)
 
+	def is_visible(self, point):
+		"""Returns whether point might be on the screen, including a margin of VIEW.CULLING_MARGIN.
+		Objects at other places don't need to update their fife instances."""
+		if self._visible_area is None:
+			self._visible_area = self._get_visible_area()
+		return self._visible_area.contains(point)
+
+	def add_culled_object(self, obj):
+		"""Registers a ConcreteObject that doesn't update its fife instance because it isn't visible.
+		Its sync_instance() is called as soon as the camera moves to the object."""
+		self._culled_objects[obj.worldid] = obj
+
+	def remove_culled_object(self, obj):
+		"""Called when a unit that has been culled becomes visible by moving."""
+		self._culled_objects.pop(obj.worldid, None)
+
+	def _get_visible_area(self):
+		displayed_area = self.get_displayed_area()
+		# the screen shows a rhombus of the map, whose diagonals are the width and height
+		# of the displayed area. This square contains it in every rotation.
+		center = displayed_area.center()
+		radius = (displayed_area.width + displayed_area.height) // 2 + VIEW.CULLING_MARGIN
+		return Rect.init_from_borders(center.x - radius, center.y - radius,
+		                              center.x + radius, center.y + radius)
+
+	def _update_visible_area(self):
+		visible_area = self._get_visible_area()
+		if visible_area == self._visible_area:
+			return
+		self._visible_area = visible_area
+		for worldid, obj in self._culled_objects.items():
+			if visible_area.contains(obj.position.center()):
+				del self._culled_objects[worldid]
+				obj.sync_instance()
+
 	def save(self, db):
 		loc = self.cam.getLocation().getExactLayerCoordinates()
 		db("INSERT INTO view(zoom, rotation, location_x, location_y) VALUES(?, ?, ?, ?)",
@@ -33,6 +33,7 @@ from horizons.world.island import Island
 from horizons.world.player import HumanPlayer
 from horizons.util import Point, Rect, Circle, WorldObject
 from horizons.util.color import Color
+from horizons.util.loadphases import LoadPhases
 from horizons.constants import UNITS, BUILDINGS, RES, GROUND, GAME
 from horizons.ai.trader import Trader
 from horizons.ai.pirate import Pirate
@@ -134,20 +135,26 @@ class World(BuildingOwner, WorldObject):
 		self.trader = None
 		self.pirate = None
 
-		self._load_players(savegame_db, force_player_id)
+		with LoadPhases.phase('players'):
+			self._load_players(savegame_db, force_player_id)
+			LoadPhases.count('players', len(self.players))
 
 		# all static data
-		self.load_raw_map(savegame_db)
+		with LoadPhases.phase('map'):
+			self.load_raw_map(savegame_db)
 
 		# load world buildings (e.g. fish)
-		for (building_worldid, building_typeid) in \
-		    savegame_db("SELECT rowid, type FROM building WHERE location = ?", self.worldid):
-			load_building(self.session, savegame_db, building_typeid, building_worldid)
+		with LoadPhases.phase('world buildings'):
+			for (building_worldid, building_typeid) in \
+			    savegame_db("SELECT rowid, type FROM building WHERE location = ?", self.worldid):
+				load_building(self.session, savegame_db, building_typeid, building_worldid)
 
 		# use a dict because it's directly supported by the pathfinding algo
-		self.water = dict.fromkeys(list(self.ground_map), 1.0)
-		self._init_water_bodies()
-		self.sea_number = self.water_body[(self.min_x, self.min_y)]
+		with LoadPhases.phase('water bodies'):
+			self.water = dict.fromkeys(list(self.ground_map), 1.0)
+			self._init_water_bodies()
+			self.sea_number = self.water_body[(self.min_x, self.min_y)]
+			LoadPhases.count('water tiles', len(self.water))
 
 		# assemble list of water and coastline for ship, that can drive through shallow water
 		# NOTE: this is rather a temporary fix to make the fisher be able to move
@@ -182,8 +189,10 @@ class World(BuildingOwner, WorldObject):
 				self.pirate = Pirate.load(self.session, savegame_db, pirate_data[0][0])
 
 		# load all units (we do it here cause all buildings are loaded by now)
-		for (worldid, typeid) in savegame_db("SELECT rowid, type FROM unit ORDER BY rowid"):
-			Entities.units[typeid].load(self.session, savegame_db, worldid)
+		with LoadPhases.phase('units'):
+			for (worldid, typeid) in savegame_db("SELECT rowid, type FROM unit ORDER BY rowid"):
+				Entities.units[typeid].load(self.session, savegame_db, worldid)
+				LoadPhases.count('units')
 
 		if self.session.is_game_loaded():
 			# let trader and pirate command their ships. we have to do this here
@@ -200,13 +209,15 @@ class World(BuildingOwner, WorldObject):
 
 			# load the AI players
 			# this has to be done here because otherwise the ships and other objects won't exist
-			for player in self.players:
-				if not isinstance(player, HumanPlayer):
-					player.finish_loading(savegame_db)
+			with LoadPhases.phase('ai players'):
+				for player in self.players:
+					if not isinstance(player, HumanPlayer):
+						player.finish_loading(savegame_db)
 
-		self._load_combat(savegame_db)
-		self._load_diplomacy(savegame_db)
-		self._load_disasters(savegame_db)
+		with LoadPhases.phase('combat, diplomacy and disasters'):
+			self._load_combat(savegame_db)
+			self._load_diplomacy(savegame_db)
+			self._load_disasters(savegame_db)
 
 		self.inited = True
 		"""TUTORIAL:
@@ -253,9 +264,11 @@ class World(BuildingOwner, WorldObject):
 	def load_raw_map(self, savegame_db, preview=False):
 		# load islands
 		self.islands = []
-		for (islandid,) in savegame_db("SELECT rowid + 1000 FROM island"):
-			island = Island(savegame_db, islandid, self.session, preview=preview)
-			self.islands.append(island)
+		with LoadPhases.phase('islands'):
+			for (islandid,) in savegame_db("SELECT rowid + 1000 FROM island"):
+				island = Island(savegame_db, islandid, self.session, preview=preview)
+				self.islands.append(island)
+			LoadPhases.count('islands', len(self.islands))
 
 		#calculate map dimensions
 		self.min_x, self.min_y, self.max_x, self.max_y = 0, 0, 0, 0
@@ -631,7 +644,7 @@ class World(BuildingOwner, WorldObject):
 		@param db: DbReader object of the db the game is saved to."""
 		super(World, self).save(db)
 		for name, value in self.properties.iteritems():
-			db("INSERT INTO map_properties (name, value) VALUES (?, ?)", name, json.dumps(value))
+			db.add_row("INSERT INTO map_properties (name, value) VALUES (?, ?)", name, json.dumps(value))
 		for island in self.islands:
 			island.save(db)
 		for player in self.players:
@@ -711,6 +724,7 @@ class World(BuildingOwner, WorldObject):
 
 def load_building(session, db, typeid, worldid):
 	"""Loads a saved building. Don't load buildings yourself in the game code."""
+	LoadPhases.count('buildings')
 	return Entities.buildings[typeid].load(session, db, worldid)
 
 
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.util import Point
+
+
+class BuildabilityCache(object):
+	"""Keeps track of the tiles of a settlement that are buildable for a building class.
+
+	The buildable coords of a class are calculated the first time they are requested,
+	afterwards only the tiles passed to invalidate() are checked again. The island does
+	that whenever a building is added or removed and when the settlement grows, so
+	the building tool doesn't need to check every tile of the settlement when it is opened.
+	"""
+
+	def __init__(self, settlement):
+		self.settlement = settlement
+		self._buildable = {} # building class: set of buildable coord tuples
+		self._dirty = {} # building class: set of coord tuples that need to be checked again
+
+	def can_cache(self, building_class):
+		"""Whether the buildable tiles of building_class can be taken from the cache.
+		Tiles of irregular classes also depend on the surrounding tiles and on units,
+		for which there are no notifications."""
+		if building_class.irregular_conditions:
+			return False
+		# builds that are being constructed (multiplayer) block tiles without changing them
+		manager = self.settlement.session.manager
+		if hasattr(manager, 'get_builds_in_construction') and manager.get_builds_in_construction():
+			return False
+		return True
+
+	def get_buildable_coords(self, building_class):
+		"""Returns the set of coord tuples of the settlement where building_class is buildable.
+		The settlement itself isn't checked, i.e. the result is the same as calling
+		is_tile_buildable(..., check_settlement=False) for every tile.
+		The returned set is updated in place later on, don't modify it."""
+		assert self.can_cache(building_class)
+		if building_class not in self._buildable:
+			self._buildable[building_class] = set()
+			coords = self.settlement.ground_map.keys()
+		else:
+			coords = self._dirty[building_class]
+		self._dirty[building_class] = set()
+		buildable = self._buildable[building_class]
+		if coords:
+			self._check(building_class, buildable, coords)
+		return buildable
+
+	def invalidate(self, coords):
+		"""Marks the tiles at coords as changed.
+		@param coords: iterable of coord tuples"""
+		if not self._dirty:
+			return
+		coords = list(coords)
+		for dirty in self._dirty.itervalues():
+			dirty.update(coords)
+
+	def _check(self, building_class, buildable, coords):
+		session = self.settlement.session
+		ground_map = self.settlement.ground_map
+		island = session.world.get_island(Point(*next(iter(coords))))
+		is_tile_buildable = building_class.is_tile_buildable
+		for coord in coords:
+			tile = ground_map.get(coord)
+			if tile is not None and is_tile_buildable(session, tile, None, island, check_settlement=False):
+				buildable.add(coord)
+			else:
+				buildable.discard(coord)
@@ -82,12 +82,49 @@ class _BuildPosition(object):
 	def __ne__(self, other):
 		return not self.__eq__(other)
 
+	def copy(self):
+		return _BuildPosition(self.position, self.rotation, self.tearset, self.buildable,
+		                      action=self.action, problem=self.problem)
+
 class _NotBuildableError(Exception):
 	"""Internal exception."""
 	def __init__(self, errortype):
 		super(_NotBuildableError, self).__init__()
 		self.errortype = errortype
 
+class BuildCheckMemo(object):
+	"""Remembers results of build checks while they are valid, e.g. while the player drags
+	a line of buildings. The world must not change while a memo is used, create a new one then.
+	Returned build positions are copies, so they can be modified."""
+
+	def __init__(self, building_class, session, ship=None):
+		self.building_class = building_class
+		self.session = session
+		self.ship = ship
+		self.lines = {} # (point1, point2, rotation): build positions returned by check_build_line
+		self.builds = {} # (x, y, rotation): build position returned by check_build
+		self.routes = {} # (source, destination, clockwise): path of RoadPathFinder
+
+	def check_build_line(self, point1, point2, rotation=45):
+		key = (point1.to_tuple(), point2.to_tuple(), rotation)
+		if key not in self.lines:
+			self.lines[key] = self.building_class.check_build_line(self.session, point1, point2,
+			                                                       rotation=rotation, ship=self.ship, memo=self)
+		return [build.copy() for build in self.lines[key]]
+
+	def check_build(self, point, rotation=45):
+		key = (point.x, point.y, rotation)
+		if key not in self.builds:
+			self.builds[key] = self.building_class.check_build(self.session, point, rotation=rotation, ship=self.ship)
+		return self.builds[key].copy()
+
+	def find_road_path(self, path_nodes, source, destination, clockwise):
+		key = (source, destination, clockwise)
+		if key not in self.routes:
+			self.routes[key] = RoadPathFinder()(path_nodes, source, destination, clockwise)
+		return self.routes[key]
+
+
 class Buildable(object):
 	"""Interface for every kind of buildable objects.
 	Contains methods to determine whether a building can be placed on a coordinate, regarding
@@ -133,12 +170,13 @@ class Buildable(object):
 		return _BuildPosition(position, rotation, tearset, buildable, problem=problem)
 
 	@classmethod
-	def check_build_line(cls, session, point1, point2, rotation=45, ship=None):
+	def check_build_line(cls, session, point1, point2, rotation=45, ship=None, memo=None):
 		"""Checks out a line on the map for build possibilities.
 		The line usually is a draw of the mouse.
 		@param point1, point2: Point instance, start and end of the line
 		@param rotation: prefered rotation
 		@param ship: ship instance if building from ship
+		@param memo: BuildCheckMemo to look up and store results of single checks
 		@return list of _BuildPositions
 		"""
 		raise NotImplementedError()
@@ -290,7 +328,7 @@ class Buildable(object):
 class BuildableSingle(Buildable):
 	"""Buildings one can build single. """
 	@classmethod
-	def check_build_line(cls, session, point1, point2, rotation=45, ship=None):
+	def check_build_line(cls, session, point1, point2, rotation=45, ship=None, memo=None):
 		# only build 1 building at endpoint
 		# correct placement for large buildings (mouse should be at center of building)
 		point2 = point2.copy() # only change copy
@@ -316,7 +354,7 @@ class BuildableSingleEverywhere(BuildableSingle):
 class BuildableRect(Buildable):
 	"""Buildings one can build as a Rectangle, such as Trees"""
 	@classmethod
-	def check_build_line(cls, session, point1, point2, rotation=45, ship=None):
+	def check_build_line(cls, session, point1, point2, rotation=45, ship=None, memo=None):
 		if point1 == point2:
 			# this is actually a masked single build
 			return [cls.check_build_fuzzy(session, point1, rotation=rotation, ship=ship)]
@@ -330,16 +368,18 @@ class BuildableRect(Buildable):
 
 		for x in xrange(area.left, area.right+1, cls.size[0]):
 			for y in xrange(area.top, area.bottom+1, cls.size[1]):
-				possible_builds.append( \
-				  cls.check_build(session, Point(x, y), rotation=rotation, ship=ship) \
-				)
+				if memo is not None:
+					build = memo.check_build(Point(x, y), rotation=rotation)
+				else:
+					build = cls.check_build(session, Point(x, y), rotation=rotation, ship=ship)
+				possible_builds.append(build)
 		return possible_builds
 
 
 class BuildableLine(Buildable):
 	"""Buildings one can build in a line, such as paths"""
 	@classmethod
-	def check_build_line(cls, session, point1, point2, rotation=45, ship=None):
+	def check_build_line(cls, session, point1, point2, rotation=45, ship=None, memo=None):
 
 		# Pathfinding currently only supports buildingsize 1x1, so don't use it in this case
 		if cls.size != (1, 1):
@@ -350,22 +390,30 @@ class BuildableLine(Buildable):
 		if island is None:
 			return []
 
-		path = RoadPathFinder()(island.path_nodes.nodes, point1.to_tuple(), point2.to_tuple(), rotation == 45 or rotation == 225)
+		if memo is not None:
+			find_path = memo.find_road_path
+		else:
+			find_path = RoadPathFinder()
+		path = find_path(island.path_nodes.nodes, point1.to_tuple(), point2.to_tuple(), rotation == 45 or rotation == 225)
 		if path is None: # can't find a path between these points
 			return [] # TODO: maybe implement alternative strategy
 
 		possible_builds = []
+		path_coords = set(path)
 
 		for i in path:
 			action = ''
 			for action_char, offset in \
 			    sorted(BUILDINGS.ACTION.action_offset_dict.iteritems()): # order is important here
-				if (offset[0]+i[0], offset[1]+i[1]) in path:
+				if (offset[0]+i[0], offset[1]+i[1]) in path_coords:
 					action += action_char
 			if action == '':
 				action = 'single' # single trail piece with no neighbours
 
-			build = cls.check_build(session, Point(*i))
+			if memo is not None:
+				build = memo.check_build(Point(*i))
+			else:
+				build = cls.check_build(session, Point(*i))
 			build.action = action
 			possible_builds.append(build)
 
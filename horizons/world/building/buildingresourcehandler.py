@@ -21,6 +21,7 @@
 
 from horizons.world.resourcehandler import ResourceHandler
 from horizons.world.production.producer import Producer
+from horizons.component.storagecomponent import StorageComponent
 
 
 class BuildingResourceHandler(ResourceHandler):
@@ -36,6 +37,8 @@ class BuildingResourceHandler(ResourceHandler):
 
 	def __init(self):
 		self.island.provider_buildings.append(self)
+		# wake up collectors waiting for our resources
+		self.get_component(StorageComponent).inventory.add_change_listener(self._notify_waiting_collectors)
 		if self.has_component(Producer):
 			self.get_component(Producer).add_activity_changed_listener(self._set_running_costs_to_status)
 			self._set_running_costs_to_status(None, self.get_component(Producer).is_active())
@@ -45,11 +48,23 @@ class BuildingResourceHandler(ResourceHandler):
 		self.__init()
 
 	def remove(self):
+		# the inventory might be shared with the settlement, so it outlives us
+		self.get_component(StorageComponent).inventory.discard_change_listener(self._notify_waiting_collectors)
 		super(BuildingResourceHandler, self).remove()
 		self.island.provider_buildings.remove(self)
 		if self.has_component(Producer):
 			self.get_component(Producer).remove_activity_changed_listener(self._set_running_costs_to_status)
 
+	def remove_incoming_collector(self, collector):
+		super(BuildingResourceHandler, self).remove_incoming_collector(collector)
+		# the resources reserved by collector can now be picked up by others
+		self._notify_waiting_collectors()
+
+	def _notify_waiting_collectors(self):
+		providers = self.island.provider_buildings
+		if providers is not None: # None when the island is already being destroyed
+			providers.notify_waiting_collectors(self)
+
 	def _set_running_costs_to_status(self, caller, is_active):
 		current_setting_is_active = self.running_costs_active()
 		if current_setting_is_active and not is_active:
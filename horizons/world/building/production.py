@@ -130,7 +130,7 @@ class Mine(BuildingResourceHandler, BuildableSingleOnDeposit, BasicBuilding):
 
 	def save(self, db):
 		super(Mine, self).save(db)
-		db("INSERT INTO mine(rowid, deposit_class) VALUES(?, ?)", \
+		db.add_row("INSERT INTO mine(rowid, deposit_class) VALUES(?, ?)", \
 		   self.worldid, self.__deposit_class)
 
 	def load(self, db, worldid):
@@ -27,7 +27,7 @@ from horizons.scheduler import Scheduler
 from horizons.gui.tabs import SettlerOverviewTab
 from horizons.world.building.building import BasicBuilding
 from horizons.world.building.buildable import BuildableRect, BuildableSingle
-from horizons.constants import RES, BUILDINGS, GAME, TIER
+from horizons.constants import RES, BUILDINGS, TIER
 from horizons.world.building.buildingresourcehandler import BuildingResourceHandler
 from horizons.world.production.production import SettlerProduction, SingleUseProduction
 from horizons.command.building import Build
@@ -89,10 +89,10 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 
 	def save(self, db):
 		super(Settler, self).save(db)
-		db("INSERT INTO settler(rowid, inhabitants, last_tax_payed) VALUES (?, ?, ?)", \
+		db.add_row("INSERT INTO settler(rowid, inhabitants, last_tax_payed) VALUES (?, ?, ?)", \
 		   self.worldid, self.inhabitants, self.last_tax_payed)
-		remaining_ticks = Scheduler().get_remaining_ticks(self, self._tick)
-		db("INSERT INTO remaining_ticks_of_month(rowid, ticks) VALUES (?, ?)", \
+		remaining_ticks = self.settlement.residential_processor.get_remaining_ticks(self)
+		db.add_row("INSERT INTO remaining_ticks_of_month(rowid, ticks) VALUES (?, ?)", \
 		   self.worldid, remaining_ticks)
 
 	def load(self, db, worldid):
@@ -148,6 +148,7 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 
 	def remove(self):
 		UpgradePermissionsChanged.unsubscribe(self._on_change_upgrade_permissions, sender=self.settlement)
+		self.settlement.residential_processor.remove_settler(self)
 		super(Settler, self).remove()
 
 	@property
@@ -208,20 +209,20 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 			self.update_action_set_level(self.level)
 
 	def run(self, remaining_ticks=None):
-		"""Start regular tick calls"""
-		interval = self.session.timer.get_ticks(GAME.INGAME_TICK_INTERVAL)
-		run_in = remaining_ticks if remaining_ticks is not None else interval
-		Scheduler().add_new_object(self._tick, self, run_in=run_in, loops=-1, loop_interval=interval)
-
-	def _tick(self):
-		"""Here we collect the functions, that are called regularly (every "month")."""
-		self.pay_tax()
-		self.inhabitant_check()
-		self.level_check()
+		"""Start regular tick calls.
+		The monthly updates (collect_tax, inhabitant_check and level_check) are run together
+		with the other settlers of the settlement by its ResidentialProcessor."""
+		self.settlement.residential_processor.add_settler(self, remaining_ticks)
 
 	def pay_tax(self):
 		"""Pays the tax for this settler"""
 		# the money comes from nowhere, settlers seem to have an infinite amount of money.
+		self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, self.collect_tax())
+
+	def collect_tax(self):
+		"""Updates the settler for a tax payment and returns the amount of gold it pays.
+		Transferring the gold to the owner is up to the caller.
+		@return: int"""
 		# see http://wiki.unknown-horizons.org/index.php/DD/Economy/Settler_taxing
 
 		# calc taxes http://wiki.unknown-horizons.org/w/Settler_taxing#Formulae
@@ -230,7 +231,6 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		taxes = self.tax_base * self.settlement.tax_settings[self.level] *  happiness_tax_modifier * inhabitants_tax_modifier
 		real_taxes = int(round(taxes * self.owner.difficulty.tax_multiplier))
 
-		self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, real_taxes)
 		self.last_tax_payed = real_taxes
 
 		# decrease happiness http://wiki.unknown-horizons.org/w/Settler_taxing#Formulae
@@ -246,6 +246,7 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		self._changed()
 		self.log.debug("%s: pays %s taxes, -happy: %s new happiness: %s", self, real_taxes, \
 									 happiness_decrease, self.happiness)
+		return real_taxes
 
 	def inhabitant_check(self):
 		"""Checks whether or not the population of this settler should increase or decrease"""
@@ -372,12 +373,11 @@ class Settler(BuildableRect, BuildingResourceHandler, BasicBuilding):
 		except AttributeError: # an attribute hasn't been set up
 			return super(Settler, self).__str__()
 
-	#@decorators.cachedmethod TODO: replace this with a version that doesn't leak
 	def __get_data(self, key):
 		"""Returns constant settler-related data from the db.
-		The values are cached by python, so the underlying data must not change."""
+		The query results are cached by the db, so the underlying data must not change."""
 		return int(
-		  self.session.db("SELECT value FROM balance_values WHERE name = ?", key)[0][0]
+		  self.session.db.cached_query("SELECT value FROM balance_values WHERE name = ?", key)[0][0]
 		  )
 
 
@@ -22,6 +22,7 @@
 from horizons.scheduler import Scheduler
 from horizons.util import WorldObject, Callback, ActionSetLoader
 from horizons.world.units import UnitClass
+from horizons.constants import GAME_SPEED
 import random
 
 class ConcreteObject(WorldObject):
@@ -49,6 +50,10 @@ class ConcreteObject(WorldObject):
 	def __init(self, action_set_id=None):
 		self._instance = None # overwrite in subclass __init[__]
 		self._action = 'idle' # Default action is idle
+		# (action, facing_loc, repeating, tick, runtime in ms at tick) of an act() that isn't displayed yet, see act()
+		self._deferred_action = None
+		# (tick, runtime in ms) of the action that was displayed when the object was saved
+		self._loaded_action_runtime = None
 		# NOTE: this can't be level-aware since not all ConcreteObjects have levels
 		self._action_set_id = action_set_id if action_set_id else self.__class__.get_random_action_set()
 
@@ -63,8 +68,12 @@ class ConcreteObject(WorldObject):
 
 	def save(self, db):
 		super(ConcreteObject, self).save(db)
-		db("INSERT INTO concrete_object(id, action_runtime, action_set_id) VALUES(?, ?, ?)", self.worldid, \
-			 self._instance.getActionRuntime(), self._action_set_id)
+		if self._deferred_action is not None:
+			action_runtime = self._get_deferred_action_runtime()
+		else:
+			action_runtime = self._instance.getActionRuntime()
+		db.add_row("INSERT INTO concrete_object(id, action_runtime, action_set_id) VALUES(?, ?, ?)", self.worldid, \
+			 action_runtime, self._action_set_id)
 
 	def load(self, db, worldid):
 		super(ConcreteObject, self).load(db, worldid)
@@ -74,11 +83,14 @@ class ConcreteObject(WorldObject):
 		if action_set_id is None:
 			action_set_id = self.__class__.get_random_action_set(level=self.level if hasattr(self, "level") else 0)
 		self.__init(action_set_id)
+		# actions set up while loading continue with this runtime, see act()
+		self._loaded_action_runtime = (Scheduler().cur_tick, runtime)
 
 		# delay setting of runtime until load of sub/super-class has set the action
 		def set_action_runtime(self, runtime):
 			# workaround to delay resolution of self._instance, which doesn't exist yet
-			self._instance.setActionRuntime(runtime)
+			if self._deferred_action is None: # else act() has already taken care of it
+				self._instance.setActionRuntime(runtime)
 		Scheduler().add_new_object( Callback(set_action_runtime, self, runtime), self, run_in=0)
 
 	def act(self, action, facing_loc=None, repeating=False, force_restart=True):
@@ -96,12 +108,45 @@ class ConcreteObject(WorldObject):
 		# Should be fixed as soon as we move concrete object to a component as well
 		# which ensures proper initialization order for loading and initing
 		if self._instance is not None:
-			if facing_loc is None:
-				facing_loc = self._instance.getFacingLocation()
-			UnitClass.ensure_action_loaded(self._action_set_id, action) # lazy
-			self._instance.act(action+"_"+str(self._action_set_id), facing_loc, repeating)
+			runtime = 0
+			if self._loaded_action_runtime is not None and \
+			   self._loaded_action_runtime[0] == Scheduler().cur_tick:
+				runtime = self._loaded_action_runtime[1] # restoring the state of a savegame
+			if self.is_building and not self.session.view.is_visible(self.position.center()):
+				# nobody can see it, the view calls sync_instance() when it gets here
+				if self._deferred_action is None:
+					self.session.view.add_culled_object(self)
+				self._deferred_action = (action, facing_loc, repeating, Scheduler().cur_tick, runtime)
+				self.session.view.deferred_actions += 1
+			else:
+				self._deferred_action = None
+				self._act_instance(action, facing_loc, repeating)
+				if runtime:
+					self._instance.setActionRuntime(runtime)
 		self._action = action
 
+	def _act_instance(self, action, facing_loc, repeating):
+		if facing_loc is None:
+			facing_loc = self._instance.getFacingLocation()
+		UnitClass.ensure_action_loaded(self._action_set_id, action) # lazy
+		self._instance.act(action+"_"+str(self._action_set_id), facing_loc, repeating)
+
+	def _get_deferred_action_runtime(self):
+		"""Returns how long the deferred action would have been displayed already, in ms."""
+		action, facing_loc, repeating, tick, runtime = self._deferred_action
+		return runtime + (Scheduler().cur_tick - tick) * 1000 // GAME_SPEED.TICKS_PER_SECOND
+
+	def sync_instance(self):
+		"""Displays the action that has been deferred by act() while the object wasn't visible.
+		Called by the view when the object becomes visible."""
+		if self._deferred_action is None or self._instance is None:
+			return
+		action, facing_loc, repeating, tick, runtime = self._deferred_action
+		self._act_instance(action, facing_loc, repeating)
+		# continue the animation where it would be if it had been started in time
+		self._instance.setActionRuntime(self._get_deferred_action_runtime())
+		self._deferred_action = None
+
 	def has_action(self, action):
 		"""Checks if this unit has a certain action.
 		@param anim: animation id as string"""
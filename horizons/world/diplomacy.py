@@ -127,10 +127,10 @@ class Diplomacy(object):
 
 	def save(self, db):
 		for tup in self.allies:
-			db("INSERT INTO diplomacy_allies(player1, player2) VALUES(?, ?)",
+			db.add_row("INSERT INTO diplomacy_allies(player1, player2) VALUES(?, ?)",
 				tup[0].worldid, tup[1].worldid)
 		for tup in self.enemies:
-			db("INSERT INTO diplomacy_enemies(player1, player2) VALUES(?, ?)",
+			db.add_row("INSERT INTO diplomacy_enemies(player1, player2) VALUES(?, ?)",
 				tup[0].worldid, tup[1].worldid)
 
 def make_tup(a, b):
@@ -57,7 +57,7 @@ class Disaster(WorldObject):
 
 	def save(self, db):
 		ticks = Scheduler().get_remaining_ticks(self, self.expand, True)
-		db("INSERT INTO disaster(rowid, type, remaining_ticks_expand, settlement) VALUES(?, ?, ?, ?)",
+		db.add_row("INSERT INTO disaster(rowid, type, remaining_ticks_expand, settlement) VALUES(?, ?, ?, ?)",
 		   self.worldid, self.__class__.TYPE, ticks, self._settlement.worldid)
 
 	def load(self, db, worldid):
@@ -55,7 +55,7 @@ class DisasterManager(object):
 
 	def save(self, db):
 		ticks = Scheduler().get_remaining_ticks(self, self.run, True)
-		db("INSERT INTO disaster_manager(remaining_ticks) VALUES(?)", ticks)
+		db.add_row("INSERT INTO disaster_manager(remaining_ticks) VALUES(?)", ticks)
 		for disaster in self._active_disaster.itervalues():
 			disaster.save(db)
 
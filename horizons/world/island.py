@@ -25,13 +25,13 @@ from horizons.entities import Entities
 from horizons.scheduler import Scheduler
 
 from horizons.util import WorldObject, Point, Rect, Circle, DbReader, random_map, BuildingIndexer
+from horizons.util.loadphases import LoadPhases
 from horizons.messaging import SettlementRangeChanged, NewSettlement
 from settlement import Settlement
 from horizons.util.pathfinding.pathnodes import IslandPathNodes
 from horizons.constants import BUILDINGS, RES, UNITS
 from horizons.scenario import CONDITIONS
 from horizons.world.buildingowner import BuildingOwner
-from horizons.gui.widgets.minimap import Minimap
 
 class Island(BuildingOwner, WorldObject):
 	"""The Island class represents an island. It contains a list of all things on the map
@@ -79,7 +79,9 @@ class Island(BuildingOwner, WorldObject):
 		self.session = session
 
 		x, y, filename = db("SELECT x, y, file FROM island WHERE rowid = ? - 1000", islandid)[0]
-		self.__init(Point(x, y), filename, preview=preview)
+		with LoadPhases.phase('ground'):
+			self.__init(Point(x, y), filename, preview=preview)
+			LoadPhases.count('tiles', len(self.ground_map))
 
 		if not preview:
 			# create building indexers
@@ -88,16 +90,19 @@ class Island(BuildingOwner, WorldObject):
 			self.building_indexers[BUILDINGS.TREE] = BuildingIndexer(WildAnimal.walking_range, self, self.session.random)
 
 		# load settlements
-		for (settlement_id,) in db("SELECT rowid FROM settlement WHERE island = ?", islandid):
-			settlement = Settlement.load(db, settlement_id, self.session, self)
-			self.settlements.append(settlement)
+		with LoadPhases.phase('settlements'):
+			for (settlement_id,) in db("SELECT rowid FROM settlement WHERE island = ?", islandid):
+				settlement = Settlement.load(db, settlement_id, self.session, self)
+				self.settlements.append(settlement)
+			LoadPhases.count('settlements', len(self.settlements))
 
 		if not preview:
 			# load buildings
 			from horizons.world import load_building
-			for (building_worldid, building_typeid) in \
-				  db("SELECT rowid, type FROM building WHERE location = ?", islandid):
-				load_building(self.session, db, building_typeid, building_worldid)
+			with LoadPhases.phase('buildings'):
+				for (building_worldid, building_typeid) in \
+					  db("SELECT rowid, type FROM building WHERE location = ?", islandid):
+					load_building(self.session, db, building_typeid, building_worldid)
 
 	def _get_island_db(self):
 		# check if filename is a random map
@@ -163,7 +168,7 @@ class Island(BuildingOwner, WorldObject):
 
 	def save(self, db):
 		super(Island, self).save(db)
-		db("INSERT INTO island (rowid, x, y, file) VALUES (? - 1000, ?, ?, ?)",
+		db.add_row("INSERT INTO island (rowid, x, y, file) VALUES (? - 1000, ?, ?, ?)",
 			self.worldid, self.origin.x, self.origin.y, self.file)
 		for settlement in self.settlements:
 			settlement.save(db, self.worldid)
@@ -255,7 +260,6 @@ class Island(BuildingOwner, WorldObject):
 				if tile.settlement is None:
 					tile.settlement = settlement
 					settlement.ground_map[coord] = tile
-					Minimap.update(coord)
 					self._register_change(coord[0], coord[1])
 					settlement_tiles_changed.append(tile)
 
@@ -274,6 +278,7 @@ class Island(BuildingOwner, WorldObject):
 					settlement.add_building(building)
 
 		if settlement_tiles_changed:
+			settlement.buildability_cache.invalidate((tile.x, tile.y) for tile in settlement_tiles_changed)
 			SettlementRangeChanged.broadcast(settlement, settlement_tiles_changed)
 
 
@@ -298,6 +303,7 @@ class Island(BuildingOwner, WorldObject):
 			self.path_nodes.reset_tile_walkability(point.to_tuple())
 			if not load:
 				self._register_change(point.x, point.y)
+		self._invalidate_buildability(building.position)
 
 		# keep track of the number of trees for animal population control
 		if building.id == BUILDINGS.TREE:
@@ -319,11 +325,19 @@ class Island(BuildingOwner, WorldObject):
 		for point in building.position:
 			self.path_nodes.reset_tile_walkability(point.to_tuple())
 			self._register_change(point.x, point.y)
+		self._invalidate_buildability(building.position)
 
 		# keep track of the number of trees for animal population control
 		if building.id == BUILDINGS.TREE:
 			self.num_trees -= 1
 
+	def _invalidate_buildability(self, position):
+		"""Notifies the settlements owning the tiles of position that they have changed."""
+		for tup in position.tuple_iter():
+			tile = self.get_tile_tuple(tup)
+			if tile is not None and tile.settlement is not None:
+				tile.settlement.buildability_cache.invalidate((tup, ))
+
 	def get_building_index(self, resource_id):
 		if resource_id == RES.WILDANIMALFOOD:
 			return self.building_indexers[BUILDINGS.TREE]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import json
+from collections import defaultdict
+
+
+class MinimapRaster(object):
+	"""Calculates the colours of the minimap pixels of a world, without drawing anything.
+
+	Every pixel shows the tile at the center of the part of the world it covers.
+	These tiles are looked up once, the colours are then derived from the settlements
+	the tiles belong to. When tiles change their settlement, only the pixels showing
+	them are recalculated. The pixels are grouped into square blocks, so that only
+	the blocks that have actually changed need to be drawn again.
+
+	Pixels are identified by their index x * height + y, which is also the order
+	of the pixels in the output.
+	"""
+	ISLAND_COLOR = (137, 117, 87)
+	BLOCK_SIZE = 16 # pixels
+
+	def __init__(self, world, size):
+		"""
+		@param world: World object or fake thereof
+		@param size: (width, height) of the minimap in pixels
+		"""
+		self.width, self.height = size
+		pixel_per_coord_x = float(world.map_dimensions.width) / self.width
+		pixel_per_coord_y = float(world.map_dimensions.height) / self.height
+		# world coords shown by the columns and rows of pixels (center of the covered area)
+		xs = [int(x * pixel_per_coord_x) + world.min_x + int(pixel_per_coord_x / 2) for x in xrange(self.width)]
+		ys = [int(y * pixel_per_coord_y) + world.min_y + int(pixel_per_coord_y / 2) for y in xrange(self.height)]
+
+		island_map = world.island_map
+		full_map = world.full_map
+		block_size = self.BLOCK_SIZE
+		self._tiles = {} # pixel index: island tile shown by it, water pixels are left out
+		self._pixels = defaultdict(list) # coord: indices of the pixels showing this coord
+		self._blocks = defaultdict(list) # (x, y) of block: indices of its island pixels
+		for x, world_x in enumerate(xs):
+			column = x * self.height
+			block_x = x // block_size
+			for y, world_y in enumerate(ys):
+				coord = (world_x, world_y)
+				if coord in island_map:
+					index = column + y
+					self._tiles[index] = full_map[coord]
+					self._pixels[coord].append(index)
+					self._blocks[(block_x, y // block_size)].append(index)
+
+		self._colors = self._get_colors(self._tiles)
+		self._dirty = set() # indices of pixels that need to be recalculated
+
+	def _get_colors(self, indices):
+		"""Returns a dict mapping the pixel indices to their current colours."""
+		tiles = self._tiles
+		settlement_colors = {None: self.ISLAND_COLOR}
+		colors = {}
+		for index in indices:
+			settlement = tiles[index].settlement
+			color = settlement_colors.get(settlement)
+			if color is None:
+				color = settlement_colors[settlement] = settlement.owner.color.to_tuple()
+			colors[index] = color
+		return colors
+
+	def mark_dirty(self, coords):
+		"""Marks the pixels showing coords to be recalculated by the next update().
+		@param coords: iterable of world coord tuples, e.g. tiles that changed their settlement"""
+		pixels = self._pixels
+		for coord in coords:
+			if coord in pixels:
+				self._dirty.update(pixels[coord])
+
+	def update(self):
+		"""Recalculates the dirty pixels.
+		@return: set of blocks that contain a pixel whose colour changed"""
+		changed_blocks = set()
+		if not self._dirty:
+			return changed_blocks
+		block_size = self.BLOCK_SIZE
+		for index, color in self._get_colors(self._dirty).iteritems():
+			if self._colors[index] != color:
+				self._colors[index] = color
+				x, y = divmod(index, self.height)
+				changed_blocks.add((x // block_size, y // block_size))
+		self._dirty.clear()
+		return changed_blocks
+
+	def get_blocks(self):
+		"""Returns all blocks that contain island pixels."""
+		return self._blocks.keys()
+
+	def get_pixels(self, block=None):
+		"""Returns (x, y, color) of the island pixels, ordered by index.
+		@param block: only return the pixels of this block"""
+		if block is None:
+			indices = sorted(self._colors)
+		else:
+			indices = self._blocks[block]
+		height = self.height
+		colors = self._colors
+		return [divmod(index, height) + (colors[index], ) for index in indices]
+
+	def dump_data(self):
+		"""Returns the pixels as json string in the format of Minimap.dump_data()
+		(without rotation)."""
+		return json.dumps([(x, y) + color for x, y, color in self.get_pixels()])
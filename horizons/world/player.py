@@ -102,7 +102,7 @@ class Player(ComponentHolder, WorldObject):
 		super(Player, self).save(db)
 		client_id = None if self is not self.session.world.player else \
 		          horizons.main.fife.get_uh_setting("ClientID")
-		db("INSERT INTO player(rowid, name, color, client_id, settler_level, difficulty_level) VALUES(?, ?, ?, ?, ?, ?)", \
+		db.add_row("INSERT INTO player(rowid, name, color, client_id, settler_level, difficulty_level) VALUES(?, ?, ?, ?, ?, ?)", \
 			 self.worldid, self.name, self.color.id, client_id, self.settler_level, self.difficulty.level if self.difficulty is not None else None)
 
 	@classmethod
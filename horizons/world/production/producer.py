@@ -468,7 +468,7 @@ class QueueProducer(Producer):
 		super(QueueProducer, self).save(db)
 		for i in enumerate(self.production_queue):
 			position, prod_line_id = i
-			db("INSERT INTO production_queue (object, position, production_line_id) VALUES(?, ?, ?)",
+			db.add_row("INSERT INTO production_queue (object, position, production_line_id) VALUES(?, ?, ?)",
 			   self.instance.worldid, position, prod_line_id)
 
 	def load(self, db, worldid):
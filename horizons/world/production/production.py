@@ -22,10 +22,11 @@
 
 import logging
 
-from collections import defaultdict, deque
+from collections import defaultdict
 
 from horizons.util.changelistener import metaChangeListenerDecorator, ChangeListener
-from horizons.constants import PRODUCTION
+from horizons.util.statehistory import StateHistory
+from horizons.constants import PRODUCTION, RES
 from horizons.world.production.productionline import ProductionLine
 
 from horizons.scheduler import Scheduler
@@ -69,7 +70,7 @@ class Production(ChangeListener):
 		super(Production, self).__init__(**kwargs)
 		# this has grown to be a bit weird compared to other init/loads
 		# __init__ is always called before load, therefore load just overwrites some of the values here
-		self._state_history = deque()
+		self._state_history = StateHistory()
 		self.prod_id = prod_id
 		self.prod_data = prod_data
 		self.__start_finished = start_finished
@@ -111,7 +112,7 @@ class Production(ChangeListener):
 		# use a number > 0 for ticks
 		if remaining_ticks < 1:
 			remaining_ticks = 1
-		db('INSERT INTO production(rowid, state, prod_line_id, remaining_ticks, _pause_old_state, creation_tick, owner) VALUES(?, ?, ?, ?, ?, ?, ?)', \
+		db.add_row('INSERT INTO production(rowid, state, prod_line_id, remaining_ticks, _pause_old_state, creation_tick, owner) VALUES(?, ?, ?, ?, ?, ?, ?)', \
 		     None, self._state.index, self._prod_line.id, remaining_ticks, \
 			 None if self._pause_old_state is None else self._pause_old_state.index, translated_creation_tick, owner_id)
 
@@ -119,7 +120,7 @@ class Production(ChangeListener):
 		for tick, state in self._state_history:
 				# pre-translate the tick number for the loading process
 			translated_tick = tick - current_tick + 1
-			db("INSERT INTO production_state_history(production, tick, state, object_id) VALUES(?, ?, ?, ?)", \
+			db.add_row("INSERT INTO production_state_history(production, tick, state, object_id) VALUES(?, ?, ?, ?)", \
 				 self.prod_id, translated_tick, state, owner_id)
 
 	def load(self, db, worldid):
@@ -141,7 +142,7 @@ class Production(ChangeListener):
 			# saving , where it hasn't triggered yet, therefore it won't now
 			self._add_listeners()
 
-		self._state_history = db.get_production_state_history(worldid, self.prod_id)
+		self._state_history = StateHistory(db.get_production_state_history(worldid, self.prod_id))
 
 	def remove(self):
 		self._remove_listeners()
@@ -251,26 +252,11 @@ class Production(ChangeListener):
 		"""
 		self._clean_state_history()
 		result = defaultdict(lambda: 0)
-		current_tick = Scheduler().cur_tick
-		pause_state = PRODUCTION.STATES.paused.index
 		first_relevant_tick = self._get_first_relevant_tick(ignore_pause)
-		num_entries = len(self._state_history)
-
-		for i in xrange(num_entries):
-			if ignore_pause and self._state_history[i][1] == pause_state:
-				continue
-			tick = self._state_history[i][0]
-			if tick >= current_tick:
-				break
-
-			next_tick = min(self._state_history[i + 1][0], current_tick) if i + 1 < num_entries else current_tick
-			if next_tick <= first_relevant_tick:
-				continue
-			relevant_ticks = next_tick - tick
-			if tick < first_relevant_tick:
-				# the beginning is not relevant
-				relevant_ticks -= first_relevant_tick - tick
-			result[self._state_history[i][1]] += relevant_ticks
+		durations = self._state_history.get_durations(first_relevant_tick, Scheduler().cur_tick)
+		if ignore_pause:
+			durations.pop(PRODUCTION.STATES.paused.index, None)
+		result.update(durations)
 
 		total_length = sum(result.itervalues())
 		if total_length == 0:
@@ -305,26 +291,23 @@ class Production(ChangeListener):
 		state_hist_len = min(PRODUCTION.STATISTICAL_WINDOW, current_tick - self._creation_tick)
 
 		first_relevant_tick = current_tick - state_hist_len
-		if not ignore_pause:
+		pause_state = PRODUCTION.STATES.paused.index
+		if not ignore_pause or not self._state_history.has_value(pause_state):
 			return first_relevant_tick
 
 		# ignore paused time
-		pause_state = PRODUCTION.STATES.paused.index
-		for i in xrange(len(self._state_history) - 1, -1, -1):
-			if self._state_history[i][1] != pause_state:
-				continue
-			tick = self._state_history[i][0]
-			next_tick = self._state_history[i + 1][0] if i + 1 < len(self._state_history) else current_tick
-			if next_tick <= first_relevant_tick:
-				break
-			first_relevant_tick -= next_tick - tick
+		next_tick = current_tick
+		for tick, state in reversed(self._state_history):
+			if state == pause_state:
+				if next_tick <= first_relevant_tick:
+					break
+				first_relevant_tick -= next_tick - tick
+			next_tick = tick
 		return max(self._creation_tick, first_relevant_tick)
 
 	def _clean_state_history(self):
 		""" remove the part of the state history that is too old to matter """
-		first_relevant_tick = self._get_first_relevant_tick(True)
-		while len(self._state_history) > 1 and self._state_history[1][0] < first_relevant_tick:
-			self._state_history.popleft()
+		self._state_history.discard_before(self._get_first_relevant_tick(True))
 
 	def _changed(self):
 		super(Production, self)._changed()
@@ -337,7 +320,7 @@ class Production(ChangeListener):
 		if self._state_history and self._state_history[-1][0] == current_tick:
 			self._state_history.pop() # make sure no two events are on the same tick
 		if not self._state_history or self._state_history[-1][1] != state:
-			self._state_history.append((current_tick, state))
+			self._state_history.append(current_tick, state)
 
 		self._clean_state_history()
 
@@ -385,20 +368,32 @@ class Production(ChangeListener):
 			self._add_listeners(check_now=True)
 
 	def _add_listeners(self, check_now=False):
-		"""Listen for changes in the inventory from now on."""
+		"""Listen for changes in the inventory from now on.
+		Only changes of res we consume or produce are of interest, see _on_resource_change."""
 		# don't set call_listener_now to true here, adding/removing changelisteners wouldn't be atomic any more
-		self.inventory.add_change_listener(self._check_inventory)
+		resources = set(self._prod_line.consumed_res) | set(self._prod_line.produced_res)
 		if self.__class__.uses_gold:
-			self.owner_inventory.add_change_listener(self._check_inventory)
+			resources.discard(RES.GOLD)
+			self.owner_inventory.add_resource_change_listener(self._on_resource_change, [RES.GOLD])
+		self.inventory.add_resource_change_listener(self._on_resource_change, resources)
 
 		if check_now: # only check now after adding everything
 			self._check_inventory()
 
 	def _remove_listeners(self):
 		# depending on state, a check_inventory listener might be active
-		self.inventory.discard_change_listener(self._check_inventory)
+		self.inventory.discard_resource_change_listener(self._on_resource_change)
 		if self.__class__.uses_gold:
-			self.owner_inventory.discard_change_listener(self._check_inventory)
+			self.owner_inventory.discard_resource_change_listener(self._on_resource_change)
+
+	def _on_resource_change(self, res):
+		"""Called when the amount of or the space for res changed (res is None if unknown).
+		If res is a consumed res that is still missing, the result of the last inventory
+		check can't have changed, so the check is skipped."""
+		if res is not None and res not in self._prod_line.produced_res and \
+		   not self._is_res_available(res):
+			return
+		self._check_inventory()
 
 	def _give_produced_res(self):
 		"""Put produces goods to the inventory"""
@@ -414,6 +409,10 @@ class Production(ChangeListener):
 				return False
 		return True
 
+	def _is_res_available(self, res):
+		"""Returns whether the requirement for the consumed res res is met (see _check_available_res)"""
+		return self.inventory[res] >= -self._prod_line.consumed_res[res]
+
 	def _remove_res_to_expend(self):
 		"""Removes the resources from the inventory, that production takes."""
 		for res, amount in self._prod_line.consumed_res.iteritems():
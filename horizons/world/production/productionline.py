@@ -21,6 +21,7 @@
 # ###################################################
 
 import horizons.main
+from horizons.util.python import decorators
 
 class ProductionLine(object):
 	"""Class that collects the production line data."""
@@ -50,13 +51,20 @@ class ProductionLine(object):
 				self.production[res] = amount
 				self.consumed_res[res] = amount
 		# Stores unit_id: amount entries, if units are to be produced by this production line
-		self.unit_production = {}
-		# TODO: move this data into yaml files
-		for unit, amount in horizons.main.db.cached_query("SELECT unit, amount FROM unit_production WHERE production_line = ?", self.id):
-			self.unit_production[int(unit)] = amount # Store the correct unit id =>  -1.000.000
+		self.unit_production = dict(self.get_unit_production(self.id))
 
 		self._init_finished = True
 
+	@staticmethod
+	@decorators.cachedfunction
+	def get_unit_production(line_id):
+		"""Returns {unit_id: amount} of the units produced by the production line line_id.
+		@return cached dictionary (don't modify)"""
+		# TODO: move this data into yaml files
+		sql = "SELECT unit, amount FROM unit_production WHERE production_line = ?"
+		# Store the correct unit id =>  -1.000.000
+		return dict( (int(unit), amount) for unit, amount in horizons.main.db(sql, line_id) )
+
 	def __str__(self):
 		return "ProductionLineData(lineid=%s)" % self.id
 
@@ -76,19 +84,19 @@ class ProductionLine(object):
 	def save(self, db, for_worldid):
 		# we don't have a worldid, we load it for another world id
 		for res, amount in self.production.iteritems():
-			db("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
+			db.add_row("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
 			   for_worldid, "NORMAL", res, amount)
 		for res, amount in self.consumed_res.iteritems():
-			db("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
+			db.add_row("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
 			   for_worldid, "CONSUMED", res, amount)
 		for res, amount in self.produced_res.iteritems():
-			db("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
+			db.add_row("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
 			   for_worldid, "PRODUCED", res, amount)
 		for unit, amount in self.unit_production.iteritems():
-			db("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
+			db.add_row("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
 			   for_worldid, "UNIT", unit, amount)
 
-		db("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
+		db.add_row("INSERT INTO production_line(for_worldid, type, res, amount) VALUES(?, ?, ?, ?)",
 			   for_worldid, "TIME", self.time, None)
 
 
@@ -55,6 +55,12 @@ class UnitProduction(ChangingProduction):
 				return True
 		return False
 
+	def _is_res_available(self, res):
+		if self._prod_line.consumed_res[res] == 0:
+			return False # already fully provided
+		inventory = self.owner_inventory if res == RES.GOLD else self.inventory
+		return inventory[res] > 0
+
 	def _remove_res_to_expend(self, return_without_gold=False):
 		"""Takes as many res as there are and returns sum of amount of res taken.
 		@param return_without_gold: return not an integer but a tuple, where the second value is without gold"""
@@ -86,9 +92,7 @@ class UnitProduction(ChangingProduction):
 		# check if there were res
 		if removed_res == 0:
 			# watch inventory for new res
-			self.inventory.add_change_listener(self._check_inventory)
-			if self.__class__.uses_gold:
-				self.owner_inventory.add_change_listener(self._check_inventory)
+			self._add_listeners()
 			self._state = PRODUCTION.STATES.waiting_for_res
 			self._changed()
 			return
@@ -22,28 +22,64 @@
 
 from collections import defaultdict
 
+from horizons.component.storagecomponent import StorageComponent
+
 class ProviderHandler(list):
 	"""Class to keep track of providers of an area, especially an island.
 	It acts as a data structure for quick retrieval of special properties, that only resource
 	providers have.
 
+	It also keeps track of collectors, that currently can't find a job in this area and wait
+	for resources to become available (see BuildingCollector.get_job).
+
 	Precondition: Provider never change their provided resources."""
 
 	def __init__(self):
 		super(ProviderHandler, self).__init__()
 		self.provider_by_resources = defaultdict(list)
+		# res: list of collectors, that wait for a job containing this res
+		self.__waiting_collectors = defaultdict(list)
+		# collector: resources it waits for
+		self.__waiting_collector_resources = {}
 
 	def append(self, provider):
 		# NOTE: appended elements need to be removed, else there will be a memory leak
 		for res in provider.provided_resources:
 			self.provider_by_resources[res].append(provider)
 		super(ProviderHandler, self).append(provider)
+		# the new provider might already have something in stock (e.g. a settlement inventory)
+		self.notify_waiting_collectors(provider)
 
 	def remove(self, provider):
 		for res in provider.provided_resources:
 			self.provider_by_resources[res].remove(provider)
 		super(ProviderHandler, self).remove(provider)
 
+	def add_waiting_collector(self, collector, resources):
+		"""Registers collector to be notified when a provider gets one of resources.
+		@param resources: iterable of res ids"""
+		assert collector not in self.__waiting_collector_resources
+		resources = tuple(resources)
+		self.__waiting_collector_resources[collector] = resources
+		for res in resources:
+			self.__waiting_collectors[res].append(collector)
 
+	def remove_waiting_collector(self, collector):
+		for res in self.__waiting_collector_resources.pop(collector):
+			collectors = self.__waiting_collectors[res]
+			collectors.remove(collector)
+			if not collectors:
+				del self.__waiting_collectors[res]
 
-
+	def notify_waiting_collectors(self, provider):
+		"""Wakes up collectors waiting for a resource provider has in stock.
+		Collectors are woken in the order of their worldid to keep this deterministic."""
+		if not self.__waiting_collectors:
+			return # nobody is interested
+		inventory = provider.get_component(StorageComponent).inventory
+		collectors = set()
+		for res, waiting in self.__waiting_collectors.iteritems():
+			if inventory[res] > 0 and res in provider.provided_resources:
+				collectors.update(waiting)
+		for collector in sorted(collectors, key=lambda collector: collector.worldid):
+			collector.notify_job_available()
@@ -0,0 +1,109 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+from horizons.scheduler import Scheduler
+from horizons.constants import RES, GAME
+from horizons.util import Callback
+from horizons.component.storagecomponent import StorageComponent
+
+class ResidentialProcessor(object):
+	"""Runs the regular ("monthly") updates of the settlers of a settlement.
+
+	Instead of every settler registering its own scheduler call, settlers are grouped and
+	every group is handled by a single call. A settler only joins a group if its call would
+	directly follow the group's call in the scheduler, i.e. nothing else has been scheduled
+	for that tick in between. Therefore the settlers are updated in exactly the same order
+	relative to each other and to all other scheduled calls as with individual calls.
+	The taxes of a group are summed up and transferred to the owner at once.
+	"""
+
+	def __init__(self, settlement):
+		self.settlement = settlement
+		self._last_group_of_tick = {} # tick: the group that was scheduled last for this tick
+		self._group_of_settler = {} # settler: the group it is in
+
+	def add_settler(self, settler, run_in=None):
+		"""Starts regular updates of settler.
+		@param run_in: ticks until the first update, defaults to one interval"""
+		assert settler not in self._group_of_settler
+		if run_in is None:
+			run_in = self._get_interval()
+		self._add_to_group(settler, Scheduler().cur_tick + run_in)
+
+	def remove_settler(self, settler):
+		"""Stops regular updates of settler."""
+		group = self._group_of_settler.pop(settler)
+		# empty groups are kept, they are dropped when their scheduler call is executed
+		group.settlers.remove(settler)
+
+	def get_remaining_ticks(self, settler):
+		"""Returns in how many ticks the next update of settler happens."""
+		return self._group_of_settler[settler].tick - Scheduler().cur_tick
+
+	def _get_interval(self):
+		return self.settlement.session.timer.get_ticks(GAME.INGAME_TICK_INTERVAL)
+
+	def _add_to_group(self, settler, tick):
+		group = self._last_group_of_tick.get(tick)
+		if group is None or Scheduler().get_last_call(tick) is not group.call:
+			group = _SettlerGroup(tick)
+			group.call = Scheduler().add_new_object(Callback(self._tick, group), self,
+			                                        run_in=tick - Scheduler().cur_tick)
+			self._last_group_of_tick[tick] = group
+		group.settlers.append(settler)
+		self._group_of_settler[settler] = group
+
+	def _tick(self, group):
+		"""Updates all settlers of group."""
+		if self._last_group_of_tick.get(group.tick) is group:
+			del self._last_group_of_tick[group.tick]
+		next_tick = group.tick + self._get_interval()
+		taxes = 0
+		for settler in group.settlers[:]: # settlers can be removed meanwhile
+			if self._group_of_settler.get(settler) is not group:
+				continue
+			taxes += settler.collect_tax()
+			settler.inhabitant_check()
+			settler.level_check()
+			# schedule the next update after this one, like a looping scheduler call would
+			del self._group_of_settler[settler]
+			self._add_to_group(settler, next_tick)
+
+		if group.settlers:
+			# the money comes from nowhere, settlers seem to have an infinite amount of money.
+			self.settlement.owner.get_component(StorageComponent).inventory.alter(RES.GOLD, taxes)
+
+	def end(self):
+		Scheduler().rem_all_classinst_calls(self)
+		self.settlement = None
+		self._last_group_of_tick = None
+		self._group_of_settler = None
+
+
+class _SettlerGroup(object):
+	"""Settlers that are updated by the same scheduler call."""
+	__slots__ = ('tick', 'settlers', 'call')
+
+	def __init__(self, tick):
+		self.tick = tick
+		self.settlers = []
+		self.call = None
@@ -34,6 +34,8 @@ from horizons.component.componentholder import ComponentHolder
 from horizons.component.tradepostcomponent import TradePostComponent
 from horizons.world.production.producer import Producer
 from horizons.world.resourcehandler import ResourceHandler
+from horizons.world.residentialprocessor import ResidentialProcessor
+from horizons.world.buildabilitycache import BuildabilityCache
 
 class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 	"""The Settlement class describes a settlement and stores all the necessary information
@@ -68,6 +70,8 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 		self.warehouse = None # this is set later in the same tick by the warehouse itself or load() here
 		self.upgrade_permissions = upgrade_permissions
 		self.tax_settings = tax_settings
+		self.residential_processor = ResidentialProcessor(self) # runs the monthly settler updates
+		self.buildability_cache = BuildabilityCache(self) # buildable tiles for the building tool
 
 	@classmethod
 	def make_default_upgrade_permissions(cls):
@@ -129,18 +133,18 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 	def save(self, db, islandid):
 		super(Settlement, self).save(db)
 
-		db("INSERT INTO settlement (rowid, island, owner) VALUES(?, ?, ?)",
+		db.add_row("INSERT INTO settlement (rowid, island, owner) VALUES(?, ?, ?)",
 			self.worldid, islandid, self.owner.worldid)
 		for res, amount in self.produced_res.iteritems():
-			db("INSERT INTO settlement_produced_res (settlement, res, amount) VALUES(?, ?, ?)", \
+			db.add_row("INSERT INTO settlement_produced_res (settlement, res, amount) VALUES(?, ?, ?)", \
 			   self.worldid, res, amount)
 		for level in xrange(TIER.CURRENT_MAX + 1):
-			db("INSERT INTO settlement_level_properties (settlement, level, upgrading_allowed, tax_setting) VALUES(?, ?, ?, ?)", \
+			db.add_row("INSERT INTO settlement_level_properties (settlement, level, upgrading_allowed, tax_setting) VALUES(?, ?, ?, ?)", \
 				self.worldid, level, self.upgrade_permissions[level], self.tax_settings[level])
 
 		# dump ground data via json, it's orders of magnitude faster than sqlite
 		data = json.dumps(self.ground_map.keys())
-		db("INSERT INTO settlement_tiles(rowid, data) VALUES(?, ?)", self.worldid, data)
+		db.add_row("INSERT INTO settlement_tiles(rowid, data) VALUES(?, ?)", self.worldid, data)
 
 	@classmethod
 	def load(cls, db, worldid, session, island):
@@ -244,10 +248,13 @@ class Settlement(ComponentHolder, WorldObject, ChangeListener, ResourceHandler):
 			self.produced_res[res] += amount
 
 	def end(self):
+		self.residential_processor.end()
+		self.residential_processor = None
 		self.session = None
 		self.owner = None
 		self.buildings = None
 		self.ground_map = None
 		self.produced_res = None
 		self.buildings_by_id = None
+		self.buildability_cache = None
 		self.warehouse = None
@@ -44,20 +44,31 @@ import copy
 from collections import defaultdict
 
 from horizons.util import ChangeListener
+from horizons.util.python.weakmethod import WeakMethod
 
 class GenericStorage(ChangeListener):
 	"""The GenericStorage represents a storage for buildings/units/players/etc. for storing
 	resources. The GenericStorage is the general form and is mostly used as baseclass to
 	derive storages with special function from it. Normally there should be no need to
 	use the GenericStorage. Rather use a specialized version that is suitable for the job.
+
+	Besides the normal change listeners, which are called on every change, resource change
+	listeners can be registered for a set of resources. They are only called when the amount
+	of one of these resources or the space for it might have changed.
 	"""
+
+	# whether resources share the available space, i.e. storing one res can change the free space for others
+	shared_space = False
+
 	def __init__(self):
 		super(GenericStorage, self).__init__()
 		self._storage = defaultdict(lambda : 0)
+		self.__resource_listeners = defaultdict(list) # res: [_ResourceChangeListener]
+		self.__all_resource_listeners = [] # in order of registration
 
 	def save(self, db, ownerid):
 		for slot in self._storage.iteritems():
-			db("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?) ",
+			db.add_row("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?) ",
 				ownerid, slot[0], slot[1])
 
 	def load(self, db, ownerid):
@@ -75,6 +86,7 @@ class GenericStorage(ChangeListener):
 		"""
 		self._storage[res] += amount # defaultdict
 		self._changed()
+		self._resource_changed(res)
 		return 0
 
 	def reset(self, res):
@@ -82,12 +94,49 @@ class GenericStorage(ChangeListener):
 		if res in self._storage:
 			self._storage[res] = 0
 			self._changed()
+			self._resource_changed(res)
 
 	def reset_all(self):
 		"""Removes every resource from this inventory"""
 		for res in self._storage:
 			self._storage[res] = 0
 		self._changed()
+		self._resource_changed(None)
+
+	def add_resource_change_listener(self, listener, resources):
+		"""Registers listener for changes concerning one of resources.
+		It is called as listener(res) after the amount of res or the space for res might have
+		changed. res is None if this might be the case for every resource.
+		@param listener: callable, referenced weakly like normal change listeners
+		@param resources: iterable of res ids"""
+		entry = _ResourceChangeListener(listener, resources)
+		for res in entry.resources:
+			self.__resource_listeners[res].append(entry)
+		self.__all_resource_listeners.append(entry)
+
+	def discard_resource_change_listener(self, listener):
+		"""Removes every registration of listener, if there is any"""
+		for entry in self.__all_resource_listeners[:]:
+			if entry.callback == listener:
+				entry.active = False
+				for res in entry.resources:
+					self.__resource_listeners[res].remove(entry)
+				self.__all_resource_listeners.remove(entry)
+
+	def _resource_changed(self, res):
+		"""Calls the resource change listeners interested in res (None: all of them)"""
+		if self.shared_space:
+			res = None
+		if res is None:
+			entries = self.__all_resource_listeners
+		elif res in self.__resource_listeners:
+			entries = self.__resource_listeners[res]
+		else:
+			return
+		# iterate over a copy, listeners may be added or removed by other listeners meanwhile
+		for entry in entries[:]:
+			if entry.active:
+				entry.callback(res)
 
 	def get_limit(self, res=None):
 		"""Returns the current limit of the storage. Please not that this value can have
@@ -134,6 +183,7 @@ class SpecializedStorage(GenericStorage):
 		"""Creates a slot for res. Does nothing if the slot exists."""
 		super(SpecializedStorage, self).alter(res, 0)
 		self._changed()
+		self._resource_changed(res)
 
 	def has_resource_slot(self, res):
 		return (res in self._storage)
@@ -190,7 +240,7 @@ class GlobalLimitStorage(GenericStorage):
 
 	def save(self, db, ownerid):
 		super(GlobalLimitStorage, self).save(db, ownerid)
-		db("INSERT INTO storage_global_limit(object, value) VALUES(?, ?)", ownerid, self.limit)
+		db.add_row("INSERT INTO storage_global_limit(object, value) VALUES(?, ?)", ownerid, self.limit)
 
 	def load(self, db, ownerid):
 		self.limit = db.get_storage_global_limit(ownerid)
@@ -209,6 +259,7 @@ class GlobalLimitStorage(GenericStorage):
 			if amount > self.limit:
 				self._storage[res] = self.limit
 		self._changed()
+		self._resource_changed(None)
 
 	def get_limit(self, res=None):
 		return self.limit
@@ -221,6 +272,8 @@ class TotalStorage(GlobalLimitStorage):
 
 	NOTE: Negative values will increase storage size, so consider using PositiveTotalStorage.
 	"""
+	shared_space = True
+
 	def __init__(self, limit):
 		super(TotalStorage, self).__init__(limit)
 
@@ -295,6 +348,8 @@ class PositiveSizedNumSlotStorage(PositiveSizedSlotStorage):
 	"""A storage consisting of a number of slots, all slots have the same size 'limit'
 	Used by ship (huker) for example. So with a limit of 50 and a slot num of 4 you could have a max of 50
 	from each resource and only slotnum resources."""
+	shared_space = True # emptying a slot makes space for other res
+
 	def __init__(self, limit, slotnum):
 		super(PositiveSizedNumSlotStorage, self).__init__(limit)
 		self.slotnum = slotnum
@@ -313,6 +368,17 @@ class PositiveSizedNumSlotStorage(PositiveSizedSlotStorage):
 		else:
 			return super(PositiveSizedNumSlotStorage, self).get_free_space_for(res)
 
+
+class _ResourceChangeListener(object):
+	"""Registration of a resource change listener at a GenericStorage"""
+	__slots__ = ('callback', 'resources', 'active')
+
+	def __init__(self, listener, resources):
+		assert callable(listener)
+		self.callback = WeakMethod(listener)
+		self.resources = frozenset(resources)
+		self.active = True # reset on removal, so pending notifications can be skipped
+
 ########################################################################
 class SettlementStorage:
 	"""Dummy class to signal the storagecomponent to use the settlements inventory"""
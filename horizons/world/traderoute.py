@@ -294,20 +294,20 @@ class TradeRoute(ChangeListener):
 	def save(self, db):
 		worldid = self.ship.worldid
 
-		db("INSERT INTO ship_route(ship_id, enabled, current_waypoint, wait_at_load, wait_at_unload) VALUES(?, ?, ?, ?, ?)",
+		db.add_row("INSERT INTO ship_route(ship_id, enabled, current_waypoint, wait_at_load, wait_at_unload) VALUES(?, ?, ?, ?, ?)",
 		   worldid, self.enabled, self.current_waypoint, self.wait_at_load, self.wait_at_unload)
 
 		if self.current_transfer:
 			for res, amount in self.current_transfer.iteritems():
-				db("INSERT INTO ship_route_current_transfer(ship_id, res, amount) VALUES(?, ?, ?)",
+				db.add_row("INSERT INTO ship_route_current_transfer(ship_id, res, amount) VALUES(?, ?, ?)",
 				   worldid, res, amount);
 
 		for entry in self.waypoints:
 			index = self.waypoints.index(entry)
-			db("INSERT INTO ship_route_waypoint(ship_id, warehouse_id, waypoint_index) VALUES(?, ?, ?)",
+			db.add_row("INSERT INTO ship_route_waypoint(ship_id, warehouse_id, waypoint_index) VALUES(?, ?, ?)",
 			   worldid, entry['warehouse'].worldid, index)
 			for res in entry['resource_list']:
-				db("INSERT INTO ship_route_resources(ship_id, waypoint_index, res, amount) VALUES(?, ?, ?, ?)",
+				db.add_row("INSERT INTO ship_route_resources(ship_id, waypoint_index, res, amount) VALUES(?, ?, ?, ?)",
 				   worldid, index, res, entry['resource_list'][res])
 
 	def get_ship_status(self):
@@ -140,7 +140,7 @@ class WildAnimal(CollectorAnimal, Collector):
 	def save(self, db):
 		super(WildAnimal, self).save(db)
 		# save members
-		db("INSERT INTO wildanimal(rowid, health, can_reproduce) VALUES(?, ?, ?)", \
+		db.add_row("INSERT INTO wildanimal(rowid, health, can_reproduce) VALUES(?, ?, ?)", \
 			 self.worldid, self.health, int(self.can_reproduce))
 		# set island as owner
 		db("UPDATE unit SET owner = ? WHERE rowid = ?", self.home_island.worldid, self.worldid)
@@ -286,6 +286,8 @@ class FarmAnimal(CollectorAnimal, BuildingCollector):
 	"""
 	job_ordering = JobList.order_by.random
 	grazingTime = 2
+	# our own inventory is our home inventory, it changes while we walk around
+	wait_for_job_notification = False
 
 	def __init__(self, home_building, start_hidden=False, **kwargs):
 		super(FarmAnimal, self).__init__(home_building = home_building, \
@@ -108,5 +108,5 @@ class Bullet(ComponentHolder, WorldObject):
 		Scheduler().add_new_object(self._move_tick, self, 1)
 
 	def save(self, db):
-		db("INSERT INTO bullet(worldid, startx, starty, destx, desty, speed, image) VALUES(?, ?, ?, ?, ?, ?, ?)", \
+		db.add_row("INSERT INTO bullet(worldid, startx, starty, destx, desty, speed, image) VALUES(?, ?, ?, ?, ?, ?, ?)", \
 			self.worldid, self.x, self.y, self.dest_x, self.dest_y, self.needed_ticks, self.image)
@@ -39,6 +39,8 @@ class AnimalCollector(BuildingCollector):
 	 - release animal
 	 """
 	kill_animal = False # whether we kill the animals
+	# animals don't notify when they become available
+	wait_for_job_notification = False
 
 	def __init__(self, *args, **kwargs):
 		super(AnimalCollector, self).__init__(*args, **kwargs)
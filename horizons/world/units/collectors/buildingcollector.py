@@ -20,9 +20,8 @@
 # ###################################################
 
 import weakref
-from collections import deque
 
-from horizons.util import WorldObject, RadiusRect, Callback, decorators
+from horizons.util import WorldObject, RadiusRect, Callback, decorators, StateHistory
 from horizons.util.pathfinding.pather import RoadPather, BuildingCollectorPather
 from horizons.constants import COLLECTORS, BUILDINGS
 from horizons.scheduler import Scheduler
@@ -44,12 +43,14 @@ class BuildingCollector(Collector):
 	"""
 	job_ordering = JobList.order_by.fewest_available_and_distance
 	pather_class = BuildingCollectorPather
+	# whether the collector skips job searches until it is notified that a job might be available
+	wait_for_job_notification = True
 
 	def __init__(self, home_building, **kwargs):
 		kwargs['x'] = home_building.position.origin.x
 		kwargs['y'] = home_building.position.origin.y
 		super(BuildingCollector, self).__init__(**kwargs)
-		self._job_history = deque()
+		self._job_history = StateHistory()
 		self._creation_tick = Scheduler().cur_tick + 1 # adjusted for the initial delay
 		self.__init(home_building)
 
@@ -57,6 +58,9 @@ class BuildingCollector(Collector):
 		self.home_building = home_building
 		if home_building is not None:
 			self.register_at_home_building()
+		# whether the last job search found nothing and nothing relevant changed since then
+		# (not saved, loaded collectors just search again)
+		self._waiting_for_job = False
 		# save whether it's possible for this instance to access a target
 		# @chachedmethod is not applicable since it stores hard refs in the arguments
 		self._target_possible_cache = weakref.WeakKeyDictionary()
@@ -68,14 +72,14 @@ class BuildingCollector(Collector):
 
 		# save home_building and creation tick
 		translated_creation_tick = self._creation_tick - current_tick + 1 #  pre-translate the tick number for the loading process
-		db("INSERT INTO building_collector(rowid, home_building, creation_tick) VALUES(?, ?, ?)", \
+		db.add_row("INSERT INTO building_collector(rowid, home_building, creation_tick) VALUES(?, ?, ?)", \
 			 self.worldid, self.home_building.worldid if self.home_building is not None else None, translated_creation_tick)
 
 		# save job history
 		for tick, utilisation in self._job_history:
 				# pre-translate the tick number for the loading process
 			translated_tick = tick - current_tick + Scheduler.FIRST_TICK_ID
-			db("INSERT INTO building_collector_job_history(collector, tick, utilisation) VALUES(?, ?, ?)", \
+			db.add_row("INSERT INTO building_collector_job_history(collector, tick, utilisation) VALUES(?, ?, ?)", \
 				 self.worldid, translated_tick, utilisation)
 
 	def load(self, db, worldid):
@@ -97,7 +101,7 @@ class BuildingCollector(Collector):
 		# load job search failures
 		# the tick values were translated to assume that it is currently tick -1
 		assert Scheduler().cur_tick == Scheduler.FIRST_TICK_ID - 1
-		self._job_history = db.get_building_collector_job_history(worldid)
+		self._job_history = StateHistory(db.get_building_collector_job_history(worldid))
 
 	def register_at_home_building(self, unregister = False):
 		"""Creates reference for self at home building (only hard reference except for
@@ -120,6 +124,8 @@ class BuildingCollector(Collector):
 			self.show()
 
 	def remove(self):
+		self.notify_job_available() # unregister from notifications
+		self._notify_colleague_collectors()
 		self.register_at_home_building(unregister=True)
 		self.home_building = None
 		super(BuildingCollector, self).remove()
@@ -128,6 +134,7 @@ class BuildingCollector(Collector):
 		"""Makes collector survive deletion of home building."""
 		self.cancel(continue_action=lambda : 42) # don't continue
 		self.stop()
+		self.notify_job_available() # unregister from notifications
 		self.register_at_home_building(unregister=True)
 		self.home_building = None
 		self.state = self.states.decommissioned
@@ -140,6 +147,11 @@ class BuildingCollector(Collector):
 		colls = self.home_building.get_component(CollectingComponent).get_local_collectors()
 		return ( coll for coll in colls if coll is not self )
 
+	def get_job_reservation_ledger(self):
+		if self.home_building is None:
+			return None
+		return self.home_building.get_component(CollectingComponent)
+
 	@decorators.make_constants()
 	def get_job(self):
 		"""Returns the next job or None"""
@@ -148,6 +160,7 @@ class BuildingCollector(Collector):
 
 		collectable_res = self.get_collectable_res()
 		if len(collectable_res) == 0:
+			self._wait_for_job_notification(collectable_res)
 			return None
 
 		jobs = JobList(self, self.job_ordering)
@@ -167,6 +180,11 @@ class BuildingCollector(Collector):
 				if reslist: # we can do something here
 					jobs.append( Job(building, reslist) )
 
+		if not jobs:
+			# this can only change if a provider gets resources, see _wait_for_job_notification
+			self._wait_for_job_notification(collectable_res)
+			return None
+
 		# TODO: find out why order of  self.get_buildings_in_range(..) and therefor order of jobs differs from client to client
 		# TODO: find out why WindAnimal.get_job(..) doesn't have this problem
 		# for MP-Games the jobs must have the same ordering to ensure get_best_possible_job(..) returns the same result
@@ -176,19 +194,56 @@ class BuildingCollector(Collector):
 
 	def search_job(self):
 		self._clean_job_history_log()
-		super(BuildingCollector, self).search_job()
+		if self._waiting_for_job:
+			# the last search found nothing and nothing has changed since then
+			self.handle_no_possible_job()
+		else:
+			super(BuildingCollector, self).search_job()
+
+	def get_job_provider_handler(self):
+		"""Returns the ProviderHandler of the area get_buildings_in_range searches in."""
+		return self.home_building.island.provider_buildings
+
+	def _wait_for_job_notification(self, resources):
+		"""Makes search_job skip the actual search until notify_job_available is called.
+		This happens when a provider in our area gets one of resources, when our home
+		building or its inventory change or when a colleague's job changes, since the result
+		of get_job only depends on those.
+		@param resources: resources we could collect now"""
+		if not self.wait_for_job_notification or self._waiting_for_job:
+			return
+		self._waiting_for_job = True
+		self.get_job_provider_handler().add_waiting_collector(self, resources)
+		self.home_building.add_change_listener(self.notify_job_available)
+		self.get_home_inventory().add_change_listener(self.notify_job_available)
+
+	def notify_job_available(self):
+		"""Called when there might be a job for us. The next search_job will search again."""
+		if not self._waiting_for_job:
+			return
+		self._waiting_for_job = False
+		self.get_job_provider_handler().remove_waiting_collector(self)
+		# the listeners might already be gone if the home building is being removed
+		self.home_building.discard_change_listener(self.notify_job_available)
+		self.get_home_inventory().discard_change_listener(self.notify_job_available)
+
+	def _notify_colleague_collectors(self):
+		"""Our job changed, which frees reserved space in the home inventory."""
+		if self.home_building is None or not self.home_building.has_component(CollectingComponent):
+			return # e.g. farm animals, their pasture doesn't have collectors
+		for collector in self.get_colleague_collectors():
+			collector.notify_job_available()
 
 	def _clean_job_history_log(self):
 		""" remove too old entries """
 		first_relevant_tick = Scheduler().cur_tick - self.get_utilisation_history_length()
-		while len(self._job_history) > 1 and self._job_history[1][0] < first_relevant_tick:
-			self._job_history.popleft()
+		self._job_history.discard_before(first_relevant_tick)
 
 	def handle_no_possible_job(self):
 		super(BuildingCollector, self).handle_no_possible_job()
 		# only append a new element if it is different from the last one
 		if not self._job_history or abs(self._job_history[-1][1]) > 1e-9:
-			self._job_history.append((Scheduler().cur_tick, 0))
+			self._job_history.append(Scheduler().cur_tick, 0)
 
 	def begin_current_job(self, job_location = None):
 		super(BuildingCollector, self).begin_current_job(job_location)
@@ -199,7 +254,7 @@ class BuildingCollector(Collector):
 		utilisation = self.job.amount / float(max_amount)
 		# only append a new element if it is different from the last one
 		if not self._job_history or abs(self._job_history[-1][1] - utilisation) > 1e-9:
-			self._job_history.append((Scheduler().cur_tick, utilisation))
+			self._job_history.append(Scheduler().cur_tick, utilisation)
 		"""
 
 	def finish_working(self, collector_already_home=False):
@@ -209,6 +264,7 @@ class BuildingCollector(Collector):
 		if not collector_already_home:
 			self.move_home(callback=self.reached_home)
 		super(BuildingCollector, self).finish_working()
+		self._notify_colleague_collectors()
 
 	# unused reroute code removed in 2aef7bba77536da333360566467d9a2f08d38cab
 
@@ -219,6 +275,10 @@ class BuildingCollector(Collector):
 			self.transfer_res_to_home(entry.res, entry.amount)
 		self.end_job()
 
+	def end_job(self):
+		super(BuildingCollector, self).end_job()
+		self._notify_colleague_collectors()
+
 	def get_collectable_res(self):
 		"""Return all resources the collector can collect (depends on its home building)"""
 		# find needed res (only res that we have free room for) - Building function
@@ -267,6 +327,7 @@ class BuildingCollector(Collector):
 		if continue_action is None:
 			continue_action = Callback(self.move_home, callback=self.end_job, action='move')
 		super(BuildingCollector, self).cancel(continue_action=continue_action)
+		self._notify_colleague_collectors()
 
 	def get_utilisation_history_length(self):
 		return min(COLLECTORS.STATISTICAL_WINDOW, Scheduler().cur_tick - self._creation_tick)
@@ -286,19 +347,8 @@ class BuildingCollector(Collector):
 		first_relevant_tick = current_tick - history_length
 
 		self._clean_job_history_log()
-		num_entries = len(self._job_history)
-		total_utilisation = 0
-		for i in xrange(num_entries):
-			tick = self._job_history[i][0]
-			if tick >= current_tick:
-				break
-
-			next_tick = min(self._job_history[i + 1][0], current_tick) if i + 1 < num_entries else current_tick
-			relevant_ticks = next_tick - tick
-			if tick < first_relevant_tick:
-				# the beginning is not relevant
-				relevant_ticks -= first_relevant_tick - tick
-			total_utilisation += relevant_ticks * self._job_history[i][1]
+		durations = self._job_history.get_durations(first_relevant_tick, current_tick)
+		total_utilisation = sum(utilisation * ticks for utilisation, ticks in durations.iteritems())
 
 		#assert -1e-7 < total_utilisation / float(history_length) < 1 + 1e-7
 		return total_utilisation / float(history_length)
@@ -351,8 +401,14 @@ class FisherShipCollector(BuildingCollector):
 		reach = RadiusRect(self.home_building.position, self.home_building.radius)
 		return self.session.world.get_providers_in_range(reach, reslist=reslist)
 
+	def get_job_provider_handler(self):
+		return self.session.world.provider_buildings
+
 class DisasterRecoveryCollector(StorageCollector):
 	"""Collects disasters such as fire or pestilence."""
+	# jobs depend on the disaster state, which doesn't notify us
+	wait_for_job_notification = False
+
 	def finish_working(self, collector_already_home=False):
 		super(DisasterRecoveryCollector, self).finish_working(collector_already_home=collector_already_home)
 		building = self.job.object
@@ -93,6 +93,8 @@ class Collector(Unit):
 			self.hide()
 
 		self.job = None # here we store the current job as Job object
+		# (ledger, reslist) of the job as registered at the reservation ledger
+		self.__reservation = None
 
 		# list of class ids of buildings, where we may pick stuff up
 		# empty means pick up from everywhere
@@ -114,6 +116,7 @@ class Collector(Unit):
 			self.job.object.remove_incoming_collector(self)
 		self.hide()
 		self.job = None
+		self._update_job_reservation()
 		super(Collector, self).remove()
 
 
@@ -136,7 +139,7 @@ class Collector(Unit):
 			        (current_callback, [ str(i) for i in Scheduler().get_classinst_calls(self).keys() ])
 			remaining_ticks = max(calls.values()[0], 1) # save a number > 0
 
-		db("INSERT INTO collector(rowid, state, remaining_ticks, start_hidden) VALUES(?, ?, ?, ?)", \
+		db.add_row("INSERT INTO collector(rowid, state, remaining_ticks, start_hidden) VALUES(?, ?, ?, ?)", \
 		   self.worldid, self.state.index, remaining_ticks, self.start_hidden)
 
 		# save the job
@@ -145,7 +148,7 @@ class Collector(Unit):
 			# this is not in 3rd normal form since the object is saved multiple times but
 			# it preserves compatiblity with old savegames this way.
 			for entry in self.job.reslist:
-				db("INSERT INTO collector_job(collector, object, resource, amount) VALUES(?, ?, ?, ?)", \
+				db.add_row("INSERT INTO collector_job(collector, object, resource, amount) VALUES(?, ?, ?, ?)", \
 				   self.worldid, obj_id, entry.res, entry.amount)
 
 	def load(self, db, worldid):
@@ -166,6 +169,7 @@ class Collector(Unit):
 			# create job with worldid of object as object. This is used to defer the target resolution,
 			# which might not have been loaded
 			self.job = Job(obj, reslist)
+			self._update_job_reservation()
 
 		def fix_job_object():
 			# resolve worldid to object later
@@ -218,6 +222,21 @@ class Collector(Unit):
 		"""Returns a list of collectors, that work for the same "inventory"."""
 		return []
 
+	def get_job_reservation_ledger(self):
+		"""Returns the CollectingComponent where the jobs of us and our colleagues are
+		registered (see get_colleague_reserved_amount), or None if we don't have colleagues."""
+		return None
+
+	def get_colleague_reserved_amount(self, res):
+		"""Returns how much of res our colleagues are about to bring to the home inventory."""
+		ledger = self.get_job_reservation_ledger()
+		if ledger is None:
+			return 0
+		amount = ledger.get_reserved_amount(res)
+		if self.__reservation is not None: # don't count our own job
+			amount -= sum(entry.amount for entry in self.__reservation[1] if entry.res == res)
+		return amount
+
 	def get_collectable_res(self):
 		"""Return all resources the collector can collect"""
 		raise NotImplementedError
@@ -232,6 +251,7 @@ class Collector(Unit):
 		"""Search for a job, only called if the collector does not have a job.
 		If no job is found, a new search will be scheduled in a few ticks."""
 		self.job = self.get_job()
+		self._update_job_reservation()
 		if self.job is None:
 			self.handle_no_possible_job()
 		else:
@@ -279,12 +299,7 @@ class Collector(Unit):
 
 		# check if other collectors get this resource, because our inventory could
 		# get full if they arrive.
-		total_registered_amount_consumer = sum(
-		  entry.amount for
-		  collector in self.get_colleague_collectors() if
-		  collector.job is not None for
-		  entry in collector.job.reslist if
-		  entry.res == res )
+		total_registered_amount_consumer = self.get_colleague_reserved_amount(res)
 
 		inventory = self.get_home_inventory()
 
@@ -378,6 +393,7 @@ class Collector(Unit):
 		reslist = [i for i in reslist if i]
 		if reslist:
 			self.job.reslist = reslist
+			self._update_job_reservation()
 
 		# transfer res (this must be the last step, it will trigger consecutive actions through the
 		# target inventory changelistener, and the collector must be in a consistent state then.
@@ -400,6 +416,7 @@ class Collector(Unit):
 			assert remnant == 0, "%s couldn't take all of res %s; remnant: %s; planned: %s" % \
 				     (self, entry.res, remnant, entry.amount)
 		self.job.reslist = new_reslist
+		self._update_job_reservation()
 
 	def transfer_res_to_home(self, res, amount):
 		"""Transfer resources from collector to the home inventory"""
@@ -412,6 +429,20 @@ class Collector(Unit):
 
 	# unused reroute code removed in 2aef7bba77536da333360566467d9a2f08d38cab
 
+	def _update_job_reservation(self):
+		"""Registers the current job at the reservation ledger.
+		Must be called whenever self.job or its reslist changes."""
+		if self.__reservation is not None:
+			ledger, reslist = self.__reservation
+			ledger.remove_job_reservation(reslist)
+			self.__reservation = None
+		if self.job is not None:
+			ledger = self.get_job_reservation_ledger()
+			if ledger is not None:
+				reslist = tuple(self.job.reslist)
+				ledger.add_job_reservation(reslist)
+				self.__reservation = (ledger, reslist)
+
 	def end_job(self):
 		"""Contrary to setup_new_job"""
 		# the job now is finished now
@@ -420,6 +451,7 @@ class Collector(Unit):
 		if self.start_hidden:
 			self.hide()
 		self.job = None
+		self._update_job_reservation()
 		Scheduler().add_new_object(self.search_job , self, COLLECTORS.DEFAULT_WAIT_TICKS)
 		self.state = self.states.idle
 
@@ -443,6 +475,7 @@ class Collector(Unit):
 				removed_calls = Scheduler().rem_call(self, self.finish_working)
 				assert removed_calls == 1, 'removed %s calls instead of one' % removed_calls
 			self.job = None
+			self._update_job_reservation()
 			self.state = self.states.idle
 		# NOTE:
 		# Some blocked movement callbacks use this callback. All blocked movement callbacks have to
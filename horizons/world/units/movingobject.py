@@ -79,6 +79,7 @@ class MovingObject(ComponentHolder, ConcreteObject):
 
 		self._exact_model_coords = fife.ExactModelCoordinate() # save instance since construction is expensive (no other purpose)
 		self._fife_location = None
+		self._instance_culled = False # whether the fife instance isn't updated since the unit isn't visible
 
 	def check_move(self, destination):
 		"""Tries to find a path to destination
@@ -168,10 +169,11 @@ class MovingObject(ComponentHolder, ConcreteObject):
 			#self.log.debug("%s move tick from %s to %s", self, self.last_position, self._next_target)
 			self.last_position = self.position
 			self.position = self._next_target
-			self._exact_model_coords.set(self.position.x, self.position.y, 0)
-			self._fife_location.setExactLayerCoordinates(self._exact_model_coords)
-			# it's safe to use location here (thisown is 0, set by swig, and setLocation uses reference)
-			self._instance.setLocation(self._fife_location)
+			if not self._update_culling():
+				self._exact_model_coords.set(self.position.x, self.position.y, 0)
+				self._fife_location.setExactLayerCoordinates(self._exact_model_coords)
+				# it's safe to use location here (thisown is 0, set by swig, and setLocation uses reference)
+				self._instance.setLocation(self._fife_location)
 			self._changed()
 
 		# try to get next step, handle a blocked path
@@ -222,7 +224,23 @@ class MovingObject(ComponentHolder, ConcreteObject):
 
 		# WORK IN PROGRESS
 		move_time = self.get_unit_velocity()
+		if not self._instance_culled:
+			self._move_instance(move_time)
 
+		diagonal = self._next_target.x != self.position.x and self._next_target.y != self.position.y
+		#self.log.debug("%s registering move tick in %s ticks", self, move_time[int(diagonal)])
+		Scheduler().add_new_object(self._move_tick, self, move_time[int(diagonal)])
+
+		# check if a conditional callback becomes true
+		for cond in self._conditional_callbacks.keys(): # iterate of copy of keys to be able to delete
+			if cond():
+				# start callback when this function is done
+				Scheduler().add_new_object(self._conditional_callbacks[cond], self)
+				del self._conditional_callbacks[cond]
+
+	def _move_instance(self, move_time):
+		"""Starts the movement of the fife instance to the next target.
+		@param move_time: get_unit_velocity() output"""
 		#location = fife.Location(self._instance.getLocation().getLayer())
 		self._exact_model_coords.set(self._next_target.x, self._next_target.y, 0)
 		self._fife_location.setExactLayerCoordinates(self._exact_model_coords)
@@ -234,16 +252,33 @@ class MovingObject(ComponentHolder, ConcreteObject):
 												float(self.session.timer.get_ticks(1)) / move_time[0])
 		# coords per sec
 
-		diagonal = self._next_target.x != self.position.x and self._next_target.y != self.position.y
-		#self.log.debug("%s registering move tick in %s ticks", self, move_time[int(diagonal)])
-		Scheduler().add_new_object(self._move_tick, self, move_time[int(diagonal)])
-
-		# check if a conditional callback becomes true
-		for cond in self._conditional_callbacks.keys(): # iterate of copy of keys to be able to delete
-			if cond():
-				# start callback when this function is done
-				Scheduler().add_new_object(self._conditional_callbacks[cond], self)
-				del self._conditional_callbacks[cond]
+	def _update_culling(self):
+		"""Checks whether the unit is visible at its new position. Units that aren't
+		only update their logical position, the view syncs their fife instance when
+		it moves to them (see View.is_visible).
+		@return: whether the fife instance is culled"""
+		visible = self.session.view.is_visible(self.position)
+		if visible and self._instance_culled:
+			self._instance_culled = False
+			self.session.view.remove_culled_object(self)
+		elif not visible and not self._instance_culled:
+			self._instance_culled = True
+			self.session.view.add_culled_object(self)
+		return self._instance_culled
+
+	def sync_instance(self):
+		"""Moves the culled fife instance to the position of the unit, called by the view
+		when the unit becomes visible."""
+		self._instance_culled = False
+		if self._instance is None:
+			return # removed in the meantime
+		self._exact_model_coords.set(self.position.x, self.position.y, 0)
+		self._fife_location.setExactLayerCoordinates(self._exact_model_coords)
+		self._instance.setLocation(self._fife_location)
+		if self.is_moving() and self._next_target is not None and self._next_target != self.position:
+			self._move_instance(self.get_unit_velocity())
+		else:
+			self.act(self._action, self._instance.getFacingLocation(), True)
 
 	def teleport(self, destination, callback = None, destination_in_building = False):
 		"""Like move, but nearly instantaneous"""
@@ -163,7 +163,7 @@ class Unit(MovingObject, ResourceTransferHandler):
 		super(Unit, self).save(db)
 
 		owner_id = 0 if self.owner is None else self.owner.worldid
-		db("INSERT INTO unit (rowid, type, x, y, owner) VALUES(?, ?, ?, ?, ?)",
+		db.add_row("INSERT INTO unit (rowid, type, x, y, owner) VALUES(?, ?, ?, ?, ?)",
 			self.worldid, self.__class__.id, self.position.x, self.position.y, \
 					owner_id)
 
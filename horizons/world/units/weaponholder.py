@@ -403,11 +403,11 @@ class WeaponHolder(object):
 			if self.session.db.get_weapon_stackable(weapon.weapon_id):
 				number = weapon.number_of_weapons
 
-			db("INSERT INTO weapon_storage(owner_id, weapon_id, number, remaining_ticks) VALUES(?, ?, ?, ?)",
+			db.add_row("INSERT INTO weapon_storage(owner_id, weapon_id, number, remaining_ticks) VALUES(?, ?, ?, ?)",
 				self.worldid, weapon.weapon_id, number, ticks)
 		# save target
 		if self._target:
-			db("INSERT INTO target(worldid, target_id) VALUES(?, ?)", self.worldid, self._target.worldid)
+			db.add_row("INSERT INTO target(worldid, target_id) VALUES(?, ?)", self.worldid, self._target.worldid)
 
 	def load_target(self, db):
 		"""
@@ -570,7 +570,7 @@ class MovingWeaponHolder(WeaponHolder):
 
 	def save(self, db):
 		super(MovingWeaponHolder, self).save(db)
-		db("INSERT INTO stance(worldid, stance, state) VALUES(?, ?, ?)",
+		db.add_row("INSERT INTO stance(worldid, stance, state) VALUES(?, ?, ?)",
 			self.worldid, self.stance.NAME, self.get_component(self.stance).get_state())
 
 	def load (self, db, worldid):
@@ -42,6 +42,7 @@ import locale
 import logging
 import logging.config
 import logging.handlers
+import multiprocessing
 import optparse
 import signal
 import traceback
@@ -163,6 +164,8 @@ def get_option_parser():
 				               default=False, help="Enable profiling (for developing only).")
 	dev_group.add_option("--max-ticks", dest="max_ticks", metavar="<max_ticks>", type="int", \
 				               help="Run the game for <max_ticks> ticks.")
+	dev_group.add_option("--load-phases-json", dest="load_phases_json", metavar="<filename>", \
+				               help="Write how long the phases of loading a game took to <filename> (json).")
 	dev_group.add_option("--string-previewer", dest="stringpreview", action="store_true", \
 				               default=False, help="Enable the string previewer tool for scenario writers")
 	dev_group.add_option("--no-preload", dest="nopreload", action="store_true", \
@@ -223,6 +226,9 @@ def exithandler(exitcode, signum, frame):
 	sys.exit(exitcode)
 
 def main():
+	# frozen windows builds would start the game again in every worker process of YamlCache.load_files
+	multiprocessing.freeze_support()
+
 	# abort silently on signal
 	signal.signal(signal.SIGINT, functools.partial(exithandler, 130))
 	signal.signal(signal.SIGTERM, functools.partial(exithandler, 1))
@@ -36,7 +36,9 @@ from horizons.extscheduler import ExtScheduler
 from horizons.scheduler import Scheduler
 from horizons.spsession import SPSession
 from horizons.util import Color, DbReader, SavegameAccessor, DifficultySettings, WorldObject
+from horizons.util.savegamesnapshot import SavegameSnapshot
 from horizons.component.storagecomponent import StorageComponent
+from horizons.component.collectingcomponent import CollectingComponent
 
 from tests import RANDOM_SEED
 from tests.utils import Timer
@@ -54,12 +56,14 @@ def setup_package():
 	"""
 	global db
 	db = horizons.main._create_main_db()
+	# verify that the collector reservation ledgers are always up to date
+	CollectingComponent.check_reservations = True
 
 
 @contextlib.contextmanager
 def _dbreader_convert_dummy_objects():
 	"""
-	Wrapper around DbReader.__call__ to convert Dummy objects to valid values.
+	Wrapper around DbReader.__call__/add_row (and the SavegameSnapshot ones) to convert Dummy objects to valid values.
 
 	This is needed because some classes attempt to store Dummy objects in the
 	database, e.g. ConcreteObject with self._instance.getActionRuntime().
@@ -78,10 +82,13 @@ def _dbreader_convert_dummy_objects():
 			return func(self, command, *args)
 		return wrapper
 
-	original = DbReader.__call__
-	DbReader.__call__ = deco(DbReader.__call__)
+	originals = [(cls, name, getattr(cls, name)) for cls in (DbReader, SavegameSnapshot)
+	             for name in ('__call__', 'add_row')]
+	for cls, name, func in originals:
+		setattr(cls, name, deco(func))
 	yield
-	DbReader.__call__ = original
+	for cls, name, func in originals:
+		setattr(cls, name, func)
 
 
 class SPTestSession(SPSession):
@@ -104,6 +111,12 @@ class SPTestSession(SPSession):
 			with _dbreader_convert_dummy_objects():
 				return super(SPTestSession, self).save(*args, **kwargs)
 
+	def _do_save_in_background(self, *args, **kwargs):
+		"""Same fixes as for save, they are only needed while the state is captured"""
+		with mock.patch('horizons.session.SavegameManager'):
+			with _dbreader_convert_dummy_objects():
+				return super(SPTestSession, self)._do_save_in_background(*args, **kwargs)
+
 	def load(self, savegame, players):
 		# keep a reference on the savegame, so we can cleanup in `end`
 		self.savegame = savegame
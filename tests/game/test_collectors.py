@@ -0,0 +1,57 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.command.building import Build
+from horizons.component.collectingcomponent import CollectingComponent
+from horizons.component.storagecomponent import StorageComponent
+from horizons.constants import BUILDINGS, RES
+from horizons.world.production.producer import Producer
+
+from tests.game import game_test, settle
+
+
+@game_test
+def test_collector_waits_for_job_notification(s, p):
+	"""
+	A collector that doesn't find a job stops searching until a provider has something for it.
+	"""
+	settlement, island = settle(s)
+
+	lj = Build(BUILDINGS.LUMBERJACK, 30, 30, island, settlement=settlement)(p)
+	assert lj
+	collector = lj.get_component(CollectingComponent).get_local_collectors()[0]
+
+	s.run(seconds=5)
+	assert collector._waiting_for_job
+	assert collector.job is None
+
+	# a growing tree doesn't provide anything yet
+	tree = Build(BUILDINGS.TREE, 32, 32, island, settlement=settlement)(p)
+	assert tree
+	assert collector._waiting_for_job
+
+	tree.get_component(Producer).finish_production_now()
+	assert tree.get_component(StorageComponent).inventory[RES.TREES]
+	assert not collector._waiting_for_job
+
+	s.run(seconds=5)
+	assert collector.job is not None
+	assert collector.job.object is tree
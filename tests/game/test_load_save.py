@@ -23,16 +23,19 @@ import os
 import bz2
 import tempfile
 
+import mock
+
 from horizons.command.building import Build
 from horizons.command.production import ToggleActive
 from horizons.command.unit import CreateUnit
-from horizons.constants import BUILDINGS, PRODUCTION, UNITS, RES, GAME
-from horizons.util import WorldObject, Point
+from horizons.constants import BUILDINGS, PRODUCTION, UNITS, RES, GAME, GAME_SPEED
+from horizons.util import WorldObject, Point, DbReader
 from horizons.world.production.producer import Producer
 from horizons.component.collectingcomponent import CollectingComponent
 from horizons.component.storagecomponent import StorageComponent
 from horizons.world.units.collectors import Collector
 from horizons.scheduler import Scheduler
+from horizons.util.loadphases import LoadPhases
 
 from tests.game import game_test, new_session, settle, load_session, TEST_FIXTURES_DIR
 
@@ -235,6 +238,33 @@ def test_savegame_upgrade():
 	session.run(seconds=30)
 
 
+@game_test(manual_session=True)
+def test_load_phases():
+	"""Loading records its phases, also when it fails"""
+	session, player = new_session()
+	settlement, island = settle(session)
+	Build(BUILDINGS.LUMBERJACK, 30, 30, island, settlement=settlement)(player)
+	session = saveload(session)
+
+	phases = session.load_phases.phases
+	assert phases[('world', 'map', 'islands')]['counts']['islands'] == len(session.world.islands)
+	assert any(path[-1] == '_load_building' for path in phases)
+	assert LoadPhases.stop() is None
+	session.end(keep_map=True)
+
+	fd, filename = tempfile.mkstemp()
+	os.close(fd)
+	open(filename, 'w').write('no savegame')
+	try:
+		load_session(filename)
+	except Exception:
+		pass
+	else:
+		assert False, 'loading a broken savegame must fail'
+	os.unlink(filename)
+	assert LoadPhases.stop() is None
+
+
 @game_test
 def test_settler_level_save_load(s, p):
 	"""
@@ -273,3 +303,133 @@ def test_settler_level_save_load(s, p):
 
 		# should have leveled up
 		assert settler.level == level + 1
+
+
+@game_test(manual_session=True)
+def test_action_runtime_save_load():
+	"""
+	The runtime of an action that isn't displayed (off screen) must survive save/load
+	"""
+	session, player = new_session()
+	settlement, island = settle(session)
+
+	tree = Build(BUILDINGS.TREE, 30, 30, island, settlement=settlement)(player)
+	worldid = tree.worldid
+	session.run(seconds=5)
+
+	def get_action_runtime(session):
+		fd, filename = tempfile.mkstemp()
+		os.close(fd)
+		assert session.save(savegamename=filename)
+		db = DbReader(filename)
+		runtime = db("SELECT action_runtime FROM concrete_object WHERE id = ?", worldid)[0][0]
+		db.close()
+		return filename, runtime
+
+	filename, runtime = get_action_runtime(session)
+	assert runtime > 4000 # runs since the tree was built
+	session.end(keep_map=True)
+
+	session = load_session(filename)
+	Scheduler().before_ticking() # late init finish (not ticking already)
+	tree = WorldObject.get_object_by_id(worldid)
+	assert tree._deferred_action is not None # the session has no real view, nothing is visible
+	session.run(ticks=1)
+	filename, loaded_runtime = get_action_runtime(session)
+	# at most the ticks since loading have been added
+	assert runtime <= loaded_runtime <= runtime + 2 * 1000 // GAME_SPEED.TICKS_PER_SECOND
+	session.end()
+
+
+def _get_savegame_contents(filename):
+	"""Returns {table: sorted rows} of a savegame"""
+	db = DbReader(filename)
+	contents = {}
+	for (table, ) in db("SELECT name FROM sqlite_master WHERE type = 'table'"):
+		contents[table] = sorted(db("SELECT rowid, * FROM %s" % table))
+	db.close()
+	return contents
+
+@game_test(manual_session=True)
+def test_background_save():
+	"""A savegame written in the background equals a normal one and can be loaded"""
+	session, player = new_session()
+	settlement, island = settle(session)
+	Build(BUILDINGS.LUMBERJACK, 30, 30, island, settlement=settlement)(player)
+	Build(BUILDINGS.RESIDENTIAL, 25, 22, island, settlement=settlement)(player)
+	session.run(seconds=10)
+
+	fd, filename = tempfile.mkstemp()
+	os.close(fd)
+	assert session.save(savegamename=filename)
+
+	background_filename = filename + '_background'
+	callback = mock.Mock()
+	assert session._do_save_in_background(background_filename, callback)
+	# only one savegame is written at a time, the next one waits
+	callback_2 = mock.Mock()
+	assert session._do_save_in_background(background_filename + '_2', callback_2)
+	writer = session._background_saves[0][0]
+	writer.join()
+	session._check_background_save()
+	callback.assert_called_once_with(None)
+	assert not callback_2.called
+	assert not os.path.exists(background_filename + '.part')
+
+	writer = session._background_saves[0][0]
+	writer.join()
+	session._check_background_save()
+	callback_2.assert_called_once_with(None)
+	assert not session._background_saves
+	os.unlink(background_filename + '_2')
+
+	assert _get_savegame_contents(filename) == _get_savegame_contents(background_filename)
+	os.unlink(filename)
+
+	session.end(keep_map=True)
+	session = load_session(background_filename)
+	session.run(seconds=10)
+	session.end()
+
+@game_test(manual_session=True)
+def test_background_save_error():
+	"""A quicksave that can't be written shows why instead of the generic error"""
+	session, player = new_session()
+	directory = tempfile.mkdtemp()
+	filename = os.path.join(directory, 'missing', 'savegame')
+
+	with mock.patch('horizons.spsession.SavegameManager.create_quicksave_filename', return_value=filename):
+		with mock.patch.object(session, 'gui') as gui:
+			session.quicksave()
+			writer = session._background_saves[0][0]
+			writer.join()
+			session._check_background_save()
+	assert writer.exception is not None
+	assert gui.show_error_popup.call_count == 1
+	assert gui.show_error_popup.call_args[0][0] == _("Failed to create savegame file")
+	assert not session._background_saves
+
+	os.rmdir(directory)
+	session.end()
+
+@game_test(manual_session=True)
+def test_buffered_save():
+	"""Buffering the rows of a savegame doesn't change its contents"""
+	session, player = new_session()
+	settlement, island = settle(session)
+	Build(BUILDINGS.LUMBERJACK, 30, 30, island, settlement=settlement)(player)
+	Build(BUILDINGS.RESIDENTIAL, 25, 22, island, settlement=settlement)(player)
+	session.run(seconds=10)
+
+	fd, filename = tempfile.mkstemp()
+	os.close(fd)
+	assert session.save(savegamename=filename)
+
+	unbuffered_filename = filename + '_unbuffered'
+	with mock.patch.object(DbReader, 'add_row', DbReader.__call__):
+		assert session.save(savegamename=unbuffered_filename)
+
+	assert _get_savegame_contents(filename) == _get_savegame_contents(unbuffered_filename)
+	os.unlink(filename)
+	os.unlink(unbuffered_filename)
+	session.end()
@@ -0,0 +1,66 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+from horizons.command.building import Build, Tear
+from horizons.constants import BUILDINGS, RES, GAME
+from horizons.component.storagecomponent import StorageComponent
+from horizons.scheduler import Scheduler
+
+from tests.game import game_test, settle
+
+
+@game_test
+def test_settlers_pay_taxes(s, p):
+	"""Settlers are updated by the residential processor, which transfers their taxes"""
+	settlement, island = settle(s)
+	processor = settlement.residential_processor
+
+	settlers = [Build(BUILDINGS.RESIDENTIAL, x, 22, island, settlement=settlement)(p) for x in (22, 24, 26)]
+	assert all(settlers)
+	interval = Scheduler().get_ticks_of_month()
+	for settler in settlers:
+		assert processor.get_remaining_ticks(settler) == interval
+
+	gold = p.get_component(StorageComponent).inventory
+	gold_before = gold[RES.GOLD]
+	s.run(ticks=interval)
+
+	taxes = sum(settler.last_tax_payed for settler in settlers)
+	assert taxes > 0
+	assert gold[RES.GOLD] - gold_before == taxes
+	for settler in settlers:
+		assert processor.get_remaining_ticks(settler) == interval
+
+
+@game_test
+def test_settler_removed_from_processor(s, p):
+	"""A torn down settler is not updated any more"""
+	settlement, island = settle(s)
+	processor = settlement.residential_processor
+
+	settler = Build(BUILDINGS.RESIDENTIAL, 22, 22, island, settlement=settlement)(p)
+	other = Build(BUILDINGS.RESIDENTIAL, 24, 22, island, settlement=settlement)(p)
+	Tear(settler)(p)
+
+	s.run(seconds=GAME.INGAME_TICK_INTERVAL)
+
+	assert other.last_tax_payed > 0
+	assert processor.get_remaining_ticks(other) > 0
@@ -0,0 +1,53 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import unittest
+from xml.etree import cElementTree as ElementTree
+
+import mock
+
+from horizons.i18n import guitranslations, translate_layout
+
+
+class TestTranslateLayout(unittest.TestCase):
+
+	def test_translate_layout(self):
+		root = ElementTree.fromstring('<Container name="root"><Label name="headline" text="x" />'
+		                              '<Button name="okButton" /><Label name="headline" text="y" /></Container>')
+		translations = {
+		  'test.xml': {
+		    ('headline', 'text'): u'Head\nline',
+		    ('okButton', 'helptext'): u'OK',
+		    ('missing', 'text'): u'?',
+		  }
+		}
+		with mock.patch.object(guitranslations, 'text_translations', translations):
+			remaining = translate_layout(root, 'test.xml')
+			self.assertEqual(translate_layout(root, 'other.xml'), {})
+
+		# attributes that the layout doesn't set are left for translate_widget
+		self.assertEqual(remaining, {('okButton', 'helptext'): u'OK', ('missing', 'text'): u'?'})
+		labels = root.findall('Label')
+		self.assertEqual([label.get('text') for label in labels], [u'Head\nline', 'y'])
+		# newlines must survive the trip through the xml source
+		source = ElementTree.tostring(root, encoding='utf-8')
+		self.assertEqual(ElementTree.fromstring(source).find('Label').get('text'), u'Head\nline')
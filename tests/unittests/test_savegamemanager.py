@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from horizons.savegamemanager import SavegameManager
+from horizons.util import DbReader
+from horizons.util.uhdbaccessor import read_savegame_template
+
+
+class TestMetadataIndex(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.savegame = os.path.join(self.directory, 'savegame.sqlite')
+		self.write_savegame(self.savegame, 3)
+		self.patches = [
+			mock.patch.object(SavegameManager, 'metadata_index_file', os.path.join(self.directory, 'index.json')),
+			mock.patch.object(SavegameManager, '_metadata_index', None),
+			mock.patch.object(SavegameManager, '_metadata_index_changed', False),
+		]
+		for patch in self.patches:
+			patch.start()
+
+	def tearDown(self):
+		for patch in self.patches:
+			patch.stop()
+		shutil.rmtree(self.directory)
+
+	def write_savegame(self, filename, savecounter):
+		db = DbReader(filename)
+		read_savegame_template(db)
+		db("INSERT INTO metadata(name, value) VALUES(?, ?)", 'savecounter', savecounter)
+		db("INSERT INTO metadata(name, value) VALUES(?, ?)", 'timestamp', 42.5)
+		db("INSERT INTO metadata_blob values(?, ?)", "screen", buffer('image'))
+		db.close()
+
+	def test_cached_metadata(self):
+		metadata = SavegameManager.get_cached_metadata(self.savegame)
+		self.assertEqual(metadata, {'savecounter': 3, 'timestamp': 42.5, 'savegamerev': 0})
+		self.assertEqual(str(SavegameManager.get_screenshot(self.savegame)), 'image')
+
+		with mock.patch.object(SavegameManager, 'get_metadata') as get_metadata:
+			self.assertEqual(SavegameManager.get_cached_metadata(self.savegame), metadata)
+			self.assertFalse(get_metadata.called)
+
+		# changed files are read again
+		os.unlink(self.savegame)
+		self.write_savegame(self.savegame, 4)
+		os.utime(self.savegame, (0, 0))
+		self.assertEqual(SavegameManager.get_cached_metadata(self.savegame)['savecounter'], 4)
+
+	def test_persistence(self):
+		other_savegame = os.path.join(self.directory, 'other.sqlite')
+		self.write_savegame(other_savegame, 5)
+		SavegameManager.get_cached_metadata(self.savegame)
+		SavegameManager.get_cached_metadata(other_savegame)
+		os.unlink(other_savegame)
+		SavegameManager._save_metadata_index()
+
+		SavegameManager._metadata_index = None
+		with mock.patch.object(SavegameManager, 'get_metadata') as get_metadata:
+			self.assertEqual(SavegameManager.get_cached_metadata(self.savegame)['savecounter'], 3)
+			self.assertFalse(get_metadata.called)
+		self.assertEqual(SavegameManager._metadata_index.keys(), [self.savegame])
+
+	def test_invalid_index(self):
+		open(SavegameManager.metadata_index_file, 'w').write('{invalid')
+		self.assertEqual(SavegameManager.get_cached_metadata(self.savegame)['savecounter'], 3)
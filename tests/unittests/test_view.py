@@ -0,0 +1,84 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import weakref
+import unittest
+
+import mock
+
+from horizons.constants import VIEW
+from horizons.util import Point, Rect
+from horizons.view import View
+
+
+class Unit(object):
+	def __init__(self, worldid, x, y):
+		self.worldid = worldid
+		self.position = Point(x, y)
+		self.synced = False
+
+	def sync_instance(self):
+		self.synced = True
+
+
+class TestViewCulling(unittest.TestCase):
+
+	def setUp(self):
+		# only the culling part of the view is needed, which doesn't depend on fife
+		self.view = View.__new__(View)
+		self.view._visible_area = None
+		self.view._culled_objects = weakref.WeakValueDictionary()
+		self.displayed_area = Rect.init_from_topleft_and_size(0, 0, 10, 10)
+		patcher = mock.patch.object(View, 'get_displayed_area', lambda view: self.displayed_area)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_is_visible(self):
+		radius = 10 + VIEW.CULLING_MARGIN # half of displayed width + height, plus margin
+		# the center of the displayed area is (4, 4)
+		self.assertTrue(self.view.is_visible(Point(4, 4)))
+		self.assertTrue(self.view.is_visible(Point(4 + radius, 4 - radius)))
+		self.assertFalse(self.view.is_visible(Point(5 + radius, 4)))
+		self.assertFalse(self.view.is_visible(Point(4, 3 - radius)))
+
+	def test_sync_culled_objects(self):
+		near = Unit(1, 50, 50)
+		far = Unit(2, 200, 200)
+		self.view.add_culled_object(near)
+		self.view.add_culled_object(far)
+		self.assertFalse(self.view.is_visible(near.position))
+
+		self.displayed_area = Rect.init_from_topleft_and_size(40, 40, 10, 10)
+		self.view._update_visible_area()
+		self.assertTrue(self.view.is_visible(near.position))
+		self.assertTrue(near.synced)
+		self.assertFalse(far.synced)
+		self.assertEqual(self.view._culled_objects.keys(), [2])
+
+	def test_remove_culled_object(self):
+		unit = Unit(1, 50, 50)
+		self.view.add_culled_object(unit)
+		self.view.remove_culled_object(unit)
+		self.view.remove_culled_object(unit) # removing twice is allowed
+
+		self.displayed_area = Rect.init_from_topleft_and_size(40, 40, 10, 10)
+		self.view._update_visible_area()
+		self.assertFalse(unit.synced)
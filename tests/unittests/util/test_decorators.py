@@ -0,0 +1,163 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import gc
+import unittest
+
+from horizons.util.python import decorators
+
+
+class Counter(object):
+
+	def __init__(self):
+		self.calls = 0
+
+	@decorators.cachedmethod
+	def double(self, x, y=0):
+		self.calls += 1
+		return 2 * x + y
+
+	@decorators.lru_cachedmethod(maxsize=2)
+	def square(self, x):
+		self.calls += 1
+		return x * x
+
+
+class TestCachedFunction(unittest.TestCase):
+
+	def setUp(self):
+		self.calls = []
+		@decorators.lru_cachedfunction(maxsize=2)
+		def func(x):
+			self.calls.append(x)
+			return -x
+		self.func = func
+
+	def test_lru(self):
+		self.assertEqual(self.func(1), -1)
+		self.assertEqual(self.func(2), -2)
+		self.assertEqual(self.func(1), -1) # 1 is now the most recently used
+		self.assertEqual(self.func(3), -3) # drops 2
+		self.assertEqual(self.func(1), -1)
+		self.assertEqual(self.func(2), -2)
+		self.assertEqual(self.calls, [1, 2, 3, 2])
+		self.assertEqual(self.func.get_stats(), (2, 4, 2, 2))
+
+	def test_invalidate(self):
+		self.func(1)
+		self.func(2)
+		self.func.invalidate(1)
+		self.func(1)
+		self.func(2)
+		self.assertEqual(self.calls, [1, 2, 1])
+		self.func.cache_clear()
+		self.func(2)
+		self.assertEqual(self.calls, [1, 2, 1, 2])
+
+	def test_unhashable(self):
+		self.assertRaises(TypeError, self.func, [])
+
+
+class TestCachedMethod(unittest.TestCase):
+
+	def test_per_instance(self):
+		a, b = Counter(), Counter()
+		self.assertEqual(a.double(1), 2)
+		self.assertEqual(a.double(1), 2)
+		self.assertEqual(a.double(1, y=1), 3)
+		self.assertEqual(b.double(1), 2)
+		self.assertEqual((a.calls, b.calls), (2, 1))
+		self.assertEqual(a.double.get_stats(), (1, 2, 2, None))
+
+	def test_nested_instances(self):
+		# the instance must not be stored on the shared descriptor
+		a, b = Counter(), Counter()
+		method = a.double
+		b.double(5)
+		self.assertEqual(method(1), 2)
+		self.assertEqual(b.double.get_stats().size, 1)
+		self.assertEqual(a.double.get_stats().size, 1)
+
+	def test_weak_instances(self):
+		a = Counter()
+		a.double(1)
+		self.assertTrue(a in Counter.double.caches)
+		del a
+		gc.collect()
+		self.assertEqual(len(Counter.double.caches), 0)
+
+	def test_invalidate(self):
+		a, b = Counter(), Counter()
+		a.double(1)
+		b.double(1)
+		a.double.invalidate(1)
+		a.double(1)
+		b.double(1)
+		self.assertEqual((a.calls, b.calls), (2, 1))
+		Counter.double.cache_clear()
+		a.double(1)
+		b.double(1)
+		self.assertEqual((a.calls, b.calls), (3, 2))
+
+	def test_lru(self):
+		a = Counter()
+		for x in (1, 2, 3, 1):
+			a.square(x)
+		self.assertEqual(a.calls, 4)
+		self.assertEqual(a.square.get_stats(), (0, 4, 2, 2))
+
+	def test_stats_registry(self):
+		names = [ name for name, stats in decorators.get_cache_stats() ]
+		self.assertTrue('%s.double' % __name__ in names)
+		self.assertTrue('horizons.util.dbreader.cached_query' in names)
+
+	def test_stats_registry_is_weak(self):
+		@decorators.cachedfunction
+		def local_function(x):
+			return [x]
+		local_function(1)
+		name = '%s.local_function' % __name__
+		self.assertTrue(name in [ n for n, stats in decorators.get_cache_stats() ])
+		del local_function
+		gc.collect()
+		self.assertFalse(name in [ n for n, stats in decorators.get_cache_stats() ])
+
+
+class TestTemporaryCachedMethod(unittest.TestCase):
+
+	def test_expiry(self):
+		class Clock(object):
+			def __init__(self):
+				self.calls = 0
+
+			def get(self):
+				self.calls += 1
+				return self.calls
+
+			expired_get = decorators.temporary_cachedmethod(timeout=-1)(get)
+			cached_get = decorators.temporary_cachedmethod(timeout=3600)(get)
+
+		clock = Clock()
+		self.assertEqual(clock.expired_get(), 1)
+		self.assertEqual(clock.expired_get(), 2)
+		self.assertEqual(clock.cached_get(), 3)
+		self.assertEqual(clock.cached_get(), 3)
@@ -0,0 +1,118 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import yaml
+
+from horizons.constants import PATHS
+from horizons.util import DbReader, YamlCache
+from horizons.util.gamedatasnapshot import GameDataSnapshot
+from horizons.util.yamlcache import SafeLoader, DummyShelve, convert_game_data
+
+
+class TestGameDataSnapshot(unittest.TestCase):
+
+	def setUp(self):
+		fd, self.filename = tempfile.mkstemp()
+		os.close(fd)
+		os.unlink(self.filename)
+
+	def tearDown(self):
+		if os.path.exists(self.filename):
+			os.unlink(self.filename)
+
+	def get_contents(self, db):
+		tables = [name for (name, ) in db("SELECT name FROM sqlite_master WHERE type = 'table'")]
+		return dict( (table, db("SELECT * FROM %s" % table)) for table in tables )
+
+	def test_missing(self):
+		self.assertEqual(GameDataSnapshot.load(self.filename), None)
+
+	def test_corrupt(self):
+		open(self.filename, 'wb').write('no snapshot')
+		self.assertEqual(GameDataSnapshot.load(self.filename), None)
+
+	def test_same_data(self):
+		GameDataSnapshot.build(self.filename)
+		snapshot = GameDataSnapshot.load(self.filename)
+		self.assertNotEqual(snapshot, None)
+
+		db = DbReader(':memory:')
+		snapshot.fill_db(db)
+		expected = DbReader(':memory:')
+		for db_file in PATHS.DB_FILES:
+			expected.execute_script("BEGIN TRANSACTION;" + open(db_file).read() + "COMMIT;")
+		self.assertEqual(self.get_contents(db), self.get_contents(expected))
+
+		self.assertEqual(sorted(snapshot.yaml_files), [f for f in GameDataSnapshot.get_source_files() if f.endswith('.yaml')])
+		filename = sorted(snapshot.yaml_files)[0]
+		old_files = YamlCache.snapshot_files
+		try:
+			YamlCache.use_snapshot(snapshot)
+			data = YamlCache.get_file(filename, game_data=True)
+			self.assertEqual(data, convert_game_data(yaml.load(open(filename), Loader=SafeLoader)))
+			data['changed'] = True
+			self.assertFalse('changed' in YamlCache.get_file(filename, game_data=True))
+		finally:
+			YamlCache.snapshot_files = old_files
+
+	def create_source_tree(self):
+		"""Replaces the game data by a small copy in a temporary directory"""
+		directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, directory)
+		objects_dir = os.path.join(directory, 'objects')
+		os.mkdir(objects_dir)
+		open(os.path.join(objects_dir, 'test.yaml'), 'w').write('id: BUILDINGS.WAREHOUSE\n')
+		db_file = os.path.join(directory, 'game.sql')
+		open(db_file, 'w').write('CREATE TABLE test (value INTEGER);\nINSERT INTO test VALUES (1);\n')
+
+		patches = [ mock.patch.object(GameDataSnapshot, 'objects_dir', objects_dir),
+		            mock.patch.object(PATHS, 'DB_FILES', (db_file, )),
+		            # don't put the temporary files into the user's cache
+		            mock.patch.object(YamlCache, 'cache', DummyShelve()),
+		            mock.patch.object(YamlCache, 'sync_scheduled', True) ]
+		for patch in patches:
+			patch.start()
+			self.addCleanup(patch.stop)
+
+	def test_stale(self):
+		self.create_source_tree()
+		snapshot = GameDataSnapshot.build(self.filename)
+		source = sorted(snapshot.sources)[0]
+		size = snapshot.sources[source][1]
+
+		# only the timestamp changed, the content hash is still the same
+		os.utime(source, (1000000, 1000000))
+		with mock.patch.object(GameDataSnapshot, '_get_content_hash', wraps=GameDataSnapshot._get_content_hash) as get_hash:
+			self.assertNotEqual(GameDataSnapshot.load(self.filename), None)
+			self.assertEqual(get_hash.call_count, 1)
+			# the new stats have been stored, the next load doesn't need the hash
+			self.assertEqual(GameDataSnapshot.load(self.filename).sources[source], (1000000, size))
+			self.assertEqual(get_hash.call_count, 1)
+
+		open(source, 'a').write('value: 1\n')
+		self.assertEqual(GameDataSnapshot.load(self.filename), None)
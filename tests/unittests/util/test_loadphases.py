@@ -0,0 +1,58 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import json
+import unittest
+
+from horizons.util.loadphases import LoadPhases
+
+
+class TestLoadPhases(unittest.TestCase):
+
+	def tearDown(self):
+		LoadPhases.stop()
+
+	def test_inactive(self):
+		with LoadPhases.phase('a'):
+			LoadPhases.count('objects')
+		self.assertEqual(LoadPhases.stop(), None)
+
+	def test_nested_phases(self):
+		LoadPhases.start()
+		with LoadPhases.phase('world'):
+			for i in xrange(2):
+				with LoadPhases.phase('island'):
+					LoadPhases.count('tiles', 10)
+			LoadPhases.count('islands', 2)
+		with LoadPhases.phase('gui'):
+			pass
+		phases = LoadPhases.stop()
+
+		self.assertEqual(phases.phases.keys(), [('world', ), ('world', 'island'), ('gui', )])
+		self.assertEqual(phases.phases[('world', 'island')]['calls'], 2)
+		self.assertEqual(phases.phases[('world', 'island')]['counts'], {'tiles': 20})
+		self.assertEqual(phases.phases[('world', )]['counts'], {'islands': 2})
+		self.assertEqual(len(phases.get_report()), 4)
+
+		data = json.loads(phases.to_json())
+		self.assertEqual([phase['phase'] for phase in data['phases']], ['world', 'world/island', 'gui'])
+		self.assertTrue(data['seconds'] >= data['phases'][0]['seconds'])
@@ -0,0 +1,91 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from horizons.util.mappreviewcache import MapPreviewCache
+
+
+class TestMapPreviewCache(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		patcher = mock.patch.object(MapPreviewCache, 'directory', os.path.join(self.directory, 'previews'))
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		self.data = json.dumps([(0, 0, 1, 2, 3), (1, 0, 4, 5, 6)])
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def create_map(self, name, contents):
+		map_file = os.path.join(self.directory, name)
+		with open(map_file, 'wb') as f:
+			f.write(contents)
+		return map_file
+
+	def test_map_key(self):
+		map_file = self.create_map('a.sqlite', 'map')
+		key = MapPreviewCache.get_map_key(map_file, (100, 100))
+		self.assertEqual(MapPreviewCache.get_map_key(map_file, (100, 100)), key)
+		# the key depends on the contents, not on the filename
+		self.assertEqual(MapPreviewCache.get_map_key(self.create_map('b.sqlite', 'map'), (100, 100)), key)
+		self.assertNotEqual(MapPreviewCache.get_map_key(map_file, (120, 120)), key)
+		self.create_map('a.sqlite', 'changed map')
+		self.assertNotEqual(MapPreviewCache.get_map_key(map_file, (100, 100)), key)
+
+	def test_random_map_key(self):
+		params = ('seed', 150, 50, 50, 35, 8)
+		key = MapPreviewCache.get_random_map_key((100, 100), params)
+		# parameters are passed as json lists by the preview process
+		self.assertEqual(MapPreviewCache.get_random_map_key([100, 100], list(params)), key)
+		self.assertNotEqual(MapPreviewCache.get_random_map_key((100, 100), ('seed2',) + params[1:]), key)
+
+	def test_get_put(self):
+		key = MapPreviewCache.get_random_map_key((100, 100), ('seed', 150, 50, 50, 35, 8))
+		self.assertEqual(MapPreviewCache.get(key), None)
+		MapPreviewCache.put(key, self.data)
+		self.assertEqual(MapPreviewCache.get(key), self.data)
+
+	def test_broken_entry(self):
+		MapPreviewCache.put('key', self.data)
+		with open(MapPreviewCache._get_filename('key'), 'wb') as f:
+			f.write('broken')
+		self.assertEqual(MapPreviewCache.get('key'), None)
+
+	def test_prune(self):
+		for i in xrange(MapPreviewCache.MAX_ENTRIES):
+			MapPreviewCache.put(str(i), self.data)
+			os.utime(MapPreviewCache._get_filename(str(i)), (i, i))
+		# using an entry protects it from being pruned
+		MapPreviewCache.get('0')
+		MapPreviewCache.put('new', self.data)
+		self.assertEqual(len(os.listdir(MapPreviewCache.directory)), MapPreviewCache.MAX_ENTRIES)
+		self.assertEqual(MapPreviewCache.get('1'), None)
+		self.assertEqual(MapPreviewCache.get('2'), self.data)
+		self.assertEqual(MapPreviewCache.get('0'), self.data)
+		self.assertEqual(MapPreviewCache.get('new'), self.data)
@@ -0,0 +1,79 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import tempfile
+import unittest
+
+import mock
+
+from horizons.util import DbReader, SavegameAccessor
+from horizons.util.loadphases import LoadPhases
+from horizons.util.uhdbaccessor import read_savegame_template
+
+
+class TestSavegameAccessor(unittest.TestCase):
+
+	def setUp(self):
+		fd, self.filename = tempfile.mkstemp()
+		os.close(fd)
+		db = DbReader(self.filename)
+		read_savegame_template(db)
+		db("INSERT INTO concrete_object (id, action_runtime, action_set_id) VALUES (?, ?, ?)", 1, 100, 'as_test')
+		db("INSERT INTO unit_path (`unit`, `index`, `x`, `y`) VALUES (?, ?, ?, ?)", 2, 0, 5, 6)
+		db.close()
+
+	def tearDown(self):
+		os.unlink(self.filename)
+
+	def test_lazy_tables(self):
+		db = SavegameAccessor(self.filename)
+		self.assertFalse('_concrete_object' in db.__dict__)
+		self.assertEqual(db.get_concrete_object_data(1), (100, 'as_test'))
+		self.assertEqual(db.get_concrete_object_data(1), (100, 'as_test'))
+		self.assertFalse('_unit_path' in db.__dict__)
+		db.close()
+
+	def test_load_phases(self):
+		# each table records the memory that has been added while it was loaded
+		db = SavegameAccessor(self.filename)
+		LoadPhases.start()
+		try:
+			with mock.patch.object(LoadPhases, '_get_memory', side_effect=[5000, 5300, 9000, 9100]):
+				db.get_concrete_object_data(1)
+				db.get_concrete_object_data(1)
+				db.get_unit_path(2)
+		finally:
+			phases = LoadPhases.stop()
+		self.assertEqual(phases.phases.keys(), [('_load_concrete_object', ), ('_load_unit_path', )])
+		self.assertEqual(phases.phases[('_load_concrete_object', )]['memory'], 300)
+		self.assertEqual(phases.phases[('_load_concrete_object', )]['counts'], {'entries': 1})
+		self.assertEqual(phases.phases[('_load_unit_path', )]['memory'], 100)
+		db.close()
+
+	def test_release_rows(self):
+		db = SavegameAccessor(self.filename, release_rows=True)
+		self.assertEqual(db.get_unit_path(2), [(5, 6)])
+		self.assertEqual(db.get_unit_path(2), None)
+		self.assertEqual(db.get_concrete_object_data(1), (100, 'as_test'))
+		self.assertRaises(KeyError, db.get_concrete_object_data, 1)
+		db.close()
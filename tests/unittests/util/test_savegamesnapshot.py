@@ -0,0 +1,107 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from horizons.util import DbReader
+from horizons.util.savegamesnapshot import SavegameSnapshot, SavegameWriter
+
+
+class TestSavegameSnapshot(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.filename = os.path.join(self.directory, 'savegame.sqlite')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_write(self):
+		snapshot = SavegameSnapshot()
+		snapshot("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)", 1, 2, 3)
+		snapshot("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)", 1, 4, 5)
+		snapshot("INSERT INTO name (rowid, name) VALUES (?, ?)", 1, u'test')
+		snapshot.execute_many("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)", [(2, 2, 1)])
+		snapshot.write(self.filename)
+
+		db = DbReader(self.filename)
+		self.assertEqual(db("SELECT rowid, object, resource, amount FROM storage"),
+		                 [(1, 1, 2, 3), (2, 1, 4, 5), (3, 2, 2, 1)])
+		self.assertEqual(db("SELECT name FROM name WHERE rowid = 1"), [(u'test', )])
+		db.close()
+		self.assertEqual(os.listdir(self.directory), ['savegame.sqlite'])
+
+	def test_replace_existing(self):
+		open(self.filename, 'w').write('old')
+		SavegameSnapshot().write(self.filename)
+		self.assertEqual(DbReader(self.filename)("SELECT count(*) FROM storage"), [(0, )])
+
+	def test_failed_write(self):
+		snapshot = SavegameSnapshot()
+		snapshot("INSERT INTO nonexistent_table (a) VALUES (?)", 1)
+		writer = SavegameWriter(snapshot, self.filename)
+		writer.start()
+		writer.join()
+		self.assertTrue('nonexistent_table' in writer.error)
+		self.assertEqual(os.listdir(self.directory), [])
+
+	def test_no_reading(self):
+		snapshot = SavegameSnapshot()
+		self.assertRaises(AssertionError, snapshot, "SELECT * FROM storage")
+
+	def test_add_row(self):
+		snapshot = SavegameSnapshot()
+		snapshot.add_row("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)", 1, 2, 3)
+		snapshot.add_row("INSERT INTO name (rowid, name) VALUES (?, ?)", 1, u'test')
+		snapshot.add_row("INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)", 1, 4, 5)
+		self.assertEqual(snapshot.commands, [])
+		# other commands flush the buffered rows first
+		snapshot("UPDATE storage SET amount = 6 WHERE resource = 4")
+		self.assertEqual([command for command, rows in snapshot.commands],
+		                 ["INSERT INTO storage (object, resource, amount) VALUES (?, ?, ?)",
+		                  "INSERT INTO name (rowid, name) VALUES (?, ?)",
+		                  "UPDATE storage SET amount = 6 WHERE resource = 4"])
+		snapshot.write(self.filename)
+
+		db = DbReader(self.filename)
+		self.assertEqual(db("SELECT rowid, object, resource, amount FROM storage"),
+		                 [(1, 1, 2, 3), (2, 1, 4, 6)])
+		self.assertEqual(db("SELECT name FROM name WHERE rowid = 1"), [(u'test', )])
+		db.close()
+
+
+class TestDbReaderRows(unittest.TestCase):
+
+	def test_add_row(self):
+		db = DbReader(':memory:')
+		db("CREATE TABLE test (a INTEGER, b INTEGER)")
+		db.add_row("INSERT INTO test (a, b) VALUES (?, ?)", 1, 2)
+		db.add_row("INSERT INTO test (a, b) VALUES (?, ?)", 3, 4)
+		# reading flushes the buffer
+		self.assertEqual(db("SELECT rowid, a, b FROM test"), [(1, 1, 2), (2, 3, 4)])
+		db.add_row("INSERT INTO test (a, b) VALUES (?, ?)", 5, 6)
+		db.flush_rows()
+		self.assertEqual(db("SELECT count(*) FROM test"), [(3, )])
+		db.close()
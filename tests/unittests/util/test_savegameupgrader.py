@@ -0,0 +1,63 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import bz2
+import os
+import tempfile
+import unittest
+
+from horizons.util import DbReader, SavegameAccessor
+from horizons.util.savegameupgrader import SavegameUpgrader
+from tests.game import TEST_FIXTURES_DIR
+
+
+class TestSavegameUpgrader(unittest.TestCase):
+
+	def setUp(self):
+		fd, self.filename = tempfile.mkstemp()
+		os.close(fd)
+		data = bz2.decompress(open(os.path.join(TEST_FIXTURES_DIR, 'large.sqlite.bz2'), 'rb').read())
+		open(self.filename, 'wb').write(data)
+
+	def tearDown(self):
+		os.unlink(self.filename)
+
+	def get_contents(self, db):
+		tables = [name for (name, ) in db("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+		return dict( (table, db("SELECT rowid, * FROM %s" % table)) for table in tables )
+
+	def test_upgrade_in_memory(self):
+		upgrader = SavegameUpgrader(self.filename)
+		self.assertTrue(upgrader.needs_upgrade())
+		db = DbReader(upgrader.get_path())
+		expected = self.get_contents(db)
+		db.close()
+		upgrader.close()
+
+		original = open(self.filename, 'rb').read()
+		db = SavegameAccessor(self.filename)
+		self.assertEqual(self.get_contents(db), expected)
+		self.assertEqual([rev for rev, seconds in db.upgrader.upgrade_timings], [57, 58, 59, 60, 61])
+		# upgrades mustn't change how text is read during loading
+		self.assertTrue(isinstance(db("SELECT name FROM player")[0][0], unicode))
+		db.close()
+		self.assertEqual(open(self.filename, 'rb').read(), original)
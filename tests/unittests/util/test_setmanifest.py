@@ -0,0 +1,78 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from horizons.util.loaders.loader import GeneralLoader
+from horizons.util.loaders.manifest import SetManifest
+
+
+class TestSetManifest(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.source = os.path.join(self.directory, 'as_test')
+		os.makedirs(os.path.join(self.source, 'idle', 'tm_1000'))
+		self.add_frame('idle/0/0.png')
+		self.add_frame('idle/0/1.png')
+		self.manifest = SetManifest('test')
+		self.manifest.filename = os.path.join(self.directory, 'test.manifest')
+		self.scans = 0
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def add_frame(self, path):
+		path = os.path.join(self.source, path)
+		if not os.path.isdir(os.path.dirname(path)):
+			os.makedirs(os.path.dirname(path))
+		open(path, 'w').close()
+
+	def scan(self):
+		self.scans += 1
+		return GeneralLoader._load_action(self.source)
+
+	def test_load(self):
+		sets = self.manifest.load(self.source, self.scan)
+		self.assertEqual(self.manifest.load(self.source, self.scan), sets)
+		self.assertEqual(self.scans, 1)
+		rotation = os.path.join(self.source, 'idle', '0')
+		self.assertEqual(sets, {'idle': {0: {os.path.join(rotation, '0.png'): 0.5,
+		                                     os.path.join(rotation, '1.png'): 1.0}}})
+
+	def test_outdated(self):
+		self.manifest.load(self.source, self.scan)
+		# make sure that the new directory gets another mtime
+		rotation = os.path.join(self.source, 'idle', '0')
+		os.utime(rotation, (0, 0))
+		self.add_frame('idle/0/2.png')
+		sets = self.manifest.load(self.source, self.scan)
+		self.assertEqual(self.scans, 2)
+		self.assertEqual(len(sets['idle'][0]), 3)
+
+	def test_other_source(self):
+		self.manifest.load(self.source, self.scan)
+		self.manifest.load(self.directory, self.scan)
+		self.assertEqual(self.scans, 2)
@@ -0,0 +1,89 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import random
+import unittest
+from collections import defaultdict
+
+from horizons.util import StateHistory
+
+
+def brute_force_durations(entries, start, end):
+	"""The straightforward way to calculate StateHistory.get_durations."""
+	result = defaultdict(int)
+	for i, (tick, value) in enumerate(entries):
+		if tick >= end:
+			break
+		next_tick = min(entries[i + 1][0], end) if i + 1 < len(entries) else end
+		if next_tick <= start:
+			continue
+		result[value] += next_tick - max(tick, start)
+	return dict( (value, ticks) for value, ticks in result.iteritems() if ticks > 0 )
+
+
+class StateHistoryTest(unittest.TestCase):
+
+	def test_durations(self):
+		history = StateHistory([(0, 'a'), (10, 'b'), (15, 'a')])
+		self.assertEqual(history.get_durations(0, 20), {'a': 15, 'b': 5})
+		self.assertEqual(history.get_durations(12, 20), {'a': 5, 'b': 3})
+		self.assertEqual(history.get_durations(12, 14), {'b': 2})
+		self.assertEqual(history.get_durations(15, 15), {})
+		# time before the first entry doesn't count
+		self.assertEqual(history.get_durations(-10, 5), {'a': 5})
+
+	def test_discard_before(self):
+		history = StateHistory([(0, 'a'), (10, 'b'), (15, 'a')])
+		history.discard_before(12)
+		self.assertEqual(list(history), [(10, 'b'), (15, 'a')])
+		self.assertEqual(history.get_durations(12, 20), {'a': 5, 'b': 3})
+		history.discard_before(100)
+		self.assertEqual(list(history), [(15, 'a')])
+		self.assertFalse(history.has_value('b'))
+		self.assertEqual(history.get_durations(12, 20), {'a': 5})
+
+	def test_pop(self):
+		history = StateHistory([(0, 'a'), (10, 'b')])
+		self.assertEqual(history.pop(), (10, 'b'))
+		self.assertFalse(history.has_value('b'))
+		history.append(12, 'c')
+		self.assertEqual(history.get_durations(0, 20), {'a': 12, 'c': 8})
+
+	def test_random(self):
+		rng = random.Random(42)
+		history = StateHistory()
+		entries = []
+		tick = 0
+		for i in xrange(500):
+			tick += rng.randint(0, 20)
+			value = rng.randint(0, 4)
+			history.append(tick, value)
+			entries.append((tick, value))
+			if rng.random() < 0.3:
+				first_tick = tick - rng.randint(0, 200)
+				history.discard_before(first_tick)
+				while len(entries) > 1 and entries[1][0] < first_tick:
+					entries.pop(0)
+			self.assertEqual(list(history), entries)
+			start = tick - rng.randint(0, 300)
+			end = tick + rng.randint(0, 5)
+			self.assertEqual(history.get_durations(start, end), brute_force_durations(entries, start, end))
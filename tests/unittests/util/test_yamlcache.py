@@ -0,0 +1,123 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import os
+import glob
+import shelve
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from horizons.extscheduler import ExtScheduler
+from horizons.util import yamlcache
+from horizons.util.yamlcache import YamlCache, DummyShelve
+
+
+class TestYamlCache(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.filename = os.path.join(self.directory, 'test.yaml')
+		self.write('a: 1')
+		self.old_state = (YamlCache.cache, YamlCache.sync_scheduled, YamlCache.sync_pending, YamlCache.snapshot_files)
+		YamlCache.cache = DummyShelve()
+		YamlCache.sync_scheduled = True # don't schedule syncing a dummy shelve
+		YamlCache.snapshot_files = {}
+
+	def tearDown(self):
+		YamlCache.cache, YamlCache.sync_scheduled, YamlCache.sync_pending, YamlCache.snapshot_files = self.old_state
+		shutil.rmtree(self.directory)
+
+	def write(self, contents, filename=None, mtime=1000000):
+		filename = filename or self.filename
+		open(filename, 'w').write(contents)
+		os.utime(filename, (mtime, mtime))
+
+	def test_stat_validation(self):
+		self.assertEqual(YamlCache.get_file(self.filename), {'a': 1})
+		# same size and mtime, the file isn't read again
+		self.write('a: 2')
+		self.assertEqual(YamlCache.get_file(self.filename), {'a': 1})
+		self.write('a: 3', mtime=2000000)
+		self.assertEqual(YamlCache.get_file(self.filename), {'a': 3})
+
+	def test_touched(self):
+		YamlCache.get_file(self.filename)
+		self.write('a: 1', mtime=2000000)
+		with mock.patch.object(yamlcache, 'parse_yaml') as parse_yaml:
+			self.assertEqual(YamlCache.get_file(self.filename), {'a': 1})
+		self.assertFalse(parse_yaml.called)
+		self.assertEqual(YamlCache.cache[self.filename][:2], (2000000, 4))
+
+	def test_old_entry(self):
+		YamlCache.cache[self.filename] = (hash('a: 1'), {'a': 'old'})
+		self.assertEqual(YamlCache.get_file(self.filename), {'a': 'old'})
+		self.write('a: 22')
+		self.assertEqual(YamlCache.get_file(self.filename), {'a': 22})
+
+	def test_broken_shelve(self):
+		YamlCache.cache = None
+		with mock.patch.object(YamlCache, 'cache_filename', os.path.join(self.directory, 'cache')):
+			cache = shelve.open(YamlCache.cache_filename)
+			cache[self.filename] = (1, 2, 3, 4)
+			cache.close()
+			# the index of a dumbdbm still points to the value, which can't be unpickled anymore
+			for filename in glob.glob(YamlCache.cache_filename + '*.dat'):
+				open(filename, 'wb').write('(')
+
+			with mock.patch.object(YamlCache, '_open_cache', wraps=YamlCache._open_cache) as open_cache:
+				self.assertEqual(YamlCache.get_file(self.filename), {'a': 1})
+			# the broken shelve is deleted right away
+			self.assertEqual(open_cache.call_count, 2)
+			YamlCache.cache.close()
+
+	def test_load_files(self):
+		filenames = [ os.path.join(self.directory, '%d.yaml' % i) for i in xrange(3) ]
+		for i, filename in enumerate(filenames):
+			self.write('id: BUILDINGS.WAREHOUSE\nvalue: %d' % i, filename)
+
+		with mock.patch.object(YamlCache, 'POOL_MIN_FILES', 2):
+			with mock.patch('multiprocessing.cpu_count', return_value=2):
+				YamlCache.load_files(filenames, game_data=True)
+
+		with mock.patch.object(yamlcache, 'parse_yaml') as parse_yaml:
+			for i, filename in enumerate(filenames):
+				data = YamlCache.get_file(filename, game_data=True)
+				self.assertEqual(data['value'], i)
+				self.assertTrue(isinstance(data['id'], int))
+		self.assertFalse(parse_yaml.called)
+
+	def test_load_files_without_scheduler(self):
+		YamlCache.get_file(self.filename)
+		self.write('a: 1', mtime=2000000) # touched, its new stats are stored
+		YamlCache.sync_scheduled = False
+		with mock.patch.object(ExtScheduler, 'instance', None):
+			with mock.patch.object(YamlCache.cache, 'sync') as sync:
+				YamlCache.load_files([self.filename])
+		self.assertEqual(sync.call_count, 1)
+		self.assertFalse(YamlCache.sync_pending)
+		self.assertEqual(YamlCache.cache[self.filename][:2], (2000000, 4))
+		# the lock has been released
+		self.assertTrue(YamlCache.lock.acquire(False))
+		YamlCache.lock.release()
@@ -0,0 +1,92 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import unittest
+
+from horizons.world.buildabilitycache import BuildabilityCache
+
+
+class Tile(object):
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+		self.object = None
+
+class Building(object):
+	"""Buildable on every tile without an object"""
+	irregular_conditions = False
+	checks = 0
+
+	@classmethod
+	def is_tile_buildable(cls, session, tile, ship, island=None, check_settlement=True):
+		cls.checks += 1
+		return tile.object is None
+
+class World(object):
+	def get_island(self, point):
+		return None
+
+class Session(object):
+	def __init__(self):
+		self.world = World()
+		self.manager = None
+
+class Settlement(object):
+	def __init__(self):
+		self.session = Session()
+		self.ground_map = dict(((x, y), Tile(x, y)) for x in xrange(5) for y in xrange(5))
+
+
+class TestBuildabilityCache(unittest.TestCase):
+
+	def setUp(self):
+		self.settlement = Settlement()
+		self.cache = BuildabilityCache(self.settlement)
+		Building.checks = 0
+
+	def test_cached(self):
+		self.assertEqual(len(self.cache.get_buildable_coords(Building)), 25)
+		self.assertEqual(Building.checks, 25)
+		self.assertEqual(len(self.cache.get_buildable_coords(Building)), 25)
+		self.assertEqual(Building.checks, 25)
+
+	def test_invalidate(self):
+		self.cache.get_buildable_coords(Building)
+		self.settlement.ground_map[(1, 1)].object = 'building'
+		self.cache.invalidate([(1, 1)])
+		buildable = self.cache.get_buildable_coords(Building)
+		self.assertEqual(Building.checks, 26)
+		self.assertEqual(len(buildable), 24)
+		self.assertFalse((1, 1) in buildable)
+
+	def test_new_tiles(self):
+		self.cache.get_buildable_coords(Building)
+		self.settlement.ground_map[(7, 7)] = Tile(7, 7)
+		self.cache.invalidate([(7, 7)])
+		self.assertTrue((7, 7) in self.cache.get_buildable_coords(Building))
+
+	def test_can_cache(self):
+		self.assertTrue(self.cache.can_cache(Building))
+
+		class Irregular(Building):
+			irregular_conditions = True
+		self.assertFalse(self.cache.can_cache(Irregular))
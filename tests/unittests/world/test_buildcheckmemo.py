@@ -0,0 +1,90 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+
+import unittest
+
+import mock
+
+from horizons.util import Point, Rect
+from horizons.world.building.buildable import BuildableLine, BuildCheckMemo, _BuildPosition
+
+
+class Road(BuildableLine):
+	size = (1, 1)
+	checks = 0
+
+	@classmethod
+	def check_build(cls, session, point, rotation=45, check_settlement=True, ship=None, issuer=None):
+		cls.checks += 1
+		position = Rect.init_from_topleft_and_size(point.x, point.y, 1, 1)
+		return _BuildPosition(position, rotation, [], True)
+
+class PathNodes(object):
+	def __init__(self):
+		self.nodes = dict(((x, y), 1) for x in xrange(10) for y in xrange(10))
+
+class Island(object):
+	def __init__(self):
+		self.path_nodes = PathNodes()
+
+class World(object):
+	def __init__(self):
+		self.island = Island()
+
+	def get_island(self, point):
+		return self.island
+
+class Session(object):
+	def __init__(self):
+		self.world = World()
+
+
+class TestBuildCheckMemo(unittest.TestCase):
+
+	def setUp(self):
+		Road.checks = 0
+		self.memo = BuildCheckMemo(Road, Session())
+
+	def test_line(self):
+		builds = self.memo.check_build_line(Point(0, 0), Point(5, 0))
+		self.assertEqual(len(builds), 6)
+		self.assertEqual(Road.checks, 6)
+
+		# extending the line only checks the new tile
+		builds = self.memo.check_build_line(Point(0, 0), Point(6, 0))
+		self.assertEqual(len(builds), 7)
+		self.assertEqual(Road.checks, 7)
+
+	def test_same_line(self):
+		with mock.patch('horizons.world.building.buildable.RoadPathFinder') as finder:
+			finder.return_value.return_value = [(0, 0), (1, 0)]
+			self.memo.check_build_line(Point(0, 0), Point(1, 0))
+			self.memo.check_build_line(Point(0, 0), Point(1, 0))
+			self.assertEqual(finder.return_value.call_count, 1)
+
+	def test_copies(self):
+		builds = self.memo.check_build_line(Point(0, 0), Point(2, 0))
+		for build in builds:
+			build.buildable = False
+		builds = self.memo.check_build_line(Point(0, 0), Point(2, 0))
+		self.assertTrue(all(build.buildable for build in builds))
+		self.assertEqual([build.action for build in builds], ['d', 'bd', 'b'])
@@ -0,0 +1,110 @@
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+# ###################################################
+
+import json
+import unittest
+
+from horizons.util import Rect
+from horizons.world.minimapraster import MinimapRaster
+
+
+class Tile(object):
+	def __init__(self, x, y):
+		self.x = x
+		self.y = y
+		self.settlement = None
+
+class Color(object):
+	def __init__(self, color):
+		self.color = color
+
+	def to_tuple(self):
+		return self.color
+
+class Owner(object):
+	def __init__(self, color):
+		self.color = Color(color)
+
+class Settlement(object):
+	def __init__(self, color):
+		self.owner = Owner(color)
+
+class World(object):
+	"""40x40 world with one 10x10 island at (10, 10)"""
+	def __init__(self):
+		self.min_x = self.min_y = 0
+		self.map_dimensions = Rect.init_from_topleft_and_size(0, 0, 40, 40)
+		self.full_map = dict(((x, y), Tile(x, y)) for x in xrange(40) for y in xrange(40))
+		self.island_map = dict(((x, y), 'island') for x in xrange(10, 20) for y in xrange(10, 20))
+
+
+class TestMinimapRaster(unittest.TestCase):
+
+	def setUp(self):
+		self.world = World()
+		self.island_color = MinimapRaster.ISLAND_COLOR
+
+	def test_pixels(self):
+		raster = MinimapRaster(self.world, (20, 20))
+		# every pixel covers 2x2 tiles and shows the center one
+		pixels = raster.get_pixels()
+		self.assertEqual(len(pixels), 25)
+		self.assertEqual(pixels[0], (5, 5, self.island_color))
+		self.assertEqual(pixels[-1], (9, 9, self.island_color))
+		self.assertEqual(pixels, sorted(pixels))
+
+	def test_dump_data(self):
+		self.world.full_map[(11, 11)].settlement = Settlement((1, 2, 3))
+		data = json.loads(MinimapRaster(self.world, (20, 20)).dump_data())
+		self.assertEqual(data[0], [5, 5, 1, 2, 3])
+		self.assertEqual(data[1], [5, 6] + list(self.island_color))
+
+	def test_update(self):
+		raster = MinimapRaster(self.world, (20, 20))
+		settlement = Settlement((1, 2, 3))
+		tiles = [self.world.full_map[coord] for coord in ((11, 11), (12, 11), (19, 19))]
+		for tile in tiles:
+			tile.settlement = settlement
+
+		# nothing changes until the tiles are marked
+		self.assertEqual(raster.update(), set())
+		self.assertEqual(raster.get_pixels()[0], (5, 5, self.island_color))
+
+		raster.mark_dirty((tile.x, tile.y) for tile in tiles)
+		# (12, 11) isn't shown by any pixel, (19, 19) is shown by pixel (9, 9)
+		self.assertEqual(raster.update(), set([(0, 0)]))
+		pixels = dict(((x, y), color) for x, y, color in raster.get_pixels())
+		self.assertEqual(pixels[(5, 5)], (1, 2, 3))
+		self.assertEqual(pixels[(6, 5)], self.island_color)
+		self.assertEqual(pixels[(9, 9)], (1, 2, 3))
+		self.assertEqual(raster.update(), set())
+
+	def test_blocks(self):
+		# one pixel per tile, the island spans the blocks (0, 0), (0, 1), (1, 0) and (1, 1)
+		raster = MinimapRaster(self.world, (40, 40))
+		self.assertEqual(sorted(raster.get_blocks()), [(0, 0), (0, 1), (1, 0), (1, 1)])
+		self.assertEqual(len(raster.get_pixels((0, 0))), 36)
+		self.assertEqual(len(raster.get_pixels((1, 1))), 16)
+
+		self.world.full_map[(17, 17)].settlement = Settlement((1, 2, 3))
+		raster.mark_dirty([(17, 17), (0, 0)])
+		self.assertEqual(raster.update(), set([(1, 1)]))
+		self.assertTrue((17, 17, (1, 2, 3)) in raster.get_pixels((1, 1)))
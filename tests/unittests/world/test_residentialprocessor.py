@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# ###################################################
+# Copyright (C) 2012 The Unknown Horizons Team
+# team@unknown-horizons.org
+# This file is part of Unknown Horizons.
+#
+# Unknown Horizons is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the
+# Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+from unittest import TestCase
+from mock import Mock
+
+from horizons.constants import RES
+from horizons.scheduler import Scheduler
+from horizons.world.residentialprocessor import ResidentialProcessor
+
+
+class TestResidentialProcessor(TestCase):
+
+	INTERVAL = 5
+
+	def setUp(self):
+		Scheduler.create_instance(Mock())
+		self.scheduler = Scheduler()
+		self.scheduler.before_ticking()
+		self.settlement = Mock()
+		self.settlement.session.timer.get_ticks.return_value = self.INTERVAL
+		self.gold_inventory = self.settlement.owner.get_component.return_value.inventory
+		self.processor = ResidentialProcessor(self.settlement)
+		self.calls = []
+
+	def tearDown(self):
+		self.processor.end()
+		Scheduler.destroy_instance()
+
+	def create_settler(self, name, taxes=1):
+		settler = Mock()
+		settler.collect_tax.side_effect = lambda: self.calls.append(name) or taxes
+		return settler
+
+	def create_callback(self, name):
+		return lambda: self.calls.append(name)
+
+	def run_ticks(self, ticks):
+		for i in xrange(ticks):
+			self.scheduler.tick(self.scheduler.cur_tick + 1)
+
+	def test_consecutive_settlers_share_a_call(self):
+		settlers = [self.create_settler(i, taxes=i) for i in xrange(3)]
+		for settler in settlers:
+			self.processor.add_settler(settler)
+		self.assertEqual(1, len(self.scheduler.get_classinst_calls(self.processor)))
+
+		self.run_ticks(self.INTERVAL)
+		self.assertEqual([0, 1, 2], self.calls)
+		for settler in settlers:
+			settler.inhabitant_check.assert_called_once_with()
+			settler.level_check.assert_called_once_with()
+			self.assertEqual(self.INTERVAL, self.processor.get_remaining_ticks(settler))
+		self.gold_inventory.alter.assert_called_once_with(RES.GOLD, 3)
+		self.assertEqual(1, len(self.scheduler.get_classinst_calls(self.processor)))
+
+	def test_order_with_other_calls_is_kept(self):
+		self.processor.add_settler(self.create_settler('a'))
+		self.scheduler.add_new_object(self.create_callback('x'), None, run_in=self.INTERVAL)
+		self.processor.add_settler(self.create_settler('b'))
+		self.processor.add_settler(self.create_settler('c'), run_in=2)
+
+		self.run_ticks(self.INTERVAL)
+		self.assertEqual(['c', 'a', 'x', 'b'], self.calls)
+
+		del self.calls[:]
+		self.run_ticks(self.INTERVAL)
+		self.assertEqual(['c', 'a', 'b'], self.calls)
+
+	def test_remove_settler(self):
+		settler = self.create_settler('a')
+		self.processor.add_settler(settler)
+		self.processor.add_settler(self.create_settler('b'))
+		self.run_ticks(2)
+		self.assertEqual(self.INTERVAL - 2, self.processor.get_remaining_ticks(settler))
+		self.processor.remove_settler(settler)
+
+		self.run_ticks(self.INTERVAL)
+		self.assertEqual(['b'], self.calls)
@@ -180,3 +180,59 @@ class TestOtherStorages(TestCase):
 
 		self.assertEqual(s.alter(4, 1), 1)
 
+
+
+class ResourceListener(object):
+	def __init__(self):
+		self.calls = []
+
+	def changed(self, res):
+		self.calls.append(res)
+
+
+class TestResourceChangeListener(TestCase):
+
+	def test_only_watched_resources(self):
+		s = PositiveSizedSlotStorage(10)
+		listener = ResourceListener()
+		s.add_resource_change_listener(listener.changed, [1, 2])
+		s.alter(1, 5)
+		s.alter(3, 5)
+		s.alter(2, 1)
+		s.reset(3)
+		self.assertEqual(listener.calls, [1, 2])
+
+	def test_limit_change_notifies_all(self):
+		s = PositiveSizedSlotStorage(10)
+		listener = ResourceListener()
+		s.add_resource_change_listener(listener.changed, [1])
+		s.adjust_limit(5)
+		s.reset_all()
+		self.assertEqual(listener.calls, [None, None])
+
+	def test_shared_space(self):
+		s = TotalStorage(10)
+		listener = ResourceListener()
+		s.add_resource_change_listener(listener.changed, [1])
+		s.alter(2, 5)
+		self.assertEqual(listener.calls, [None])
+
+	def test_discard(self):
+		s = GenericStorage()
+		listener = ResourceListener()
+		s.add_resource_change_listener(listener.changed, [1])
+		s.discard_resource_change_listener(listener.changed)
+		s.discard_resource_change_listener(listener.changed)
+		s.alter(1, 5)
+		self.assertEqual(listener.calls, [])
+
+	def test_removed_by_other_listener(self):
+		s = GenericStorage()
+		first, second = ResourceListener(), ResourceListener()
+		def remove_second(res):
+			s.discard_resource_change_listener(second.changed)
+		first.changed = remove_second
+		s.add_resource_change_listener(first.changed, [1])
+		s.add_resource_change_listener(second.changed, [1])
+		s.alter(1, 5)
+		self.assertEqual(second.calls, [])